@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Control-tick tail latency under CPU budget configurations.
+
+Each configuration runs in a fresh interpreter, because thread counts and
+nice values cannot be undone once set. Inside it, a ``DroneWorker`` flies a
+simulated mission on the stub models, with one real-time control tick every
+``--period`` ms on the main thread. Background threads stand in for the rest
+of the pipeline:
+
+- two display-inference threads run a torch conv stack, as the segmentation
+  and detection threads do (an OpenCV filter chain when torch is missing);
+- a decode thread and a camera thread resize and convert frames at 30 fps.
+
+Every thread enters its ``cpu_budget`` role first. The report gives the
+control tick's latency (how late it started plus how long it ran) at
+p50/p95/p99/max, and how many display inferences a second the load threads
+managed, because starving those is the price of a fast control loop:
+
+    python benchmarks/bench_cpu_budget.py --seconds 20
+    python benchmarks/bench_cpu_budget.py --configs unmanaged quad --load cv2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import cpu_budget
+
+CONFIGS = {
+    "unmanaged": None,
+    "threads-1": cpu_budget.CpuBudget(torch_threads=1, cv2_threads=1, av_threads=1, nice={}),
+    "threads-2": cpu_budget.CpuBudget(torch_threads=2, cv2_threads=2, av_threads=1, nice={}),
+    "priority": cpu_budget.CpuBudget(torch_threads=2, cv2_threads=1, av_threads=1),
+    "dual": cpu_budget.PRESETS["dual"],
+    "quad": cpu_budget.PRESETS["quad"],
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def _inference_load(kind):
+    """A callable doing one display inference's worth of work."""
+    if kind == "torch":
+        import torch
+
+        frame = torch.rand(1, 3, 320, 320)
+        weights = [torch.rand(16, 3, 3, 3), torch.rand(32, 16, 3, 3), torch.rand(32, 32, 3, 3)]
+
+        def infer():
+            x = frame
+            with torch.no_grad():
+                for w in weights:
+                    x = torch.nn.functional.conv2d(x, w, padding=1).relu()
+            return x
+        return infer
+
+    import cv2
+    import numpy as np
+
+    frame = np.random.default_rng(0).integers(0, 255, (640, 640, 3), dtype=np.uint8)
+
+    def infer():
+        x = frame
+        for _ in range(4):
+            x = cv2.GaussianBlur(x, (9, 9), 0)
+        return cv2.Canny(x, 50, 150)
+    return infer
+
+
+def _frame_load():
+    import cv2
+    import numpy as np
+
+    from camera_thread import prepare_frame
+
+    frame = np.random.default_rng(1).integers(0, 255, (720, 960, 3), dtype=np.uint8)
+    return lambda: prepare_frame(cv2.resize(frame, (1280, 960)))
+
+
+def run_config(name, seconds=10.0, period_ms=100, load="auto"):
+    """Run one configuration in this process and return its measurements."""
+    budget = CONFIGS[name]
+    cpu_budget.configure(budget)
+    if load == "auto":
+        try:
+            import torch  # noqa: F401 -- after configure, so it sees the thread count
+            load = "torch"
+        except ImportError:
+            load = "cv2"
+
+    from drone_worker import DroneWorker
+    from simulation import SimulatedDrone, load_stub_models
+
+    stop = threading.Event()
+    counts = {}
+
+    def background(role, index, work, interval):
+        def loop():
+            cpu_budget.enter(role)
+            while not stop.is_set():
+                work()
+                counts[(role, index)] = counts.get((role, index), 0) + 1
+                if interval:
+                    time.sleep(interval)
+        return threading.Thread(target=loop, name=f"bench-{role}-{index}", daemon=True)
+
+    threads = [background("inference", i, _inference_load(load), 0.0) for i in range(2)]
+    threads += [background("decode", 0, _frame_load(), 1 / 30), background("camera", 0, _frame_load(), 1 / 30)]
+    for thread in threads:
+        thread.start()
+
+    # The control loop runs on this (the main) thread, which owns the worker's QTimer
+    drone = SimulatedDrone()
+    worker = DroneWorker(drone_factory=lambda: drone)
+    worker.path_model, worker.pad_model = load_stub_models(sleep=drone.advance)
+    worker._sleep = drone.advance
+    worker.use_clock(lambda: drone.clock)
+
+    latencies, durations = [], []
+    period = period_ms / 1000
+    started = time.perf_counter()
+    due = started + period
+    while time.perf_counter() < started + seconds:
+        if not worker._is_running:
+            drone.reset()
+            worker.run()  # enters the control role
+            worker.start_drone_mission()
+            worker.control_loop_timer.stop()
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        start = time.perf_counter()
+        worker.tick()
+        end = time.perf_counter()
+        durations.append(end - start)
+        latencies.append(end - due)
+        drone.advance(worker.current_tick_ms() / 1000)
+        due = max(due + period, end)
+    if worker._is_running:
+        worker.stop_worker()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    def done(role):
+        return sum(count for (name, _), count in counts.items() if name == role)
+
+    ms = lambda values, q: round(percentile(values, q) * 1000, 2)
+    return {
+        "config": name,
+        "load": load,
+        "cpus": len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count(),
+        "ticks": len(latencies),
+        "latency_ms": {"p50": ms(latencies, 50), "p95": ms(latencies, 95),
+                       "p99": ms(latencies, 99), "max": ms(latencies, 100)},
+        "tick_ms": {"p50": ms(durations, 50), "p99": ms(durations, 99)},
+        "inference_per_s": round(done("inference") / elapsed, 1),
+        "frames_per_s": round((done("decode") + done("camera")) / 2 / elapsed, 1),
+    }
+
+
+def sweep(names, seconds=10.0, period_ms=100, load="auto"):
+    """Run each configuration in its own interpreter; returns their results."""
+    results = []
+    for name in names:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run", name, "--seconds", str(seconds),
+             "--period", str(period_ms), "--load", load],
+            capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep CPU budgets and report control-tick tail latency.")
+    parser.add_argument("--configs", nargs="*", choices=sorted(CONFIGS), help="default: all")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measurement time per configuration")
+    parser.add_argument("--period", type=int, default=100, help="control tick period in ms")
+    parser.add_argument("--load", choices=("auto", "torch", "cv2"), default="auto",
+                        help="work done by the display-inference threads")
+    parser.add_argument("--json", metavar="PATH", help="also write the results here")
+    parser.add_argument("--run", choices=sorted(CONFIGS), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run:
+        # Child process: one configuration, result as the last line of stdout
+        print(json.dumps(run_config(args.run, args.seconds, args.period, args.load)))
+        return 0
+
+    results = sweep(args.configs or list(CONFIGS), args.seconds, args.period, args.load)
+    print(f"{'config':<12} {'ticks':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  "
+          f"{'infer/s':>8} {'frames/s':>9}   (control tick latency, ms)")
+    for result in results:
+        latency = result["latency_ms"]
+        print(f"{result['config']:<12} {result['ticks']:>6} {latency['p50']:>8} {latency['p95']:>8} "
+              f"{latency['p99']:>8} {latency['max']:>8}  {result['inference_per_s']:>8} "
+              f"{result['frames_per_s']:>9}")
+    if results:
+        print(f"\n{results[0]['cpus']} CPUs, {results[0]['load']} load")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for every hot-path stage, with a stored baseline.
+
+Each stage runs on synthetic frames rendered by ``SimulatedDrone`` and on the
+deterministic stub models, so the suite needs no drone, weights or GPU.
+
+    python benchmarks/bench_hot_paths.py --save benchmarks/baseline.json
+    python benchmarks/bench_hot_paths.py --compare benchmarks/baseline.json --tolerance 0.25
+
+``--compare`` exits with status 1 when any stage is slower than the baseline by
+more than the tolerance. Stages are compared on their fastest round by
+default, which is far less sensitive to background load than the median.
+Baselines are machine specific; record one on the box you compare on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+
+from camera_thread import prepare_frame
+from packed_mask import PackedMask
+from path_geometry import mask_centroid, mask_to_uint8
+from processing_threads import draw_detection_overlay, draw_segmentation_overlay
+from simulation import SimulatedDrone, StubDetectionModel, StubSegmentationModel
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register ``setup``; it returns the zero-argument callable to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _scene():
+    """A raw camera frame with both the path and the pad in view."""
+    drone = SimulatedDrone()
+    drone.takeoff()
+    drone.move_down(30)
+    drone.move_forward(200)
+    drone.move_forward(200)
+    frame = drone.render().copy()
+    rgb = prepare_frame(frame)
+    mask = StubSegmentationModel().predict(rgb)[0].masks.data.cpu().numpy()[0]
+    boxes = StubDetectionModel().predict(rgb)[0].boxes.data.cpu().numpy()
+    return frame, rgb, mask, boxes
+
+
+@benchmark("camera.prepare_frame")
+def _camera_prepare_frame(scene):
+    frame = scene[0]
+    return lambda: prepare_frame(frame)
+
+
+@benchmark("mission.mask_centroid")
+def _mission_mask_centroid(scene):
+    mask = scene[2]
+    return lambda: mask_centroid(mask_to_uint8(mask))
+
+
+@benchmark("mission.packed_centroid")
+def _mission_packed_centroid(scene):
+    mask = scene[2]
+    return lambda: PackedMask.from_array(mask).centroid()
+
+
+@benchmark("segmentation.overlay")
+def _segmentation_overlay(scene):
+    rgb, mask = scene[1], scene[2]
+    return lambda: draw_segmentation_overlay(rgb, mask)
+
+
+@benchmark("segmentation.packed_overlay")
+def _segmentation_packed_overlay(scene):
+    rgb, mask = scene[1], scene[2]
+    return lambda: draw_segmentation_overlay(rgb, PackedMask.from_array(mask))
+
+
+@benchmark("detection.overlay")
+def _detection_overlay(scene):
+    rgb, boxes = scene[1], scene[3]
+    return lambda: draw_detection_overlay(rgb, boxes)
+
+
+@benchmark("display.frame_to_pixmap")
+def _display_frame_to_pixmap(scene):
+    from PySide6.QtCore import QSize
+    from PySide6.QtWidgets import QApplication
+    from main_window_final import frame_to_pixmap
+
+    _display_frame_to_pixmap.app = QApplication.instance() or QApplication(sys.argv[:1])
+    rgb, size = scene[1], QSize(400, 300)
+    return lambda: frame_to_pixmap(rgb, size)
+
+
+@benchmark("model.segment_predict")
+def _model_segment_predict(scene):
+    model, rgb = StubSegmentationModel(), scene[1]
+    return lambda: model.predict(source=rgb, task='segment', imgsz=640, conf=0.4, verbose=False)
+
+
+@benchmark("model.detect_predict")
+def _model_detect_predict(scene):
+    model, rgb = StubDetectionModel(), scene[1]
+    return lambda: model.predict(source=rgb, task='detect', imgsz=640, conf=0.4, verbose=False)
+
+
+def measure(fn, repeats=7, min_time=0.05):
+    """Time ``fn`` in ``repeats`` rounds of at least ``min_time`` seconds each."""
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        number *= 2
+
+    per_call = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number)
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "min_us": min(per_call) * 1e6,
+        "number": number,
+        "repeats": repeats,
+    }
+
+
+def run_suite(names=None, repeats=7, min_time=0.05):
+    scene = _scene()
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if names and not any(pattern in name for pattern in names):
+            continue
+        results[name] = measure(setup(scene), repeats, min_time)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.25, metric="min_us"):
+    """Return ``(name, baseline_us, current_us, ratio, regressed)`` per shared stage."""
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result[metric] / base[metric]
+        rows.append((name, base[metric], result[metric], ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot-path stages.")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline file")
+    parser.add_argument("--compare", metavar="PATH", nargs="?", const=DEFAULT_BASELINE,
+                        help="compare against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--metric", choices=("min_us", "median_us"), default="min_us")
+    parser.add_argument("--filter", nargs="*", help="only run stages containing these strings")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    current = run_suite(args.filter, args.repeats, args.min_time)
+    for name, result in current["results"].items():
+        print(f"{name:<28} median {result['median_us']:10.1f} us   min {result['min_us']:10.1f} us")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(baseline, current, args.tolerance, args.metric)
+        print(f"\nCompared with {args.compare} (tolerance {args.tolerance:.0%}):")
+        for name, base_us, current_us, ratio, regressed in rows:
+            flag = "REGRESSION" if regressed else "ok"
+            print(f"{name:<28} {base_us:10.1f} -> {current_us:10.1f} us  x{ratio:5.2f}  {flag}")
+        if any(row[4] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Import-time budgets for the package and the headless modules.
+
+Each target is imported in a fresh interpreter under ``-X importtime``. Time
+spent importing what the interpreter loads at startup anyway is excluded, so
+the total is what ``import <target>`` itself costs. Every target has a time
+budget and a list of heavy packages it must not load:
+
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --target drone_worker --top 15
+
+Exits with status 1 when a target is over budget or loads a forbidden package.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC = os.path.join(ROOT, 'src')
+
+HEAVY = ("torch", "ultralytics", "PySide6", "djitellopy")
+
+# target -> (budget in ms, packages that must not be imported)
+BUDGETS = {
+    "src": (50, HEAVY),
+    "mission_state": (50, HEAVY),
+    "src.path_geometry": (600, HEAVY),
+    "simulation": (1000, HEAVY),
+    "drone_worker": (1500, ("torch", "ultralytics", "djitellopy")),
+}
+
+
+def parse_importtime(text):
+    """``(name, self_us, cumulative_us, depth)`` for each line of ``-X importtime`` output."""
+    entries = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        entries.append((stripped, int(fields[0]), int(fields[1]), depth))
+    return entries
+
+
+def _run(statement):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([SRC, ROOT]), QT_QPA_PLATFORM="offscreen")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_import(target, repeats=3):
+    """Cost of ``import target`` in a fresh interpreter, fastest of ``repeats`` runs."""
+    startup = {entry[0] for entry in _run("pass")}
+    best = None
+    for _ in range(repeats):
+        entries = [entry for entry in _run(f"import {target}") if entry[0] not in startup]
+        total = sum(entry[2] for entry in entries if entry[3] == 0)
+        if best is None or total < best[0]:
+            best = (total, entries)
+    total, entries = best
+    modules = {entry[0] for entry in entries}
+    return {
+        "target": target,
+        "total_ms": total / 1000,
+        "modules": len(modules),
+        "heavy": sorted(name for name in HEAVY if name in modules),
+        "top": [(name, cumulative / 1000) for name, _, cumulative, _
+                in sorted(entries, key=lambda entry: -entry[2]) if name != target][:10],
+        "imported": modules,
+    }
+
+
+def check_budget(result, budget_ms, forbidden):
+    """Reasons ``result`` breaks its budget; empty when it is within it."""
+    problems = []
+    if result["total_ms"] > budget_ms:
+        problems.append(f"{result['total_ms']:.0f} ms > {budget_ms} ms")
+    loaded = sorted(name for name in forbidden if name in result["imported"])
+    if loaded:
+        problems.append("imports " + ", ".join(loaded))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import times against their budgets.")
+    parser.add_argument("--target", nargs="*", help="only these targets (default: every budgeted one)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per target")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for target in args.target or BUDGETS:
+        budget_ms, forbidden = BUDGETS.get(target, (float("inf"), ()))
+        result = measure_import(target, args.repeats)
+        problems = check_budget(result, budget_ms, forbidden)
+        failed = failed or bool(problems)
+        status = "; ".join(problems) if problems else "ok"
+        print(f"{target:<20} {result['total_ms']:8.1f} ms  {result['modules']:4d} modules  "
+              f"budget {budget_ms} ms  {status}")
+        for name, cumulative_ms in result["top"][:args.top]:
+            print(f"    {name:<40} {cumulative_ms:8.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Bit-packed path masks against the float mask path.
+
+The segmentation model returns each mask as float32. Until now the worker
+scaled it to uint8 for ``cv2.moments``, and the overlay thread also resized
+it to the display. ``packed_mask.PackedMask`` keeps one bit per pixel
+inside the mask's bounding box.
+
+For each scene this benchmark gives the bytes each form takes:
+- the float32 array;
+- the uint8 copy;
+- a pickle of the float array (what crossing a process boundary costs);
+- the packed mask.
+
+It also times each step on both paths:
+- the steering centroid;
+- full moments;
+- a pickle round trip;
+- the 960x720 overlay.
+
+The scenes are masks from the stub segmenter over the simulated course. A
+worst case of random noise is included, where the bounding box is the whole
+frame:
+
+    python benchmarks/bench_packed_mask.py
+    python benchmarks/bench_packed_mask.py --json masks.json
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import cv2
+import numpy as np
+
+from bench_hot_paths import measure
+from packed_mask import PackedMask
+from path_geometry import mask_centroid, mask_to_uint8
+from processing_threads import draw_segmentation_overlay
+from simulation import SimulatedDrone, StubSegmentationModel
+
+DISPLAY = (960, 720)
+
+
+def scenes():
+    """Float masks by name, as the segmenter returns them."""
+    from camera_thread import prepare_frame
+
+    masks = {}
+    drone = SimulatedDrone()
+    drone.takeoff()
+    drone.move_down(30)
+    for name, forward in (("start", 0), ("path", 200), ("pad", 200)):
+        if forward:
+            drone.move_forward(forward)
+        rgb = prepare_frame(drone.render())
+        masks[name] = StubSegmentationModel().predict(rgb)[0].masks.data.cpu().numpy()[0]
+    noise = np.random.default_rng(0).random(masks["path"].shape) > 0.5
+    masks["noise"] = noise.astype(np.float32)
+    return masks
+
+
+def compare(mask, repeats=5, min_time=0.02):
+    """Sizes in bytes and per-step times in microseconds for one float mask."""
+    packed = PackedMask.from_array(mask)
+    frame = np.zeros((DISPLAY[1], DISPLAY[0], 3), dtype=np.uint8)
+
+    def us(fn):
+        return round(measure(fn, repeats, min_time)["min_us"], 1)
+
+    return {
+        "bbox": packed.bbox,
+        "bytes": {"float32": mask.nbytes, "uint8": mask_to_uint8(mask).nbytes,
+                  "float_pickle": len(pickle.dumps(mask)), "packed": packed.nbytes,
+                  "packed_pickle": len(pickle.dumps(packed))},
+        "float_us": {
+            "centroid": us(lambda: mask_centroid(mask_to_uint8(mask))),
+            "moments": us(lambda: cv2.moments(mask_to_uint8(mask), binaryImage=True)),
+            "pickle": us(lambda: pickle.loads(pickle.dumps(mask))),
+            "overlay": us(lambda: draw_segmentation_overlay(frame, mask)),
+        },
+        "packed_us": {
+            "pack": us(lambda: PackedMask.from_array(mask)),
+            "centroid": us(lambda: PackedMask.from_array(mask).centroid()),
+            "moments": us(packed.moments),
+            "pickle": us(lambda: pickle.loads(pickle.dumps(packed))),
+            "overlay": us(lambda: draw_segmentation_overlay(frame, PackedMask.from_array(mask))),
+        },
+    }
+
+
+def measure_all(names=None, repeats=5, min_time=0.02):
+    masks = scenes()
+    return {name: compare(mask, repeats, min_time) for name, mask in masks.items()
+            if not names or name in names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare packed and float path masks.")
+    parser.add_argument("--scenes", nargs="*", help="only these scenes (start, path, pad, noise)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", metavar="PATH", help="also write the results here")
+    args = parser.parse_args(argv)
+
+    results = measure_all(args.scenes, args.repeats)
+    steps = ("centroid", "moments", "pickle", "overlay")
+    print(f"{'scene':<6} {'float32':>9} {'pickle':>9} {'packed':>7}" + "".join(f"  {step + ' us':>15}" for step in steps))
+    for name, r in results.items():
+        b, f, p = r["bytes"], r["float_us"], r["packed_us"]
+        print(f"{name:<6} {b['float32']:>9} {b['float_pickle']:>9} {b['packed']:>7}"
+              + "".join(f"  {f[step]:>7.0f} {p[step]:>7.0f}" for step in steps))
+    print("times are float then packed; packed centroid and overlay include packing the float mask")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Fixed against adaptive control and overlay rates, in real time.
+
+A ``DroneWorker`` flies a simulated mission on its own ``QThread``. The GUI's
+segmentation and detection overlay threads run next to it, resumed and
+paused by mission state as ``DroneGUI`` does. The stub models burn real CPU
+for ``--inference-time`` (control) and ``--overlay-time`` (overlays) per
+prediction, so the process load the rate controller measures is real. The
+drone's moves block for their simulated duration times ``--time-scale``.
+
+Each mode flies the same course:
+
+- ``fixed``: every state's own tick period and the overlays' fixed 0.1 s;
+- ``adaptive``: ``RateController`` with the CPU meter, as the GUI runs it;
+- ``power_save``: the same on a battery-powered board (``--power-save``).
+
+``--busy-threads`` adds Python threads that compete for the CPU, as a
+loaded board would. The report gives CPU seconds, the share of the CPU
+used, the number of control and overlay predictions, and the mean tick per
+state:
+
+    python benchmarks/bench_rate_control.py
+    python benchmarks/bench_rate_control.py --busy-threads 1 --json rates.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from PySide6.QtCore import QCoreApplication, QObject, Qt, QThread, Signal
+
+from bench_safety_lane import PacedDrone, _busy
+
+MODES = ("fixed", "adaptive", "power_save")
+
+# A path long enough to follow for a while before the pad comes into view
+COURSE = {"path": [(400, 2360), (400, 200)], "pad": (400, 140), "floor_size": (800, 2400)}
+
+
+class BusyModel:
+    """A stub model that holds the CPU for ``cost`` seconds per prediction."""
+
+    def __init__(self, model, cost):
+        self.model = model
+        self.cost = cost
+        self.calls = 0
+
+    def predict(self, *args, **kwargs):
+        self.calls += 1
+        deadline = time.perf_counter() + self.cost
+        while time.perf_counter() < deadline:
+            pass
+        return self.model.predict(*args, **kwargs)
+
+
+class Starter(QObject):
+    takeoff = Signal()
+
+
+def fly(mode, inference_time=0.1, overlay_time=0.08, time_scale=0.5, timeout=300.0, course=None):
+    """Fly one mission in ``mode`` on ``course`` (default ``COURSE``); returns its CPU use, predictions and rates."""
+    import cv2
+
+    from drone_worker import DroneWorker
+    from mission_state import PAD_ALIGN, PAD_SEARCH, PATH_FOLLOW, PATH_RECOVERY
+    from processing_threads import DetectionThread, SegmentationThread
+    from simulation import SimulatedDrone, load_stub_models
+
+    sim = SimulatedDrone(**(course or COURSE))
+    drone = PacedDrone(sim, time_scale)
+    worker = DroneWorker(drone_factory=lambda: drone)
+    path_stub, pad_stub = load_stub_models()
+    worker.path_model, worker.pad_model = BusyModel(path_stub, inference_time), BusyModel(pad_stub, inference_time)
+    worker.sleep_scale = time_scale
+    worker.rate_control.enabled = mode != "fixed"
+    worker.rate_control.power_save = mode == "power_save"
+    rate = None if mode == "fixed" else worker.rate_control
+
+    overlays = (SegmentationThread(BusyModel(path_stub, overlay_time), rate=rate),
+                DetectionThread(BusyModel(pad_stub, overlay_time), rate=rate))
+    frame = cv2.resize(sim.render(), (960, 720))
+    for thread in overlays:
+        thread.set_frame(frame)
+        thread.pause()
+        thread.start()
+
+    starter = Starter()
+    starter.takeoff.connect(worker.start_drone_mission)
+    ready, finished = threading.Event(), threading.Event()
+    worker.signals.mission_started.connect(ready.set, Qt.DirectConnection)
+    worker.signals.mission_finished.connect(finished.set, Qt.DirectConnection)
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    thread.start()
+    try:
+        if not ready.wait(30):
+            raise RuntimeError("worker did not connect")
+        started, cpu_started = time.monotonic(), time.process_time()
+        starter.takeoff.emit()
+        deadline = started + timeout
+        while not finished.is_set() and time.monotonic() < deadline:
+            # What DroneGUI.on_new_frame does with each camera frame
+            state = worker.mission.state
+            segmenting = state in (PATH_FOLLOW, PATH_RECOVERY)
+            for overlay, active in zip(overlays, (segmenting, state in (PAD_ALIGN, PAD_SEARCH))):
+                overlay.resume() if active else overlay.pause()
+            time.sleep(0.05)
+        wall = time.monotonic() - started
+        cpu = time.process_time() - cpu_started
+    finally:
+        for overlay in overlays:
+            overlay.stop()
+        thread.quit()
+        thread.wait()
+        worker.safety.stop()
+
+    rates = worker.rate_reports[-1] if worker.rate_reports else None
+    return {
+        "mode": mode,
+        "on_pad": not sim.flying and sim.distance_to_pad() <= sim.pad_size / 2,
+        "wall_s": round(wall, 2),
+        "cpu_s": round(cpu, 2),
+        "cpu_share": round(cpu / wall / (len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else 1), 3),
+        "control_predictions": worker.path_model.calls + worker.pad_model.calls,
+        "overlay_predictions": sum(overlay.model.calls for overlay in overlays),
+        "states": [record["to"] for record in worker.mission.history],
+        "mean_tick_ms": {name: s["mean_tick_ms"] for name, s in rates["states"].items()} if rates else None,
+        "mean_overlay_ms": {name: s["mean_overlay_ms"] for name, s in rates["states"].items()} if rates else None,
+        "rate_changes": rates["changes"] if rates else 0,
+    }
+
+
+def measure(modes=MODES, inference_time=0.1, overlay_time=0.08, time_scale=0.5, timeout=300.0, course=None,
+            busy_threads=0):
+    """Fly the course once per mode; returns the settings and one result per mode."""
+    QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    stop = threading.Event()
+    load = [threading.Thread(target=_busy, args=(stop,), daemon=True) for _ in range(busy_threads)]
+    for thread in load:
+        thread.start()
+    try:
+        results = [fly(mode, inference_time, overlay_time, time_scale, timeout, course) for mode in modes]
+    finally:
+        stop.set()
+        for thread in load:
+            thread.join()
+    return {"inference_time": inference_time, "overlay_time": overlay_time, "time_scale": time_scale,
+            "busy_threads": busy_threads, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare fixed and adaptive control and overlay rates.")
+    parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+    parser.add_argument("--inference-time", type=float, default=0.1, help="CPU seconds per control prediction")
+    parser.add_argument("--overlay-time", type=float, default=0.08, help="CPU seconds per overlay prediction")
+    parser.add_argument("--time-scale", type=float, default=0.5,
+                        help="real seconds per simulated second of flying and sleeping")
+    parser.add_argument("--timeout", type=float, default=300.0, help="give up on a mission after this long")
+    parser.add_argument("--busy-threads", type=int, default=0, help="Python threads competing for the CPU")
+    parser.add_argument("--json", metavar="PATH", help="also write the results here")
+    args = parser.parse_args(argv)
+
+    result = measure(args.modes, args.inference_time, args.overlay_time, args.time_scale, args.timeout,
+                     busy_threads=args.busy_threads)
+    print(f"control {args.inference_time * 1000:.0f} ms, overlays {args.overlay_time * 1000:.0f} ms per prediction")
+    print(f"{'mode':<11} {'pad':<7} {'wall s':>7} {'CPU s':>7} {'CPU':>5} {'control':>8} {'overlay':>8}  mean tick")
+    for r in result["results"]:
+        ticks = ", ".join(f"{name} {ms} ms" for name, ms in (r["mean_tick_ms"] or {}).items()) or "state periods"
+        print(f"{r['mode']:<11} {'on pad' if r['on_pad'] else 'MISSED':<7} {r['wall_s']:>7.1f} {r['cpu_s']:>7.1f} "
+              f"{r['cpu_share']:>5.0%} {r['control_predictions']:>8} {r['overlay_predictions']:>8}  {ticks}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Key-press-to-emergency latency: the safety lane against the worker's queue.
+
+A ``DroneWorker`` runs on its own ``QThread``, as in the GUI, and flies a
+simulated mission that blocks the way a real one does:
+
+- every motion command holds the worker for the time the drone takes to fly
+  it (times ``--time-scale``), like djitellopy's blocking calls;
+- the sleeps between steps are scaled the same way;
+- each inference takes ``--inference-time`` seconds of real time;
+- ``--busy-threads`` Python threads compete for the GIL, standing in for
+  the GUI's display work.
+
+At a random moment the benchmark "presses Esc" in one of two ways:
+
+- ``queued``: emits a signal to ``DroneWorker.emergency_land``, which is how
+  the GUI used to do it, so the stop waits for the worker thread to come free;
+- ``lane``: calls ``worker.safety.trigger`` from the pressing thread, which
+  is what the GUI does now.
+
+Latency runs from the press until the drone receives ``emergency``.
+``--drone emulator`` flies ``TelloClient`` against the local UDP emulator
+instead. There is no video, so the presses land during takeoff, and it shows
+the in-flight command being pre-empted:
+
+    python benchmarks/bench_safety_lane.py --trials 10
+    python benchmarks/bench_safety_lane.py --drone emulator --motion-delay 3
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtCore import QCoreApplication, QObject, Qt, QThread, Signal
+
+from frame_trace import is_action
+
+MODES = ("queued", "lane")
+
+
+class PacedDrone:
+    """``SimulatedDrone`` whose commands block for (scaled) real time.
+
+    Notes when ``emergency`` reaches it.
+    """
+
+    def __init__(self, drone, time_scale):
+        self.drone = drone
+        self.time_scale = time_scale
+        self.emergency_at = []
+
+    def emergency(self):
+        self.emergency_at.append(time.monotonic())
+        return self.drone.emergency()
+
+    def __getattr__(self, name):
+        value = getattr(self.drone, name)
+        if not callable(value) or not is_action(name):
+            return value
+
+        def paced(*args, **kwargs):
+            before = self.drone.clock
+            result = value(*args, **kwargs)
+            time.sleep((self.drone.clock - before) * self.time_scale)
+            return result
+        return paced
+
+
+class Keyboard(QObject):
+    """The GUI side: its signals are queued to the worker's thread."""
+    takeoff = Signal()
+    escape = Signal()
+
+
+def _busy(stop):
+    x = 0
+    while not stop.is_set():
+        for i in range(10000):
+            x += i * i
+    return x
+
+
+def _make_worker(drone_kind, inference_time, time_scale, motion_delay):
+    from drone_worker import DroneWorker
+    from simulation import load_stub_models
+
+    cleanup = []
+    if drone_kind == "emulator":
+        from tello_async import TelloClient
+        from tello_emulator import TelloEmulator
+
+        client = TelloClient(host="127.0.0.1", command_port=0, state_port=0, video_port=0,
+                             timeout=motion_delay + 2, retries=0, bind_host="127.0.0.1")
+        emulator = TelloEmulator(state_port=client.client.state_port, motion_delay=motion_delay)
+        client.client.address = emulator.address
+        emulator.start()
+        cleanup += [client.end, emulator.stop]
+
+        def arrivals():
+            with emulator._lock:
+                return [t for t, command in emulator.received if command == "emergency"]
+        worker = DroneWorker(drone_factory=lambda: client)
+    else:
+        from simulation import SimulatedDrone
+
+        drone = PacedDrone(SimulatedDrone(), time_scale)
+        arrivals = lambda: drone.emergency_at
+        worker = DroneWorker(drone_factory=lambda: drone)
+    worker.path_model, worker.pad_model = load_stub_models(inference_time, time.sleep)
+    worker.sleep_scale = time_scale
+    return worker, arrivals, cleanup
+
+
+def trial(mode, press_after, drone="simulated", inference_time=0.3, time_scale=0.2, motion_delay=3.0,
+          timeout=30.0):
+    """Start a mission, press Esc ``press_after`` seconds in and time the stop."""
+    worker, arrivals, cleanup = _make_worker(drone, inference_time, time_scale, motion_delay)
+    keyboard = Keyboard()
+    keyboard.takeoff.connect(worker.start_drone_mission)
+    keyboard.escape.connect(worker.emergency_land)
+    ready, finished = threading.Event(), threading.Event()
+    finished_at = []
+    worker.signals.mission_started.connect(ready.set, Qt.DirectConnection)
+    worker.signals.mission_finished.connect(
+        lambda: (finished_at.append(time.monotonic()), finished.set()), Qt.DirectConnection)
+
+    thread = QThread()
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+    thread.start()
+    try:
+        if not ready.wait(timeout):
+            raise RuntimeError("worker did not connect")
+        keyboard.takeoff.emit()
+        time.sleep(press_after)
+        pressed = time.monotonic()
+        if mode == "lane":
+            worker.safety.trigger("emergency", "benchmark")
+        else:
+            keyboard.escape.emit()
+
+        deadline = pressed + timeout
+        while not arrivals() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        finished.wait(max(0.0, deadline - time.monotonic()))
+        # Give a second, wrongly queued mission end the chance to show up
+        time.sleep(0.1)
+        arrived = arrivals()
+        return {
+            "mode": mode,
+            "press_after_s": round(press_after, 3),
+            "latency_ms": round((arrived[0] - pressed) * 1000, 2) if arrived else None,
+            "finished_ms": round((finished_at[0] - pressed) * 1000, 1) if finished_at else None,
+            "finished_signals": len(finished_at),
+            "state": worker.mission.history[-1]["from"] if worker.mission.history else None,
+        }
+    finally:
+        thread.quit()
+        thread.wait()
+        worker.safety.stop()
+        for close in reversed(cleanup):
+            close()
+
+
+def _stats(values):
+    values = [v for v in values if v is not None]
+    if not values:
+        return None
+    ordered = sorted(values)
+    return {"p50": round(statistics.median(ordered), 2),
+            "p95": round(ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))], 2),
+            "max": round(ordered[-1], 2)}
+
+
+def measure(trials=10, modes=MODES, drone="simulated", inference_time=0.3, time_scale=0.2,
+            motion_delay=3.0, press_window=(0.5, 6.0), busy_threads=1, seed=0):
+    """Run ``trials`` presses per mode at the same random moments; returns the summary and trials."""
+    QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    rng = random.Random(seed)
+    moments = [rng.uniform(*press_window) for _ in range(trials)]
+    stop = threading.Event()
+    load = [threading.Thread(target=_busy, args=(stop,), daemon=True) for _ in range(busy_threads)]
+    for thread in load:
+        thread.start()
+    try:
+        results = [trial(mode, moment, drone, inference_time, time_scale, motion_delay)
+                   for moment in moments for mode in modes]
+    finally:
+        stop.set()
+        for thread in load:
+            thread.join()
+    summary = {mode: {"latency_ms": _stats([r["latency_ms"] for r in results if r["mode"] == mode]),
+                      "finished_ms": _stats([r["finished_ms"] for r in results if r["mode"] == mode]),
+                      "missed": sum(r["latency_ms"] is None for r in results if r["mode"] == mode)}
+               for mode in modes}
+    return {"drone": drone, "trials": trials, "summary": summary, "results": results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time Esc to emergency through the safety lane and the worker queue.")
+    parser.add_argument("--trials", type=int, default=10, help="presses per mode")
+    parser.add_argument("--modes", nargs="*", choices=MODES, default=list(MODES))
+    parser.add_argument("--drone", choices=("simulated", "emulator"), default="simulated")
+    parser.add_argument("--inference-time", type=float, default=0.3, help="real seconds per inference")
+    parser.add_argument("--time-scale", type=float, default=0.2,
+                        help="real seconds per simulated second of flying and sleeping")
+    parser.add_argument("--motion-delay", type=float, default=3.0,
+                        help="emulator: seconds before a motion command is acknowledged")
+    parser.add_argument("--press-window", type=float, nargs=2, default=(0.5, 6.0), metavar=("FROM", "TO"),
+                        help="press Esc this many seconds after takeoff is requested")
+    parser.add_argument("--busy-threads", type=int, default=1, help="Python threads competing for the GIL")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the results here")
+    args = parser.parse_args(argv)
+
+    result = measure(args.trials, args.modes, args.drone, args.inference_time, args.time_scale,
+                     args.motion_delay, tuple(args.press_window), args.busy_threads, args.seed)
+    print(f"{args.drone} drone, {args.trials} presses per mode, {args.busy_threads} busy threads")
+    print(f"{'mode':<8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}   {'ended p50 ms':>12} {'missed':>6}")
+    for mode, s in result["summary"].items():
+        latency, ended = s["latency_ms"] or {}, s["finished_ms"] or {}
+        print(f"{mode:<8} {latency.get('p50', '-'):>9} {latency.get('p95', '-'):>9} {latency.get('max', '-'):>9}"
+              f"   {ended.get('p50', '-'):>12} {s['missed']:>6}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+GUI-thread cost of the telemetry plots over a long session.
+
+Feeds ``--hours`` of telemetry at ``--rate`` samples a second into two panels
+and measures them every ``--every`` simulated minutes:
+
+- ``ring``: ``telemetry_plot.TelemetryPanel``, which uses fixed NumPy rings,
+  draws min/max per pixel column and repaints at most ``--max-fps`` a second;
+- ``naive``: Python lists that grow for the whole session, drawing every
+  sample in the window and repainting on every sample. That is what
+  plotting each telemetry signal as it arrives amounts to.
+
+It reports each panel's memory, the cost of appending a sample and of one
+paint (``QWidget.grab``), and the share of the GUI thread it would take at
+``--rate``:
+
+    python benchmarks/bench_telemetry_plot.py
+    python benchmarks/bench_telemetry_plot.py --hours 4 --rate 30 --json plot.json
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QApplication, QWidget
+
+from telemetry_plot import CHANNELS, TelemetryPanel
+
+FLOAT_BYTES = sys.getsizeof(1.0)
+
+
+class SessionClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class NaivePanel(QWidget):
+    """Unbounded lists, every visible sample drawn, a repaint per sample."""
+
+    def __init__(self, window_s, clock):
+        super().__init__()
+        self.window_s = window_s
+        self.clock = clock
+        self.series = {key: ([], []) for key, *_ in CHANNELS}
+
+    def add_sample(self, data):
+        t = self.clock()
+        for key, (times, values) in self.series.items():
+            value = data.get(key)
+            if value is not None:
+                times.append(t)
+                values.append(float(value))
+
+    def nbytes(self):
+        return sum(sys.getsizeof(times) + sys.getsizeof(values) + FLOAT_BYTES * (len(times) + len(values))
+                   for times, values in self.series.values())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1e1e1e"))
+        end = self.clock()
+        start = end - self.window_s
+        height = self.height() / len(CHANNELS)
+        for row, (key, _, _, colour) in enumerate(CHANNELS):
+            times, values = self.series[key]
+            first = bisect.bisect_left(times, start)
+            visible = values[first:]
+            if not visible:
+                continue
+            rect = QRectF(0, row * height, self.width(), height)
+            bottom, top = min(visible), max(visible)
+            scale = rect.height() / ((top - bottom) or 1)
+            x_scale = rect.width() / self.window_s
+            points = [QPointF((t - start) * x_scale, rect.bottom() - (v - bottom) * scale)
+                      for t, v in zip(times[first:], visible)]
+            painter.setPen(QPen(QColor(colour), 1))
+            painter.drawPolyline(QPolygonF(points))
+        painter.end()
+
+
+def telemetry(i, rate):
+    """A plausible sample ``i``: stepped altitude, draining battery, turning yaw, noisy latencies."""
+    t = i / rate
+    return {
+        "altitude": 80 + 20 * ((i // 300) % 4),
+        "battery": max(0, 100 - int(t / 60)),
+        "yaw": (t * 7 + 180) % 360 - 180,
+        "inference_ms": 35 + 10 * math.sin(i * 0.7) + (60 if i % 211 == 0 else 0),
+        "command_ms": 40 + (900 if i % 157 == 0 else 0),
+    }
+
+
+def _paint_ms(panel, repeats=3):
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        panel.grab()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def measure(hours=2.0, rate=30.0, every_min=30.0, window_s=300.0, max_fps=5.0, width=1150, height=220):
+    """Feed both panels the same session; returns one row per checkpoint."""
+    QApplication.instance() or QApplication(sys.argv[:1])
+    clock = SessionClock()
+    ring = TelemetryPanel(window_s=window_s, max_fps=max_fps, clock=clock)
+    naive = NaivePanel(window_s, clock)
+    for panel in (ring, naive):
+        panel.resize(width, height)
+
+    rows = []
+    total = int(hours * 3600 * rate)
+    step = max(1, int(every_min * 60 * rate))
+    for chunk_start in range(0, total, step):
+        chunk = [telemetry(i, rate) for i in range(chunk_start, min(total, chunk_start + step))]
+        append_us = {}
+        for name, panel in (("ring", ring), ("naive", naive)):
+            started = time.perf_counter()
+            for offset, sample in enumerate(chunk):
+                clock.now = (chunk_start + offset) / rate
+                panel.add_sample(sample)
+            append_us[name] = (time.perf_counter() - started) / len(chunk) * 1e6
+        ring_paint, naive_paint = _paint_ms(ring), _paint_ms(naive)
+        ring_redraws = min(rate, max_fps)
+        rows.append({
+            "hours": round(clock.now / 3600, 2),
+            "samples": chunk_start + len(chunk),
+            "ring_kb": round(sum(b.t.nbytes + b.values.nbytes for b in ring.buffers.values()) / 1024),
+            "naive_kb": round(naive.nbytes() / 1024),
+            "ring_append_us": round(append_us["ring"], 2),
+            "naive_append_us": round(append_us["naive"], 2),
+            "ring_paint_ms": round(ring_paint, 2),
+            "naive_paint_ms": round(naive_paint, 2),
+            # Share of each second the GUI thread spends on the plots
+            "ring_gui_load": round((rate * append_us["ring"] / 1e6) + ring_redraws * ring_paint / 1000, 3),
+            "naive_gui_load": round(rate * (append_us["naive"] / 1e6 + naive_paint / 1000), 3),
+        })
+    return {"hours": hours, "rate": rate, "window_s": window_s, "max_fps": max_fps, "rows": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure telemetry plot memory and GUI-thread cost over a session.")
+    parser.add_argument("--hours", type=float, default=2.0, help="simulated session length")
+    parser.add_argument("--rate", type=float, default=30.0, help="telemetry samples per second")
+    parser.add_argument("--every", type=float, default=30.0, help="simulated minutes between measurements")
+    parser.add_argument("--window", type=float, default=300.0, help="seconds of history on screen")
+    parser.add_argument("--max-fps", type=float, default=5.0, help="repaint cap of the ring panel")
+    parser.add_argument("--json", metavar="PATH", help="also write the results here")
+    args = parser.parse_args(argv)
+
+    result = measure(args.hours, args.rate, args.every, args.window, args.max_fps)
+    print(f"{args.rate:g} samples/s, {args.window:g} s on screen, ring panel capped at {args.max_fps:g} fps")
+    print(f"{'hours':>6} {'memory KB':>19} {'append us':>15} {'paint ms':>15} {'GUI thread':>15}")
+    print(f"{'':>6} {'ring':>9} {'naive':>9} {'ring':>7} {'naive':>7} {'ring':>7} {'naive':>7} {'ring':>7} {'naive':>7}")
+    for r in result["rows"]:
+        print(f"{r['hours']:>6.2f} {r['ring_kb']:>9} {r['naive_kb']:>9} {r['ring_append_us']:>7.1f} "
+              f"{r['naive_append_us']:>7.1f} {r['ring_paint_ms']:>7.1f} {r['naive_paint_ms']:>7.1f} "
+              f"{r['ring_gui_load']:>7.1%} {r['naive_gui_load']:>7.1%}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark the asyncio Tello client against the local emulator.
+
+Compares blocking one-at-a-time commands with pipelined ``submit`` calls, and
+state-snapshot getters with query round trips, for a given emulated reply
+latency. No drone is needed.
+
+    python benchmarks/bench_tello_client.py --commands 200 --latency 0.005
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tello_async import TelloClient
+from tello_emulator import TelloEmulator
+
+
+def _timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _report(name, samples):
+    samples = sorted(samples)
+    p95 = samples[int(0.95 * (len(samples) - 1))]
+    print(f"{name:<32} mean {statistics.mean(samples) * 1e3:8.3f} ms"
+          f"   p95 {p95 * 1e3:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="emulated reply latency in seconds")
+    args = parser.parse_args()
+
+    client = TelloClient(host="127.0.0.1", command_port=0, state_port=0,
+                         timeout=1.0, retries=1, bind_host="127.0.0.1")
+    emulator = TelloEmulator(state_port=client.client.state_port, state_hz=50,
+                             response_delay=args.latency)
+    client.client.address = emulator.address
+    emulator.start()
+    try:
+        client.connect()
+
+        start = time.perf_counter()
+        for _ in range(args.commands):
+            client.set_speed(10)
+        blocking = time.perf_counter() - start
+
+        start = time.perf_counter()
+        futures = [client.submit("speed 10") for _ in range(args.commands)]
+        for future in futures:
+            future.result()
+        pipelined = time.perf_counter() - start
+
+        print(f"{args.commands} commands, {args.latency * 1e3:.1f} ms emulated latency")
+        print(f"{'blocking commands':<32} {args.commands / blocking:8.1f} cmd/s")
+        print(f"{'pipelined submit':<32} {args.commands / pipelined:8.1f} cmd/s")
+        _report("get_height (state snapshot)", _timed(client.get_height, args.commands))
+        _report("height? (query round trip)",
+                _timed(lambda: client.send_command_with_return("height?"), args.commands))
+    finally:
+        client.end()
+        emulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Time to ready: a cold start against a warm re-arm.
+
+A cold start is what a non-persistent GUI pays again for every flight: a new
+interpreter, the imports, model loading and the first slow inference, then
+the connection to the drone. A warm re-arm (``DroneWorker.rearm``, used by
+``main.py --persistent``) resets the mission state and wakes the existing
+handle, as it would after a battery swap.
+
+The start runs in a fresh process and is timed from spawn to ready. The same
+process then re-arms ``--rearms`` times. By default it connects a
+``TelloClient`` to a local ``TelloEmulator`` and builds untrained YOLO models
+from the ultralytics configs, which costs the same to load and warm up as
+the real weights. Pass the real weights instead, or use ``--models stub``:
+
+    python benchmarks/bench_time_to_ready.py
+    python benchmarks/bench_time_to_ready.py --path-model epoch50.pt --pad-model best_pad_new.pt
+    python benchmarks/bench_time_to_ready.py --drone simulated --models stub
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+DEFAULT_MODELS = ("yolov8n-seg.yaml", "yolov8n.yaml")
+
+
+def _make_worker(drone_kind, models, path_model, pad_model, response_delay):
+    from drone_worker import DroneWorker
+
+    cleanup = []
+    if drone_kind == "emulator":
+        from tello_async import TelloClient
+        from tello_emulator import TelloEmulator
+
+        def factory():
+            client = TelloClient(host="127.0.0.1", command_port=0, state_port=0, video_port=0,
+                                 timeout=1.0, retries=1, bind_host="127.0.0.1")
+            emulator = TelloEmulator(state_port=client.client.state_port, response_delay=response_delay)
+            client.client.address = emulator.address
+            emulator.start()
+            cleanup.extend([client.end, emulator.stop])
+            return client
+    else:
+        from simulation import SimulatedDrone
+
+        drone = SimulatedDrone()
+        factory = lambda: drone
+
+    worker = DroneWorker(path_model_path=path_model, pad_model_path=pad_model, drone_factory=factory)
+    if models == "stub":
+        from simulation import load_stub_models
+        worker.path_model, worker.pad_model = load_stub_models()
+    return worker, cleanup
+
+
+def child(args):
+    """Runs in the spawned process: one cold start, then the re-arms."""
+    worker, cleanup = _make_worker(args.drone, args.models, args.path_model, args.pad_model,
+                                   args.response_delay)
+    try:
+        worker.run()
+        if not worker.ready_times:
+            raise SystemExit("worker failed to connect")
+        print(json.dumps({"event": "cold", **worker.ready_times[-1]}), flush=True)
+        warm = [worker.rearm() for _ in range(args.rearms)]
+        print(json.dumps({"event": "warm", "records": warm}), flush=True)
+    finally:
+        for close in reversed(cleanup):
+            close()
+    return 0
+
+
+def measure(drone="emulator", models="yolo", path_model=DEFAULT_MODELS[0], pad_model=DEFAULT_MODELS[1],
+            rearms=5, response_delay=0.0):
+    """Spawn a cold start and return its timings with those of the re-arms after it."""
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--drone", drone, "--models", models,
+               "--path-model", path_model, "--pad-model", pad_model, "--rearms", str(rearms),
+               "--response-delay", str(response_delay)]
+    spawned = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    cold = warm = None
+    process_s = None
+    for line in process.stdout:
+        if not line.startswith("{"):
+            continue
+        record = json.loads(line)
+        if record["event"] == "cold":
+            process_s = time.perf_counter() - spawned
+            cold = record
+        elif record["event"] == "warm":
+            warm = record["records"]
+    stderr = process.stderr.read()
+    if process.wait() != 0 or cold is None:
+        raise RuntimeError(f"time-to-ready child failed:\n{stderr[-2000:]}")
+
+    warm_s = [record["seconds"] for record in warm]
+    return {
+        "drone": drone,
+        "models": models if models == "stub" else f"{path_model}, {pad_model}",
+        "cold_process_s": round(process_s, 3),
+        "cold_run_s": cold["seconds"],
+        "models_s": cold["models_s"],
+        "connect_s": cold["connect_s"],
+        "warm_modes": sorted({record["mode"] for record in warm}),
+        "warm_median_s": round(statistics.median(warm_s), 3) if warm_s else None,
+        "warm_max_s": round(max(warm_s), 3) if warm_s else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cold-start and warm re-arm time to ready.")
+    parser.add_argument("--drone", choices=("emulator", "simulated"), default="emulator")
+    parser.add_argument("--models", choices=("yolo", "stub"), default="yolo",
+                        help="load YOLO models (default: untrained from configs) or use the stubs")
+    parser.add_argument("--path-model", default=DEFAULT_MODELS[0])
+    parser.add_argument("--pad-model", default=DEFAULT_MODELS[1])
+    parser.add_argument("--rearms", type=int, default=5)
+    parser.add_argument("--response-delay", type=float, default=0.0,
+                        help="emulated seconds before each command reply")
+    parser.add_argument("--json", metavar="PATH", help="also write the result here")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        return child(args)
+
+    result = measure(args.drone, args.models, args.path_model, args.pad_model, args.rearms,
+                     args.response_delay)
+    print(f"drone {result['drone']}, models {result['models']}")
+    print(f"cold start        {result['cold_process_s']:7.2f} s  (process spawn to ready)")
+    print(f"  in DroneWorker  {result['cold_run_s']:7.2f} s  (models {result['models_s']:.2f} s, "
+          f"connect {result['connect_s']:.2f} s)")
+    print(f"warm re-arm       {result['warm_median_s']:7.3f} s  median, {result['warm_max_s']:.3f} s max "
+          f"over {args.rearms} ({', '.join(result['warm_modes'])})")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@ Main entry point for the Autonomous Drone Navigation System.
 This script launches the GUI application for controlling the drone.
 """
 
+import argparse
 import sys
 import os
 
@@ -13,10 +14,35 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from PySide6.QtWidgets import QApplication
 from src.main_window_final import DroneGUI
+import cpu_budget
+import flight_log
+from drone_worker import DRONE_CLIENTS, DroneWorker
+from live_stream import LiveStream
 
 def main():
     """Main function to launch the drone navigation application."""
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Autonomous Drone Navigation")
+    parser.add_argument("--stream-port", type=int, help="serve the live views over HTTP on this port")
+    parser.add_argument("--stream-host", default="127.0.0.1",
+                        help="address to serve on; 0.0.0.0 lets other machines watch")
+    parser.add_argument("--persistent", action="store_true",
+                        help="stay connected with models loaded between missions instead of exiting")
+    parser.add_argument("--trace-dir", metavar="DIR",
+                        help="save a frame-to-command trace of each mission here (Chrome trace JSON)")
+    parser.add_argument("--cpu-budget", choices=sorted(cpu_budget.PRESETS),
+                        help="thread counts, core sets and priorities for the companion computer")
+    parser.add_argument("--drone-client", choices=sorted(DRONE_CLIENTS), default="djitellopy",
+                        help="djitellopy's Tello, or the asyncio client in src/tello_async.py")
+    parser.add_argument("--power-save", action="store_true",
+                        help="battery-powered companion computer: run the control tick and overlays slower")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    # Structured flight log, written by a background thread
+    flight_log.configure(os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs"))
+    if args.cpu_budget:
+        # Before any model loads, so torch picks up its thread count
+        cpu_budget.configure(args.cpu_budget)
     
     # Set application properties
     app.setApplicationName("Autonomous Drone Navigation")
@@ -24,11 +50,22 @@ def main():
     app.setOrganizationName("Drone Navigation Team")
     
     # Create and show the main window
-    window = DroneGUI()
+    stream = None
+    if args.stream_port is not None:
+        stream = LiveStream(args.stream_host, args.stream_port).start()
+        print(f"Live view at {stream.url()}")
+    worker = DroneWorker(drone_factory=DRONE_CLIENTS[args.drone_client])
+    window = DroneGUI(worker=worker, stream=stream, persistent=args.persistent)
+    window.worker.trace_dir = args.trace_dir
+    window.worker.rate_control.power_save = args.power_save
     window.show()
     
     # Start the application event loop
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    if stream:
+        stream.stop()
+    flight_log.shutdown()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
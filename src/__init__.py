@@ -2,16 +2,29 @@
 Autonomous Drone Navigation System
 
 A Python package for autonomous drone navigation using computer vision and machine learning.
+
+The public classes are loaded on first access (PEP 562), so ``import src`` and
+imports of light modules such as ``src.path_geometry`` do not pull in PySide6,
+djitellopy, ultralytics or torch.
 """
 
+import importlib
+import os
+import sys
+
 __version__ = "1.0.0"
 __author__ = "Autonomous Drone Navigation Team"
 __email__ = "contact@example.com"
 
-from .drone_worker import DroneWorker, DroneWorkerSignals
-from .main_window_final import DroneGUI
-from .processing_threads import SegmentationThread, DetectionThread
-from .camera_thread import CameraThread
+# Public name -> module that defines it
+_EXPORTS = {
+    "DroneWorker": "drone_worker",
+    "DroneWorkerSignals": "drone_worker",
+    "DroneGUI": "main_window_final",
+    "SegmentationThread": "processing_threads",
+    "DetectionThread": "processing_threads",
+    "CameraThread": "camera_thread",
+}
 
 __all__ = [
     "DroneWorker",
@@ -20,4 +33,21 @@ __all__ = [
     "SegmentationThread",
     "DetectionThread",
     "CameraThread"
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # The modules import each other by flat name (``import flight_log``)
+    package_dir = os.path.dirname(__file__)
+    if package_dir not in sys.path:
+        sys.path.insert(0, package_dir)
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
@@ -4,22 +4,43 @@ import cv2
 import time
 import numpy as np
 
+import cpu_budget
+from frame_trace import read_frame
+
+
+def prepare_frame(frame, size=(960, 720)):
+    """Resize a raw drone frame and convert it to RGB for display and inference."""
+    frame = cv2.resize(frame, size)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
 class CameraThread(QThread):
     frame_captured = Signal(np.ndarray)
 
-    def __init__(self, drone):
+    def __init__(self, drone, trace=None):
         super().__init__()
         self.drone = drone
+        # Optional frame_trace.FrameTrace; each new frame is traced on the camera lane
+        self.trace = trace
         self.running = True
 
     def run(self):
+        cpu_budget.enter("camera")
+        trace = self.trace
+        if trace is not None:
+            trace.set_lane("camera")
         frame_read = self.drone.get_frame_read()
+        last_id = None
         while self.running:
-            frame = frame_read.frame
+            frame, frame_id, capture_time = read_frame(frame_read)
             if frame is not None:
-                frame = cv2.resize(frame, (960, 720))
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                self.frame_captured.emit(frame_rgb)
+                if trace is None or (frame_id is not None and frame_id == last_id):
+                    self.frame_captured.emit(prepare_frame(frame))
+                else:
+                    last_id = trace.frame(frame_id, capture_time)
+                    started = trace.clock()
+                    self.frame_captured.emit(prepare_frame(frame))
+                    trace.span("prepare", started)
             time.sleep(1 / 30)
 
     def stop(self):
@@ -0,0 +1,167 @@
+# File: command_stats.py
+"""
+Round-trip timing for every call on the drone handle.
+
+Each djitellopy command is a blocking UDP exchange: ``move_*``, ``rotate_*``
+and ``go_xyz_speed*`` only return once the Tello reports the move done.
+``InstrumentedDrone`` wraps the handle ``DroneWorker`` uses. Every method call
+records its send and acknowledgement times, any error, and the retries the
+client reports. ``CommandStats`` keeps rolling per-command percentiles and
+the share of mission time spent waiting on the drone:
+
+    stats = CommandStats()
+    drone = InstrumentedDrone(Tello(), stats)
+    ...
+    print(stats.format_report())
+"""
+import threading
+import time
+from collections import deque
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+class CommandStats:
+    """Per-command call counts, errors, retries and rolling latency percentiles."""
+
+    def __init__(self, window=200, clock=time.monotonic, recent=500):
+        self.window = window
+        self.clock = clock
+        self.recent_size = recent
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the mission clock starts now."""
+        with self._lock:
+            self.commands = {}
+            self.recent = deque(maxlen=self.recent_size)
+            self.started_at = self.clock()
+            self.wait_s = 0.0
+            self.peak_s = None
+
+    def record(self, name, sent, acked, error=None, retries=0):
+        duration = max(0.0, acked - sent)
+        with self._lock:
+            entry = self.commands.get(name)
+            if entry is None:
+                entry = self.commands[name] = {"calls": 0, "errors": 0, "retries": 0, "total_s": 0.0,
+                                               "max_s": 0.0, "durations": deque(maxlen=self.window)}
+            entry["calls"] += 1
+            entry["errors"] += error is not None
+            entry["retries"] += retries
+            entry["total_s"] += duration
+            entry["max_s"] = max(entry["max_s"], duration)
+            entry["durations"].append(duration)
+            self.wait_s += duration
+            self.peak_s = duration if self.peak_s is None else max(self.peak_s, duration)
+            self.recent.append({"command": name, "sent": sent, "acked": acked, "retries": retries,
+                                "error": None if error is None else str(error)})
+
+    def take_peak(self):
+        """The longest round trip in seconds since the last call, or ``None`` if no calls."""
+        with self._lock:
+            peak, self.peak_s = self.peak_s, None
+        return peak
+
+    def percentiles(self, name):
+        """``{"p50", "p95", "p99"}`` in seconds over the last ``window`` calls of ``name``."""
+        with self._lock:
+            ordered = sorted(self.commands[name]["durations"])
+        return {f"p{q}": _percentile(ordered, q) for q in (50, 95, 99)}
+
+    def summary(self):
+        """Everything as plain numbers, busiest commands first; per-command times in ms."""
+        elapsed = max(0.0, self.clock() - self.started_at)
+        with self._lock:
+            entries = {name: (dict(entry), sorted(entry["durations"])) for name, entry in self.commands.items()}
+            wait_s = self.wait_s
+        commands = {}
+        for name, (entry, ordered) in sorted(entries.items(), key=lambda item: -item[1][0]["total_s"]):
+            commands[name] = {
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "retries": entry["retries"],
+                "total_s": round(entry["total_s"], 3),
+                "mean_ms": round(entry["total_s"] / entry["calls"] * 1000, 1),
+                "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+                "p99_ms": round(_percentile(ordered, 99) * 1000, 1),
+                "max_ms": round(entry["max_s"] * 1000, 1),
+            }
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "wait_s": round(wait_s, 3),
+            "wait_fraction": round(wait_s / elapsed, 3) if elapsed > 0 else None,
+            "commands": commands,
+        }
+
+    def format_report(self, summary=None):
+        """The summary as a text table."""
+        return format_summary(summary or self.summary())
+
+
+def format_summary(summary):
+    """A ``CommandStats.summary()`` as a text table."""
+    fraction = summary["wait_fraction"]
+    lines = [f"Drone commands: {summary['wait_s']:.1f}s waiting of {summary['elapsed_s']:.1f}s"
+             + (f" ({fraction:.0%})" if fraction is not None else ""),
+             f"{'command':<28} {'calls':>5} {'err':>4} {'retry':>5} {'total s':>8} "
+             f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+    for name, c in summary["commands"].items():
+        lines.append(f"{name:<28} {c['calls']:>5} {c['errors']:>4} {c['retries']:>5} {c['total_s']:>8.2f} "
+                     f"{c['p50_ms']:>8.1f} {c['p95_ms']:>8.1f} {c['p99_ms']:>8.1f} {c['max_ms']:>8.1f}")
+    return "\n".join(lines)
+
+
+class InstrumentedDrone:
+    """Proxy for a drone handle that times every public method call into ``stats``.
+
+    Attributes pass straight through. Retries are counted when the client
+    exposes a running ``command_retries`` counter, as ``TelloClient`` does.
+    Exceptions are recorded and re-raised. Calls also go to ``trace``, a
+    ``frame_trace.FrameTrace``, when given. ``gate(name)`` runs before each
+    call and refuses it by raising, as ``SafetyLane.check`` does.
+    """
+
+    def __init__(self, drone, stats, trace=None, gate=None):
+        self.drone = drone
+        self.stats = stats
+        self.trace = trace
+        self.gate = gate
+        self._wrappers = {}
+
+    def __getattr__(self, name):
+        value = getattr(self.drone, name)
+        if name.startswith("_") or not callable(value):
+            return value
+        wrapper = self._wrappers.get(name)
+        if wrapper is None:
+            wrapper = self._wrappers[name] = self._wrap(name)
+        return wrapper
+
+    def _wrap(self, name):
+        def call(*args, **kwargs):
+            drone, stats, trace = self.drone, self.stats, self.trace
+            if self.gate is not None:
+                self.gate(name)
+            retries_before = getattr(drone, "command_retries", 0)
+            sent = stats.clock()
+            try:
+                result = getattr(drone, name)(*args, **kwargs)
+            except Exception as e:
+                acked = stats.clock()
+                stats.record(name, sent, acked, error=e,
+                             retries=getattr(drone, "command_retries", 0) - retries_before)
+                if trace is not None:
+                    trace.command(name, sent, acked, error=e)
+                raise
+            acked = stats.clock()
+            stats.record(name, sent, acked, retries=getattr(drone, "command_retries", 0) - retries_before)
+            if trace is not None:
+                trace.command(name, sent, acked)
+            return result
+        call.__name__ = name
+        return call
@@ -0,0 +1,146 @@
+# File: cpu_budget.py
+"""
+CPU budget for the threads that share the companion computer.
+
+A flight runs the ``DroneWorker`` control thread, ``CameraThread``, the
+segmentation and detection display threads and, with ``TelloClient``, the
+PyAV decoder. On top of that come torch's intra-op pool (one per thread that
+runs a model) and OpenCV's pool. On a 4-core board their defaults add up to
+several times the core count, and the control tick is what suffers.
+
+``CpuBudget`` caps the torch, OpenCV and PyAV thread counts and gives each
+thread role an optional core set and a niceness offset. Each thread calls
+``enter(role)`` when it starts; a thread's pools inherit its affinity and
+niceness when they are created. On Linux nice values apply per thread.
+Unprivileged processes can only raise them, so the budget keeps the control
+thread at the process's own niceness and lowers everything else.
+``QThread.setPriority`` does nothing for normal Linux threads, which is why
+the budget sets nice values instead.
+
+    cpu_budget.configure(cpu_budget.PRESETS["quad"])   # once, at startup
+    cpu_budget.enter("inference")                      # first thing in a thread's run()
+
+Without ``configure`` every call is a no-op. ``benchmarks/bench_cpu_budget.py``
+sweeps configurations and reports the control tick's tail latency.
+"""
+import os
+import sys
+import threading
+
+import flight_log
+
+log = flight_log.get_logger("cpu")
+
+ROLES = ("control", "camera", "decode", "inference")
+
+# Niceness added to the process's own for each role; higher runs less
+DEFAULT_NICE = {"control": 0, "camera": 2, "decode": 2, "inference": 10}
+
+
+class CpuBudget:
+    """Thread counts for the libraries plus per-role core sets and niceness."""
+
+    def __init__(self, torch_threads=None, cv2_threads=None, av_threads=None, cores=None, nice=None):
+        self.torch_threads = torch_threads
+        self.cv2_threads = cv2_threads
+        self.av_threads = av_threads
+        self.cores = dict(cores or {})
+        self.nice = dict(DEFAULT_NICE if nice is None else nice)
+        self.base_nice = None
+        self.applied = []
+
+    def apply_libraries(self):
+        """Set torch and OpenCV thread counts; call before any model runs."""
+        self.base_nice = _get_nice()
+        if self.cv2_threads is not None:
+            import cv2
+            cv2.setNumThreads(self.cv2_threads)
+        if self.torch_threads is not None:
+            torch = sys.modules.get("torch")
+            if torch is None:
+                # torch is imported lazily with the models and reads these then
+                for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+                    os.environ[name] = str(self.torch_threads)
+            else:
+                torch.set_num_threads(self.torch_threads)
+        log.info("cpu.configure", f"CPU budget: torch {self.torch_threads}, cv2 {self.cv2_threads}, "
+                 f"av {self.av_threads} threads", torch=self.torch_threads, cv2=self.cv2_threads,
+                 av=self.av_threads, cores=str(self.cores), nice=str(self.nice))
+        return self
+
+    def usable_cores(self, role):
+        """The role's core set restricted to cores this process may use; ``None`` if unpinned."""
+        wanted = self.cores.get(role)
+        if not wanted or not hasattr(os, "sched_getaffinity"):
+            return None
+        usable = set(wanted) & os.sched_getaffinity(0)
+        return usable or None
+
+    def enter(self, role):
+        """Apply the role's affinity and niceness to the calling thread."""
+        if role not in ROLES:
+            raise ValueError(f"unknown role {role!r}; expected one of {ROLES}")
+        tid = threading.get_native_id()
+        entry = {"role": role, "thread": threading.current_thread().name, "cores": None, "nice": None}
+
+        cores = self.usable_cores(role)
+        if cores is not None:
+            try:
+                os.sched_setaffinity(tid, cores)
+                entry["cores"] = sorted(cores)
+            except OSError as e:
+                log.warning("cpu.affinity_failed", f"Could not pin {role} to {sorted(cores)}: {e}",
+                            role=role, error=e)
+
+        offset = self.nice.get(role, 0)
+        if offset and hasattr(os, "setpriority"):
+            base = self.base_nice if self.base_nice is not None else _get_nice()
+            try:
+                os.setpriority(os.PRIO_PROCESS, tid, base + offset)
+                entry["nice"] = base + offset
+            except OSError as e:
+                log.warning("cpu.nice_failed", f"Could not renice {role}: {e}", role=role, error=e)
+
+        self.applied.append(entry)
+        log.info("cpu.enter", f"{entry['thread']} as {role}", **entry)
+        return entry
+
+
+def _get_nice():
+    if not hasattr(os, "getpriority"):
+        return 0
+    return os.getpriority(os.PRIO_PROCESS, 0)
+
+
+PRESETS = {
+    # Thread counts only
+    "threads": CpuBudget(torch_threads=2, cv2_threads=1, av_threads=1, nice={}),
+    # Two cores: one torch thread per model, display inference deprioritised
+    "dual": CpuBudget(torch_threads=1, cv2_threads=1, av_threads=1),
+    # Four cores: camera and decode on core 1, display inference on 2-3,
+    # control free to run anywhere at full priority
+    "quad": CpuBudget(torch_threads=2, cv2_threads=1, av_threads=1,
+                      cores={"camera": {1}, "decode": {1}, "inference": {2, 3}}),
+}
+
+_active = None
+
+
+def configure(budget):
+    """Make ``budget`` (a ``CpuBudget`` or a preset name) the active one."""
+    global _active
+    if isinstance(budget, str):
+        budget = PRESETS[budget]
+    _active = budget.apply_libraries() if budget is not None else None
+    return _active
+
+
+def active():
+    return _active
+
+
+def enter(role):
+    """Apply the active budget to the calling thread; no-op when none is configured."""
+    if _active is None:
+        return None
+    return _active.enter(role)
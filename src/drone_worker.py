@@ -1,11 +1,50 @@
 # File: drone_worker.py
 from PySide6.QtCore import QObject, Signal, Slot, QThread, QTimer
-from djitellopy import Tello
-from ultralytics import YOLO
 import os
 import numpy as np
 import time
 import cv2
+from collections import deque
+
+import cpu_budget
+import flight_log
+from command_stats import CommandStats, InstrumentedDrone
+from frame_trace import FrameTrace, read_frame
+from latency import TELLO_SPEED_SCALE, LatencyCompensator, speed_scale_for
+from mission_state import (FINISHED, IDLE, PAD_ALIGN, PAD_SEARCH, PATH_FOLLOW,
+                           PATH_RECOVERY, MissionStateMachine)
+from pad_approach import PadApproach, select_pad_box
+from pad_gate import PadGate
+from rate_control import CpuMeter, RateController
+from packed_mask import pack_masks
+from path_geometry import box_center
+from safety_lane import SafetyLane, SafetyTripped
+
+log = flight_log.get_logger("worker")
+
+
+# djitellopy and ultralytics (and with it torch) are imported on first use, so
+# headless tools, simulations and tests that inject their own drone and models
+# never pay for them.
+
+def default_drone():
+    from djitellopy import Tello
+    return Tello()
+
+
+def async_drone():
+    from tello_async import TelloClient
+    return TelloClient()
+
+
+# Drone clients by name, for main.py --drone-client
+DRONE_CLIENTS = {"djitellopy": default_drone, "async": async_drone}
+
+
+def load_model(path):
+    from ultralytics import YOLO
+    return YOLO(path)
+
 
 class DroneWorkerSignals(QObject):
     frame_ready = Signal(np.ndarray, str)
@@ -14,212 +53,661 @@ class DroneWorkerSignals(QObject):
     mission_finished = Signal()
     connection_status = Signal(bool)
     mission_started = Signal()
+    state_changed = Signal(dict)
+    command_stats = Signal(dict)
+    session_ready = Signal(dict)
+    safety_tripped = Signal(dict)
 
 class DroneWorker(QObject):
-    def __init__(self, path_model_path="epoch50.pt", pad_model_path="best_pad_new.pt", parent=None):
+    def __init__(self, path_model_path="epoch50.pt", pad_model_path="best_pad_new.pt", parent=None,
+                 drone_factory=None):
         super().__init__(parent)
         self.signals = DroneWorkerSignals()
         self.path_model_path = path_model_path
         self.pad_model_path = pad_model_path
         self.target_pad_id = 5
+        # Callable returning a drone handle with the djitellopy API, e.g.
+        # tello_async.TelloClient; defaults to djitellopy's Tello.
+        self.drone_factory = drone_factory or default_drone
+        # Multipliers on every state's tick period and on the waits between
+        # drone commands, and the sleep those waits use; simulations shrink
+        # them to run faster than real time.
+        self.tick_scale = 1.0
+        self.sleep_scale = 1.0
+        # Emergency stops and landings skip this thread's queue; its sleeps
+        # wake and its motion commands are refused once the lane fires
+        self.safety = SafetyLane()
+        self.safety.listeners.append(self.signals.safety_tripped.emit)
+        self.signals.safety_tripped.connect(self._on_safety_tripped)
+        self._sleep = self.safety.sleep
+        self._clock = time.monotonic
+
+        # Steering offsets are predicted forward from the frame's capture time;
+        # the speed unit is set per handle on connect, the Tello's until then
+        self.latency = LatencyCompensator(speed_scale=TELLO_SPEED_SCALE, clock=self._clock)
+        self._capture_time = None
+
+        # Size-aware pad approach; None keeps the original 5°/20 cm stepping
+        self.pad_approach = PadApproach()
+        self._approach = None
+        # Per-mission reports are bounded: a persistent session flies many missions
+        self.approach_reports = deque(maxlen=100)
+        # Low-resolution pad check before the full detector while on the path
+        self.pad_gate = PadGate()
+        # Round-trip times of every drone call; summarised for the GUI every
+        # ``command_stats_interval`` seconds and reported when a mission ends
+        self.command_stats = CommandStats(clock=self._clock)
+        self.command_stats_interval = 1.0
+        self._command_stats_at = None
+        self.command_reports = deque(maxlen=100)
+        # Every frame from capture through inference and the tick to the
+        # commands it caused; the age summary is kept per mission, and the
+        # Chrome trace written to ``trace_dir`` when set
+        self.frame_trace = FrameTrace(clock=self._clock)
+        self.trace_dir = None
+        self.trace_reports = deque(maxlen=100)
+        self._frame_id = None
 
         self.path_model = None
         self.pad_model = None
         self.drone = None
+        # Time to ready per connect: "cold" from run(), "warm" or "reconnect" from rearm()
+        self.ready_times = deque(maxlen=100)
+
+        self.mission = MissionStateMachine()
+        self.mission.listeners.append(self._on_transition)
+        # Model inference calls per state name, to check the scheduler
+        self.inference_counts = {}
+        # Inference time since the last telemetry sample, for the GUI's plots
+        self._inference_s = 0.0
+        # Tick periods and overlay rate from measured inference time, CPU load,
+        # battery and flight phase; the rates chosen are reported per mission
+        self.rate_control = RateController(cpu=CpuMeter(), clock=self._clock)
+        self.rate_reports = deque(maxlen=100)
 
-        self._start_segmentation = False
-        self._pad_mode = False
         self._is_running = True
         self._no_path_counter = 0
         self._pad_height_adjusted = False
+        self._search_attempts = 0
+        # Consecutive ticks that raised; at the limit the mission lands
+        self._tick_failures = 0
+        self.max_tick_failures = 3
+        self.max_search_attempts = 20 # Increased attempts
+        self.search_rotation_angle = 30 # Degrees to rotate each attempt
+
+        self._state_handlers = {
+            PATH_FOLLOW: self._tick_path,
+            PATH_RECOVERY: self._tick_path,
+            PAD_ALIGN: self._tick_pad_align,
+            PAD_SEARCH: self._tick_pad_search,
+        }
 
         self.control_loop_timer = QTimer(self)
-        self.control_loop_timer.setSingleShot(False)
+        self.control_loop_timer.setSingleShot(True)
         self.control_loop_timer.timeout.connect(self._mission_logic)
 
+    # Mode flags kept for the GUI and callers; both derive from the mission state.
+
+    @property
+    def _start_segmentation(self):
+        return self.mission.state in (PATH_FOLLOW, PATH_RECOVERY)
+
+    @property
+    def _pad_mode(self):
+        return self.mission.state in (PAD_ALIGN, PAD_SEARCH)
+
     def run(self):
+        cpu_budget.enter("control")
+        self.frame_trace.set_lane("control")
+        self.safety.start()
         self.signals.status_message.emit("Starting DroneWorker...")
+        started = time.perf_counter()
         try:
-            self.path_model = YOLO(self.path_model_path)
-            self.pad_model = YOLO(self.pad_model_path)
-            self.drone = Tello()
-            self.drone.connect()
-            self.drone.set_speed(10)
-            self.drone.streamon()
+            models_s = self._load_models()
+            connect_started = time.perf_counter()
+            self._connect()
+            connect_s = time.perf_counter() - connect_started
             self.signals.status_message.emit(f"Connected. Battery: {self.drone.get_battery()}%")
             self.signals.connection_status.emit(True)
         except Exception as e:
+            log.error("connect.failed", f"Error: {e}", error=e)
+            flight_log.dump_recent("connect failed")
             self.signals.status_message.emit(f"Error: {e}")
             self.signals.connection_status.emit(False)
             self.signals.mission_finished.emit()
             return
 
         self.control_loop_timer.moveToThread(QThread.currentThread())
+        self._ready("cold", started, models_s=round(models_s, 3), connect_s=round(connect_s, 3))
         self.signals.mission_started.emit()
 
+    def _load_models(self):
+        """Load models not injected by the caller and run each once; returns seconds taken.
+
+        The first prediction of a freshly loaded YOLO model is many times
+        slower than the rest, so it is paid here instead of on the first tick.
+        """
+        started = time.perf_counter()
+        blank = np.zeros((720, 960, 3), dtype=np.uint8)
+        if self.path_model is None:
+            self.path_model = load_model(self.path_model_path)
+            self.path_model.predict(source=blank, task='segment', imgsz=640, conf=0.4, verbose=False)
+        if self.pad_model is None:
+            self.pad_model = load_model(self.pad_model_path)
+            self.pad_model.predict(source=blank, task='detect', imgsz=640, conf=0.4, verbose=False)
+            if self.pad_gate is not None:
+                self.pad_gate.detect(self.pad_model, blank)
+        return time.perf_counter() - started
+
+    def _connect(self):
+        """Open a new drone handle and wake it."""
+        drone = self.drone_factory()
+        self.latency.speed_scale = speed_scale_for(drone)
+        self.safety.attach(drone)
+        self.drone = InstrumentedDrone(drone, self.command_stats, trace=self.frame_trace, gate=self.safety.check)
+        self._wake_drone()
+
+    def _close_drone(self):
+        """End the current handle, freeing its sockets and threads; errors are ignored."""
+        if self.drone is None:
+            return
+        handle, self.drone = self.drone.drone, None
+        try:
+            handle.end()
+        except Exception as e:
+            log.warning("session.close_failed", f"Closing the old drone handle failed: {e}", error=e)
+
+    def _wake_drone(self):
+        # SDK mode and the video stream; both are lost when the Tello reboots
+        self.drone.connect()
+        self.drone.set_speed(10)
+        self.drone.streamon()
+
+    def _ready(self, mode, started, **parts):
+        record = {"mode": mode, "seconds": round(time.perf_counter() - started, 3), **parts}
+        self.ready_times.append(record)
+        log.info("session.ready", f"✅ Ready in {record['seconds']:.2f}s ({mode})", **record)
+        self.signals.session_ready.emit(record)
+        return record
+
+    def _reset_mission(self):
+        """Clear per-mission state; models, connection and stream are kept."""
+        self._no_path_counter = 0
+        self._pad_height_adjusted = False
+        self._search_attempts = 0
+        self._tick_failures = 0
+        self._approach = None
+        self._capture_time = None
+        self._frame_id = None
+        self.inference_counts = {}
+        if self.pad_gate is not None:
+            self.pad_gate.reset()
+        self.latency.telemetry.samples.clear()
+        self.command_stats.reset()
+        self._command_stats_at = None
+        self.frame_trace.reset()
+        self.safety.reset()
+        self.rate_control.reset()
+
+    @Slot()
+    def rearm(self):
+        """Get ready for another mission without reloading models or reconnecting.
+
+        Only mission state is reset. The existing handle is put back into SDK
+        mode with its stream on, which is all a battery swap needs; if that
+        fails, a new handle is connected and ``mission_started`` is emitted
+        again so the GUI restarts its threads on it.
+        """
+        if self.mission.state not in (IDLE, FINISHED):
+            log.warning("session.rearm_refused", f"Cannot re-arm during {self.mission.state.name}")
+            return None
+        started = time.perf_counter()
+        self.control_loop_timer.stop()
+        self._reset_mission()
+        try:
+            if self.drone is None:
+                raise RuntimeError("not connected")
+            self._wake_drone()
+            mode = "warm"
+        except Exception as e:
+            log.warning("session.reconnect", f"Warm re-arm failed ({e}); reconnecting", error=e)
+            self._close_drone()
+            try:
+                self._load_models()
+                self._connect()
+            except Exception as e:
+                log.error("connect.failed", f"Error: {e}", error=e)
+                self.signals.status_message.emit(f"Error: {e}")
+                self.signals.connection_status.emit(False)
+                return None
+            mode = "reconnect"
+        self.signals.connection_status.emit(True)
+        record = self._ready(mode, started)
+        if mode == "reconnect":
+            self.signals.mission_started.emit()
+        return record
+
     @Slot()
     def start_drone_mission(self):
+        if self.mission.state not in (IDLE, FINISHED):
+            log.warning("mission.start_refused", f"Mission already running ({self.mission.state.name})",
+                        state=self.mission.state.name)
+            self.signals.status_message.emit(f"Mission already running ({self.mission.state.name})")
+            return
         if self.drone:
             try:
+                self._reset_mission()
                 self.drone.takeoff()
-                time.sleep(3)
+                self._pause(3)
                 self.drone.move_down(30)
-                time.sleep(3)
-                self._start_segmentation = True
-                self._pad_mode = False
+                self._pause(3)
                 self._is_running = True
-                self._no_path_counter = 0
-                self._pad_height_adjusted = False
+                self.mission.transition(PATH_FOLLOW, "takeoff complete")
                 self.signals.status_message.emit("Takeoff successful. Starting segmentation mode.")
-                self.control_loop_timer.start(700)
+                self.control_loop_timer.start(self.current_tick_ms())
+            except SafetyTripped:
+                self._abort_mission()
             except Exception as e:
+                if self.safety.tripped.is_set():
+                    # The lane pre-empted the command we were blocked on
+                    self._abort_mission()
+                    return
                 self.signals.status_message.emit(f"Takeoff failed: {e}")
                 self.signals.mission_finished.emit()
 
+    def _pause(self, seconds):
+        """Wait between drone commands, scaled by ``sleep_scale``; a safety trip cuts it short."""
+        self._sleep(seconds * self.sleep_scale)
+
+    def use_clock(self, clock):
+        """Time states and frame latency with ``clock`` (e.g. a simulator's)."""
+        self._clock = clock
+        self.latency.clock = clock
+        self.command_stats.clock = clock
+        self.frame_trace.clock = clock
+        self.rate_control.clock = clock
+        self.mission.clock = clock
+        self.mission.entered_at = clock()
+
+    def current_tick_ms(self):
+        """Tick period the rate controller chose for the active state, scaled by ``tick_scale``."""
+        return int(self.rate_control.tick_ms(self.mission.state) * self.tick_scale)
+
+    def _on_transition(self, record):
+        log.info("state.transition",
+                 f"🔀 {record['from']} → {record['to']} after {record['duration_s']:.2f}s ({record['reason']})",
+                 **{"from": record["from"], "to": record["to"], "reason": record["reason"],
+                    "duration_s": round(record["duration_s"], 3)})
+        self.signals.state_changed.emit(record)
+
     def _mission_logic(self):
+        """Timer slot: run one tick, then schedule the next at the active state's rate."""
+        started = time.monotonic()
+        try:
+            self.tick()
+        finally:
+            # Whatever the tick did, the loop keeps going until the mission ends
+            if self._is_running and self.mission.state in self._state_handlers:
+                elapsed_ms = (time.monotonic() - started) * 1000
+                self.control_loop_timer.start(max(0, int(self.current_tick_ms() - elapsed_ms)))
+
+    def tick(self):
+        """Run the active state's handler once."""
         if not self._is_running:
             return
+        if self.safety.tripped.is_set():
+            self._abort_mission()
+            return
+        state = self.mission.state
+        handler = self._state_handlers.get(state)
+        if handler:
+            # Commands are filed under the frame this tick grabs, if any
+            self.frame_trace.drop()
+            started = self._clock()
+            try:
+                handler()
+                self._tick_failures = 0
+            except SafetyTripped:
+                self._abort_mission()
+            except Exception as e:
+                self._tick_failed(state, e)
+            self.frame_trace.span(f"tick {state.name}", started)
+            self.rate_control.update(state)
+
+    def _tick_failed(self, state, e):
+        """A tick raised (e.g. a command timed out); land after ``max_tick_failures`` in a row."""
+        if self.safety.tripped.is_set():
+            # The lane pre-empted the command we were blocked on
+            self._abort_mission()
+            return
+        self._tick_failures += 1
+        message = f"⚠️ Tick failed in {state.name} ({self._tick_failures}/{self.max_tick_failures}): {e}"
+        log.error("tick.failed", message, state=state.name, failures=self._tick_failures, error=e)
+        self.signals.status_message.emit(message)
+        if self._tick_failures >= self.max_tick_failures:
+            flight_log.dump_recent("repeated tick failures")
+            self.signals.status_message.emit("🛬 Too many failed ticks → landing")
+            self.land_drone()
 
-        frame = self.drone.get_frame_read().frame
+    def _infer(self, model_name, rgb_frame):
+        """Run ``model_name`` on the frame if the active state needs it, else ``None``."""
+        state = self.mission.state
+        if not state.needs(model_name):
+            return None
+        self.inference_counts[state.name] = self.inference_counts.get(state.name, 0) + 1
+        started = self._clock()
+        if model_name == "pad":
+            results = self.pad_model.predict(source=rgb_frame, task='detect', imgsz=640, conf=0.4, verbose=False)
+            output = results[0].boxes.data.cpu().numpy() if results[0].boxes else []
+        else:
+            results = self.path_model.predict(source=rgb_frame, task='segment', imgsz=640, conf=0.4, verbose=False)
+            output = pack_masks(results[0].masks) if results[0].masks else []
+        ended = self._clock()
+        self._record_inference(model_name, started, ended, detections=len(output))
+        return output
+
+    def _pad_gate_check(self, rgb_frame):
+        """The pad gate's decision for the frame, its low-resolution pass counted like any inference."""
+        if self.pad_gate is None:
+            return True
+        state = self.mission.state
+        self.inference_counts[state.name] = self.inference_counts.get(state.name, 0) + 1
+        started = self._clock()
+        passed = self.pad_gate.check(self.pad_model, rgb_frame)
+        self._record_inference("pad_gate", started, self._clock(), passed=passed)
+        return passed
+
+    def _record_inference(self, name, started, ended, **args):
+        self._inference_s += ended - started
+        self.rate_control.record_inference(name, ended - started)
+        self.frame_trace.span(f"infer.{name}", started, ended, **args)
+
+    def _grab_frame(self):
+        """Read the latest frame, publish telemetry, and return ``(frame, rgb_frame)``."""
+        frame, frame_id, capture_time = read_frame(self.drone.get_frame_read())
         if frame is None:
-            return
+            return None
+        # djitellopy frames carry no ID or capture time; the trace numbers
+        # them, and they count as captured when we read them
+        self._capture_time = self._clock() if capture_time is None else capture_time
+        self._frame_id = self.frame_trace.frame(frame_id, self._capture_time)
 
         frame = cv2.resize(frame, (960, 720))
         rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
+        height = self.drone.get_height()
+        yaw = self._record_motion(height)
         telemetry = {
-            "altitude": self.drone.get_height(),
+            "altitude": height,
             "battery": self.drone.get_battery(),
+            "state": self.mission.state.name,
+            "pipeline_delay_ms": round(self.latency.pipeline.estimate * 1000),
         }
+        if yaw is not None:
+            telemetry["yaw"] = yaw
+        self.rate_control.note_battery(telemetry["battery"])
+        telemetry["tick_ms"] = self.current_tick_ms()
+        # Inference since the last sample, and the slowest command round trip
+        if self._inference_s:
+            telemetry["inference_ms"] = round(self._inference_s * 1000, 1)
+            self._inference_s = 0.0
+        command_s = self.command_stats.take_peak()
+        if command_s is not None:
+            telemetry["command_ms"] = round(command_s * 1000, 1)
         self.signals.telemetry_updated.emit(telemetry)
+        self._publish_command_stats()
+        return frame, rgb_frame
+
+    def _publish_command_stats(self, force=False):
+        now = self._clock()
+        if not force and self._command_stats_at is not None and \
+                now - self._command_stats_at < self.command_stats_interval:
+            return None
+        self._command_stats_at = now
+        summary = self.command_stats.summary()
+        self.signals.command_stats.emit(summary)
+        return summary
+
+    def _record_motion(self, height=None):
+        """Feed the latency compensator fresh telemetry; returns the yaw, or ``None`` if unread."""
+        try:
+            yaw = self.drone.get_yaw()
+            self.latency.record_telemetry(yaw, self.drone.get_speed_x(), self.drone.get_speed_y(), height)
+        except Exception as e:
+            log.warning("telemetry.read_failed", f"Telemetry read failed: {e}", error=e)
+            return None
+        return yaw
+
+    def _predicted_offset(self, offset, width):
+        """Target offset expected when the next command lands, from fresh telemetry."""
+        self._record_motion()
+        return self.latency.predict_offset(offset, width, self._capture_time)
+
+    def _enter_pad_align(self, reason):
+        if not self.mission.can_transition(PAD_ALIGN):
+            log.warning("state.ignored", f"Cannot align on the pad from {self.mission.state.name}",
+                        state=self.mission.state.name, reason=reason)
+            return
+        self._pad_height_adjusted = False
+        self._approach = {
+            "mode": "servo" if self.pad_approach else "stepwise",
+            "started_at": self._clock(),
+            "commands": 0,
+            "wait_started": self.command_stats.wait_s,
+            "observations": 0,
+            "ranges_cm": [],
+        }
+        self.mission.transition(PAD_ALIGN, reason)
+
+    def _pad_command(self, command, *args):
+        """Send a pad-phase command, counting it toward the approach report."""
+        if self._approach is not None:
+            self._approach["commands"] += 1
+        return command(*args)
+
+    def _close_approach(self, outcome):
+        """Finish the open approach report, print it and keep it."""
+        report, self._approach = self._approach, None
+        if report is None:
+            return None
+        report["duration_s"] = round(self._clock() - report.pop("started_at"), 2)
+        report["command_wait_s"] = round(self.command_stats.wait_s - report.pop("wait_started"), 2)
+        report["outcome"] = outcome
+        self.approach_reports.append(report)
+        message = (f"📏 Pad approach ({report['mode']}): {report['commands']} commands, "
+                   f"{report['duration_s']}s, {report['observations']} observations → {outcome}")
+        log.info("pad.approach_report", message, mode=report["mode"], commands=report["commands"],
+                 duration_s=report["duration_s"], observations=report["observations"], outcome=outcome)
+        self.signals.status_message.emit(message)
+        return report
+
+    def _tick_path(self):
+        """Path following and path recovery: steer by the mask centroid."""
+        grabbed = self._grab_frame()
+        if grabbed is None:
+            return
+        frame, rgb_frame = grabbed
+
+        # First check for pad detection, behind the cheap gate
+        boxes = []
+        if self._pad_gate_check(rgb_frame):
+            boxes = self._infer("pad", rgb_frame)
+        if len(boxes) > 0:
+            self.signals.status_message.emit("🎯 Pad detected → switching to pad mode")
+            self._enter_pad_align("pad detected")
+            return
 
-        # First check for pad detection
-        if not self._pad_mode:
-            results = self.pad_model.predict(source=rgb_frame, task='detect', imgsz=640, conf=0.4, verbose=False)
-            boxes = results[0].boxes.data.cpu().numpy() if results[0].boxes else []
-            
-            if len(boxes) > 0:
-                self.signals.status_message.emit("🎯 Pad detected → switching to pad mode")
-                self._start_segmentation = False
-                self._pad_mode = True
-                self._pad_height_adjusted = False
+        masks = self._infer("path", rgb_frame)
+        if len(masks) > 0:
+            self._no_path_counter = 0
+            if self.mission.state is PATH_RECOVERY:
+                self.mission.transition(PATH_FOLLOW, "path found")
+            mask = masks[0]
+            centroid = mask.centroid()
+            if centroid is not None:
+                cX, _ = centroid
+                center_x = mask.shape[1] // 2
+                offset = self._predicted_offset(cX - center_x, mask.shape[1])
+                # Straight on down a centred path lets the tick relax
+                self.rate_control.note_steering(abs(offset) <= 50)
+                if offset < -50:
+                    log.info("path.steer", "⬅️ Path on LEFT → moving left", action="left", offset_px=round(offset), frame_id=self._frame_id)
+                    self.signals.status_message.emit("⬅️ Path on LEFT → moving left")
+                    self.drone.move_left(20)
+                elif offset > 50:
+                    log.info("path.steer", "➡️ Path on RIGHT → moving right", action="right", offset_px=round(offset), frame_id=self._frame_id)
+                    self.signals.status_message.emit("➡️ Path on RIGHT → moving right")
+                    self.drone.move_right(20)
+                else:
+                    log.info("path.steer", "⬆️ Path CENTERED → moving forward", action="forward", offset_px=round(offset), frame_id=self._frame_id)
+                    self.signals.status_message.emit("⬆️ Path CENTERED → moving forward")
+                    self.drone.move_forward(40)
             else:
-                # If no pad detected, try segmentation
-                if not self._start_segmentation:
-                    self._start_segmentation = True
-                    self._no_path_counter = 0
-
-        # Pad mode handling
-        if self._pad_mode:
-            # === Pad Detection and Alignment ===
-            if not self._pad_height_adjusted:
-                try:
-                    # First move up to ensure we have room to adjust
-                    self.drone.move_up(40)
-                    time.sleep(1)
-                    
-                    current_height = self.drone.get_height()
-                    target_height = 25
-                    adjustment = current_height - target_height
-
-                    if adjustment > 0:
-                        print(f"⏬ Lowering drone by ~{adjustment} cm to reach ~25 cm...")
-                        self.drone.move_down(adjustment)
-                        time.sleep(2)
-                    else:
-                        print("✅ Already near or below target height.")
-                    self._pad_height_adjusted = True
-                except Exception as e:
-                    print(f"Error adjusting height for pad: {e}")
-                    self.signals.status_message.emit(f"Error adjusting height: {e}")
+                self.rate_control.note_steering(False)
+                self.signals.status_message.emit("🚫 No centroid found")
+        else:
+            self.rate_control.note_steering(False)
+            self._no_path_counter += 1
+            log.info("path.lost", "🔄 No path detected", count=self._no_path_counter)
+            self.signals.status_message.emit("🔄 No path detected")
+            if self.mission.state is PATH_FOLLOW:
+                self.mission.transition(PATH_RECOVERY, "no path detected")
+            if self._no_path_counter == 1:
+                self.drone.rotate_clockwise(90)
+            elif self._no_path_counter == 2:
+                self.drone.rotate_counter_clockwise(180)
+            elif self._no_path_counter > 2:
+                self.signals.status_message.emit("🛑 Path not found after recovery attempts. Switching to pad detection.")
+                # After segmentation fails, fall back to the built-in pad search
+                self.trigger_pad_detection_recovery()
+
+    def _tick_pad_approach(self):
+        """Pad in view: estimate its bearing and range and fly toward it in one move."""
+        grabbed = self._grab_frame()
+        if grabbed is None:
+            return
+        frame, rgb_frame = grabbed
+
+        boxes = self._infer("pad", rgb_frame)
+        self.signals.frame_ready.emit(frame, "detection")
+        self._approach["observations"] += 1
+        box = select_pad_box(boxes)
+
+        if box is None:
+            ranges = self._approach["ranges_cm"]
+            if ranges and ranges[-1] <= self.pad_approach.final_range_cm:
+                # Close pads slip under the forward camera; hand over right here
+                log.info("pad.handover", "Pad below the camera. Handing over to built-in pad landing.", reason="pad below camera")
+                self.attempt_built_in_pad_landing(self.target_pad_id)
+            else:
+                log.warning("pad.lost", "❌ Pad lost. Triggering recovery maneuver.")
+                self.signals.status_message.emit("Pad lost. Triggering recovery.")
+                self.trigger_pad_detection_recovery()
+            return
 
-            results = self.pad_model.predict(source=rgb_frame, task='detect', imgsz=640, conf=0.4, verbose=False)
-            boxes = results[0].boxes.data.cpu().numpy() if results[0].boxes else []
-
-            # Emit the frame with detection overlay
-            self.signals.frame_ready.emit(frame, "detection")
-
-            if len(boxes) > 0:
-                x1, y1, x2, y2 = boxes[0][:4]
-                pad_center_x = int((x1 + x2) / 2)
-                frame_center_x = frame.shape[1] // 2
-                offset = pad_center_x - frame_center_x
-
-                if abs(offset) > 80:
-                    if offset < 0:
-                        print("↺ Slight ROTATE LEFT (1°) to align with pad...")
-                        try:
-                            self.drone.rotate_counter_clockwise(5)
-                        except Exception as e:
-                            print(f"Error during rotation: {e}")
-                            self.signals.status_message.emit(f"Error during rotation: {e}")
-                    else:
-                        print("↻ Slight ROTATE RIGHT (1°) to align with pad...")
-                        try:
-                            self.drone.rotate_clockwise(5)
-                        except Exception as e:
-                            print(f"Error during rotation: {e}")
-                            self.signals.status_message.emit(f"Error during rotation: {e}")
+        frame_width = frame.shape[1]
+        center_x, _ = box_center(box)
+        center_x = frame_width / 2 + self._predicted_offset(center_x - frame_width // 2, frame_width)
+        height = self.drone.get_height()
+        estimate = self.pad_approach.estimate(box, frame_width, height, center_x)
+        self._approach["ranges_cm"].append(round(estimate["range_cm"]))
+        step = self.pad_approach.plan(estimate, height)
+
+        try:
+            if step is not None:
+                (x, y, z), final = step
+                log.info("pad.approach",
+                         f"🎯 Pad at ~{estimate['range_cm']:.0f} cm, bearing {estimate['bearing_deg']:.0f}° → go {x} {y} {z}",
+                         range_cm=round(estimate["range_cm"]), bearing_deg=round(estimate["bearing_deg"], 1),
+                         x=x, y=y, z=z, final=final, frame_id=self._frame_id)
+                self._pad_command(self.drone.go_xyz_speed, x, y, z, self.pad_approach.speed)
+            if step is None or final:
+                log.info("pad.handover", "✅ Over the pad. Handing over to built-in pad landing.", reason="over pad")
+                self.attempt_built_in_pad_landing(self.target_pad_id)
+        except Exception as e:
+            log.error("pad.approach_failed", f"Error during pad approach: {e}", error=e)
+            self.signals.status_message.emit(f"Error during pad approach: {e}")
+            self.trigger_pad_detection_recovery()
+
+    def _tick_pad_align(self):
+        """Pad in view: adjust height once, then rotate or advance toward it."""
+        if self.pad_approach is not None:
+            return self._tick_pad_approach()
+        # === Pad Detection and Alignment ===
+        if not self._pad_height_adjusted:
+            try:
+                # First move up to ensure we have room to adjust
+                self._pad_command(self.drone.move_up, 40)
+                self._pause(1)
+
+                current_height = self.drone.get_height()
+                target_height = 25
+                adjustment = current_height - target_height
+
+                if adjustment > 0:
+                    log.info("pad.height", f"⏬ Lowering drone by ~{adjustment} cm to reach ~25 cm...", adjustment_cm=adjustment)
+                    self._pad_command(self.drone.move_down, adjustment)
+                    self._pause(2)
                 else:
-                    print("✅ Aligned. Moving forward toward pad...")
+                    log.info("pad.height", "✅ Already near or below target height.", adjustment_cm=0)
+                self._pad_height_adjusted = True
+            except Exception as e:
+                log.error("pad.height_failed", f"Error adjusting height for pad: {e}", error=e)
+                self.signals.status_message.emit(f"Error adjusting height: {e}")
+
+        grabbed = self._grab_frame()
+        if grabbed is None:
+            return
+        frame, rgb_frame = grabbed
+
+        boxes = self._infer("pad", rgb_frame)
+
+        # Emit the frame with detection overlay
+        self.signals.frame_ready.emit(frame, "detection")
+
+        box = select_pad_box(boxes)
+        if box is not None:
+            pad_center_x, _ = box_center(box)
+            frame_center_x = frame.shape[1] // 2
+            offset = self._predicted_offset(pad_center_x - frame_center_x, frame.shape[1])
+
+            if abs(offset) > 80:
+                if offset < 0:
+                    log.info("pad.align", "↺ Slight ROTATE LEFT (1°) to align with pad...", action="ccw", offset_px=offset, frame_id=self._frame_id)
                     try:
-                        self.drone.move_forward(20)
-                        time.sleep(2)
+                        self._pad_command(self.drone.rotate_counter_clockwise, 5)
                     except Exception as e:
-                        print(f"Error during forward movement: {e}")
-                        self.signals.status_message.emit(f"Error during forward movement: {e}")
-
+                        log.error("pad.align_failed", f"Error during rotation: {e}", error=e)
+                        self.signals.status_message.emit(f"Error during rotation: {e}")
+                else:
+                    log.info("pad.align", "↻ Slight ROTATE RIGHT (1°) to align with pad...", action="cw", offset_px=offset, frame_id=self._frame_id)
+                    try:
+                        self._pad_command(self.drone.rotate_clockwise, 5)
+                    except Exception as e:
+                        log.error("pad.align_failed", f"Error during rotation: {e}", error=e)
+                        self.signals.status_message.emit(f"Error during rotation: {e}")
             else:
-                print("❌ Pad lost. Moving forward 40cm before recovery...")
-                self.signals.status_message.emit("Pad lost. Moving forward before recovery.")
+                log.info("pad.align", "✅ Aligned. Moving forward toward pad...", action="forward", offset_px=offset, frame_id=self._frame_id)
                 try:
-                    self.drone.move_forward(40)
-                    time.sleep(2)
-                    print("Triggering recovery maneuver after forward movement.")
-                    self.trigger_pad_detection_recovery()
+                    self._pad_command(self.drone.move_forward, 20)
+                    self._pause(2)
                 except Exception as e:
-                    print(f"Error during forward movement: {e}")
+                    log.error("pad.forward_failed", f"Error during forward movement: {e}", error=e)
                     self.signals.status_message.emit(f"Error during forward movement: {e}")
-                    # If forward movement fails, still try recovery
-                    self.trigger_pad_detection_recovery()
 
-        # Segmentation mode handling
-        elif self._start_segmentation:
-            results = self.path_model.predict(source=rgb_frame, task='segment', imgsz=640, conf=0.4, verbose=False)
-            masks = results[0].masks.data.cpu().numpy() if results[0].masks else []
-            if len(masks) > 0:
-                self._no_path_counter = 0
-                mask = (masks[0] * 255).astype(np.uint8)
-                M = cv2.moments(mask)
-                if M["m00"] > 0:
-                    cX = int(M["m10"] / M["m00"])
-                    center_x = mask.shape[1] // 2
-                    if cX < center_x - 50:
-                        self.signals.status_message.emit("⬅️ Path on LEFT → moving left")
-                        self.drone.move_left(20)
-                    elif cX > center_x + 50:
-                        self.signals.status_message.emit("➡️ Path on RIGHT → moving right")
-                        self.drone.move_right(20)
-                    else:
-                        self.signals.status_message.emit("⬆️ Path CENTERED → moving forward")
-                        self.drone.move_forward(40)
-                else:
-                    self.signals.status_message.emit("🚫 No centroid found")
-            else:
-                self._no_path_counter += 1
-                self.signals.status_message.emit("🔄 No path detected")
-                if self._no_path_counter == 1:
-                    self.drone.rotate_clockwise(90)
-                elif self._no_path_counter == 2:
-                    self.drone.rotate_counter_clockwise(180)
-                elif self._no_path_counter > 2:
-                    self.signals.status_message.emit("🛑 Path not found after recovery attempts. Switching to pad detection.")
-                    # After segmentation fails, switch to pad detection mode
-                    self._start_segmentation = False
-                    self._pad_mode = True
-                    self._pad_height_adjusted = False
-                    # Trigger pad detection recovery
-                    self.trigger_pad_detection_recovery()
+        else:
+            log.warning("pad.lost", "❌ Pad lost. Moving forward 40cm before recovery...")
+            self.signals.status_message.emit("Pad lost. Moving forward before recovery.")
+            try:
+                self._pad_command(self.drone.move_forward, 40)
+                self._pause(2)
+                log.info("recovery.start", "Triggering recovery maneuver after forward movement.")
+                self.trigger_pad_detection_recovery()
+            except Exception as e:
+                log.error("pad.forward_failed", f"Error during forward movement: {e}", error=e)
+                self.signals.status_message.emit(f"Error during forward movement: {e}")
+                # If forward movement fails, still try recovery
+                self.trigger_pad_detection_recovery()
 
     def trigger_pad_detection_recovery(self):
         """Trigger the pad detection recovery sequence"""
@@ -231,17 +719,17 @@ class DroneWorker(QObject):
             # time.sleep(1.5)
 
             # Ascend to search altitude (e.g., 80 cm)
-            print("⬆️ Ascending for Pad search...")
+            log.info("recovery.ascend", "⬆️ Ascending for Pad search...")
             self.signals.status_message.emit("Ascending for Pad search.")
             current_height = self.drone.get_height()
             target_search_height = 80
             if current_height < target_search_height:
                 ascend_distance = target_search_height - current_height
-                self.drone.move_up(ascend_distance)
-                time.sleep(2)
-                print(f"Reached approx height: {self.drone.get_height()} cm")
+                self._pad_command(self.drone.move_up, ascend_distance)
+                self._pause(2)
+                log.info("recovery.height", f"Reached approx height: {self.drone.get_height()} cm")
             else:
-                print("Already above search height.")
+                log.info("recovery.height", "Already above search height.")
 
             # After recovery maneuver, attempt built-in pad landing
             self.attempt_built_in_pad_landing(self.target_pad_id)
@@ -249,10 +737,64 @@ class DroneWorker(QObject):
         except Exception as e:
             recovery_error_msg = f"❌ Error during recovery maneuver: {str(e)}"
             self.signals.status_message.emit(recovery_error_msg)
-            print(recovery_error_msg)
+            log.error("recovery.failed", recovery_error_msg, error=e)
+            flight_log.dump_recent("recovery failed")
             # Fallback to general landing if recovery fails
             self.land_drone()
 
+    def _finish_mission(self, reason):
+        """Stop ticking, enter FINISHED and tell the GUI."""
+        self._close_approach(reason)
+        self._report_commands()
+        self._report_trace()
+        self._report_rates()
+        self._is_running = False
+        if self.mission.state is not FINISHED:
+            self.mission.transition(FINISHED, reason)
+        self.control_loop_timer.stop()
+        self.signals.mission_finished.emit()
+
+    def _report_commands(self):
+        """Log where the mission's time went on drone commands and keep the summary."""
+        if not self.command_stats.commands:
+            return None
+        summary = self._publish_command_stats(force=True)
+        self.command_reports.append(summary)
+        busiest = next(iter(summary["commands"]))
+        log.info("commands.report", self.command_stats.format_report(summary),
+                 elapsed_s=summary["elapsed_s"], wait_s=summary["wait_s"],
+                 wait_fraction=summary["wait_fraction"], busiest=busiest,
+                 errors=sum(c["errors"] for c in summary["commands"].values()),
+                 retries=sum(c["retries"] for c in summary["commands"].values()))
+        return summary
+
+    def _report_trace(self):
+        """Log the mission's frame ages at command time; save the trace if asked to."""
+        summary = self.frame_trace.summary()
+        if not summary["commands"]:
+            return None
+        self.trace_reports.append(summary)
+        path = None
+        if self.trace_dir:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            path = self.frame_trace.save(os.path.join(
+                self.trace_dir, time.strftime("frame_trace_%Y%m%d_%H%M%S.json")))
+        age = summary["age_ms"]
+        log.info("trace.report", self.frame_trace.format_report(summary), commands=summary["commands"],
+                 age_p50_ms=age["p50"], age_p95_ms=age["p95"], age_p99_ms=age["p99"], path=path)
+        return summary
+
+    def _report_rates(self):
+        """Log the tick and overlay rates the mission ran at and keep the summary."""
+        summary = self.rate_control.summary()
+        if not summary["states"]:
+            return None
+        self.rate_reports.append(summary)
+        log.info("rate.report", self.rate_control.format_report(summary), changes=summary["changes"],
+                 states=summary["states"], inference_ms=summary["inference_ms"], cpu=summary["cpu"],
+                 power_save=summary["power_save"])
+        return summary
+
     @Slot()
     def land_drone(self):
         if self.drone:
@@ -261,47 +803,52 @@ class DroneWorker(QObject):
                 self.signals.status_message.emit("Landing successful.")
             except Exception as e:
                 self.signals.status_message.emit(f"Landing failed: {e}")
-        self._is_running = False
-        self.control_loop_timer.stop()
-        self.signals.mission_finished.emit()
+        self._finish_mission("land")
 
     @Slot()
     def emergency_land(self):
-        try:
-            if self.drone:
-                self.signals.status_message.emit("🚨 Emergency landing initiated")
-                self.drone.send_rc_control(0, 0, 0, 0)
-                time.sleep(0.1)
-                try:
-                    self.drone.emergency()
-                except Exception:
-                    self.drone.land()
-
-            self._is_running = False
-            self._start_segmentation = False
-            self._pad_mode = False
-            self.control_loop_timer.stop()
-            self.signals.mission_finished.emit()
-
-        except Exception as e:
-            self.signals.status_message.emit(f"❌ Emergency landing error: {str(e)}")
-            self._is_running = False
-            self._start_segmentation = False
-            self._pad_mode = False
-            self.control_loop_timer.stop()
-            self.signals.mission_finished.emit()
+        """Cut the motors through the safety lane and end the mission.
+
+        The GUI triggers ``self.safety`` directly instead, so the stop is not
+        queued behind a tick on this thread.
+        """
+        self.signals.status_message.emit("🚨 Emergency landing initiated")
+        self.safety.trigger("emergency", "emergency_land")
+        self._abort_mission()
+
+    @Slot(dict)
+    def _on_safety_tripped(self, record):
+        # Queued from the lane thread; a tick may have ended the mission
+        # already, or a re-arm cleared the trip since
+        if self.safety.tripped.is_set():
+            self._abort_mission()
+
+    def _abort_mission(self):
+        """The safety lane fired: end the mission without sending anything else."""
+        if self.mission.state is FINISHED:
+            return
+        action = self.safety.action or "emergency"
+        log.warning("safety.abort", f"🚨 Mission aborted by safety lane ({action})", action=action,
+                    state=self.mission.state.name)
+        self._finish_mission(action)
+        if action == "emergency":
+            # On this thread, so the file write never delays the lane
+            flight_log.dump_recent("emergency")
 
     def attempt_built_in_pad_landing(self, target_pad_id):
-        """Attempts to use Tello's built-in pad landing feature."""
-        print("Attempting built-in pad landing...")
+        """Starts the search for ``target_pad_id`` with Tello's built-in pad detection.
+
+        The search itself runs as the PAD_SEARCH state: one detection check and
+        rotation per tick, landing on the pad once it is identified.
+        """
+        log.info("search.start", "Attempting built-in pad landing...", target_pad_id=target_pad_id)
         self.signals.status_message.emit("Attempting built-in pad landing...")
 
         try:
             if not self.drone:
-                print("Drone not connected for built-in landing.")
+                log.error("search.no_drone", "Drone not connected for built-in landing.")
                 self.signals.status_message.emit("Built-in landing failed: Drone not connected.")
-                self._is_running = False
-                self.signals.mission_finished.emit()
+                self._finish_mission("no drone for built-in landing")
                 return
 
             # Ensure drone is at a suitable height for downward pad detection (e.g., ~80-120 cm)
@@ -309,137 +856,126 @@ class DroneWorker(QObject):
             # If this method is called outside of the recovery maneuver, caller should ensure height
             # For now, we proceed assuming suitable height.
             current_height = self.drone.get_height()
-            print(f"Starting built-in pad search from height: {current_height} cm")
+            log.info("search.height", f"Starting built-in pad search from height: {current_height} cm", height_cm=current_height)
             self.signals.status_message.emit(f"Starting built-in search from {current_height} cm.")
 
-            self.drone.enable_mission_pads()
-            self.drone.set_mission_pad_detection_direction(0)  # Downward camera
-            print("下视视觉定位系统已启用（Mission Pad 检测：开启 | 检测方向：下视）")
+            self._pad_command(self.drone.enable_mission_pads)
+            self._pad_command(self.drone.set_mission_pad_detection_direction, 0)  # Downward camera
+            log.info("search.mission_pads", "下视视觉定位系统已启用（Mission Pad 检测：开启 | 检测方向：下视）")
             self.signals.status_message.emit("下视视觉定位系统已启用")
 
-            pad_found = False
-            search_attempts = 0
-            max_search_attempts = 20 # Increased attempts
-            rotation_angle = 30 # Degrees to rotate each attempt
-
-            while not pad_found and search_attempts < max_search_attempts and self._is_running:
-                pad_id = self.drone.get_mission_pad_id()
-                print(f"Built-in search Attempt {search_attempts+1}: Detected ID: {pad_id}")
-
-                if pad_id == target_pad_id:
-                    print(f"🎯 Successfully identified target Pad ID: {target_pad_id}")
-                    self.signals.status_message.emit(f"Target Pad ID {target_pad_id} identified.")
-                    pad_found = True
-                    break # Exit search loop
-                elif pad_id != -1:
-                     print(f"Identified non-target Pad ID: {pad_id}. Continuing search for {target_pad_id}.")
-                     self.signals.status_message.emit(f"Non-target Pad ID {pad_id} detected. Searching for {target_pad_id}.")
-                else:
-                    print(f"🔍 No Pad detected. Rotating {rotation_angle}° clockwise and searching...")
-                    self.signals.status_message.emit(f"No Pad detected. Rotating {rotation_angle}° and searching...")
-
-                # Rotate and wait to search wider area
-                try:
-                    self.drone.rotate_clockwise(rotation_angle)
-                    time.sleep(2) # Increased sleep to allow rotation and detection
-                except Exception as rotate_e:
-                    print(f"Error during built-in search rotation: {rotate_e}")
-                    self.signals.status_message.emit(f"Error during built-in search rotation: {rotate_e}")
-                    # If rotation fails, might as well stop the search and fallback
-                    break 
-
-                search_attempts += 1
-
-            if pad_found:
-                print("🛫 Moving to target Pad (offset height 50cm)...")
-                self.signals.status_message.emit("Approaching target Pad.")
-                # go_xyz_speed_mid is blocking, worker will wait here
-                try:
-                    # Move to 50cm above pad. Note: go_xyz_speed_mid is relative to the pad.
-                    self.drone.go_xyz_speed_mid(0, 0, 50, 15, target_pad_id) 
-                    print("✅ Reached position above Pad.")
-                    self.signals.status_message.emit("Above Pad. Landing.")
+            self.target_pad_id = target_pad_id
+            self._search_attempts = 0
+            self.mission.transition(PAD_SEARCH, "built-in pad search")
 
-                    print("🛬 Initiating built-in land...")
-                    try:
-                        self.drone.land()
-                        print("✅ Built-in land command issued.")
-                        self.signals.status_message.emit("Built-in landing complete.")
-                    except Exception as land_e:
-                         error_msg = f"❌ Built-in land command failed: {str(land_e)}"
-                         self.signals.status_message.emit(error_msg)
-                         print(error_msg)
-                         # If land fails after reaching position, attempt simplified fallback land
-                         print("Built-in land failed after positioning. Attempting simple fallback land.")
-                         self.signals.status_message.emit("Built-in land failed. Fallback land.")
-                         try:
-                             if self.drone:
-                                 self.drone.land()
-                                 print("Simple fallback land command issued after built-in land failure.")
-                         except Exception as ee:
-                              final_error_msg = f"❌ Simple fallback land also failed after built-in land failure: {str(ee)}"
-                              self.signals.status_message.emit(final_error_msg)
-                              print(final_error_msg)
-
-                except Exception as go_e:
-                    error_msg = f"❌ go_xyz_speed_mid command failed: {str(go_e)}"
-                    self.signals.status_message.emit(error_msg)
-                    print(error_msg)
-                    # If go_xyz_speed_mid fails, fallback to general land
-                    print("go_xyz_speed_mid failed. Falling back to general landing.")
-                    self.signals.status_message.emit("Positioning failed. Falling back.")
-                    self.land_drone() # land_drone handles its own errors and stopping worker
-                    return # Exit this built-in landing attempt method
-
-                # Built-in landing or its fallback was attempted, stop the worker
-                self._is_running = False
-                self._start_segmentation = False
-                self._pad_mode = False
-                self.signals.mission_finished.emit()
+        except Exception as e:
+            self._built_in_landing_failed(e)
 
-            else:
-                print("❌ Target Pad not identified after search attempts.")
+    def _tick_pad_search(self):
+        """One built-in search attempt: check the pad id, else rotate and wait a tick."""
+        target_pad_id = self.target_pad_id
+        try:
+            if self._search_attempts >= self.max_search_attempts:
+                log.warning("search.exhausted", "❌ Target Pad not identified after search attempts.", attempts=self._search_attempts)
                 self.signals.status_message.emit("Target Pad not found after search. Falling back.")
                 # If built-in detection failed after search attempts, perform a simple land as a fallback
-                print("Attempting simple land after built-in search failure.")
-                try:
-                    if self.drone:
-                        self.drone.land()
-                        print("Simple fallback land command issued after built-in search failure.")
-                except Exception as e:
-                    final_error_msg = f"❌ Simple fallback land also failed after built-in search failure: {str(e)}"
-                    self.signals.status_message.emit(final_error_msg)
-                    print(final_error_msg)
-
-                # Ensure worker stops regardless of final fallback success
-                self._is_running = False
-                self._start_segmentation = False
-                self._pad_mode = False
-                self.signals.mission_finished.emit()
+                log.info("land.fallback", "Attempting simple land after built-in search failure.")
+                self._fallback_land("built-in search failure")
+                return
+
+            pad_id = self.drone.get_mission_pad_id()
+            log.info("search.attempt", f"Built-in search Attempt {self._search_attempts+1}: Detected ID: {pad_id}", attempt=self._search_attempts + 1, pad_id=pad_id)
+
+            if pad_id == target_pad_id:
+                log.info("search.found", f"🎯 Successfully identified target Pad ID: {target_pad_id}", pad_id=target_pad_id)
+                self.signals.status_message.emit(f"Target Pad ID {target_pad_id} identified.")
+                self._land_on_mission_pad(target_pad_id)
+                return
+            elif pad_id != -1:
+                log.info("search.other_pad", f"Identified non-target Pad ID: {pad_id}. Continuing search for {target_pad_id}.", pad_id=pad_id)
+                self.signals.status_message.emit(f"Non-target Pad ID {pad_id} detected. Searching for {target_pad_id}.")
+            else:
+                log.info("search.rotate", f"🔍 No Pad detected. Rotating {self.search_rotation_angle}° clockwise and searching...", angle=self.search_rotation_angle)
+                self.signals.status_message.emit(f"No Pad detected. Rotating {self.search_rotation_angle}° and searching...")
+
+            # Rotate; the state's tick period leaves time for rotation and detection
+            try:
+                self._pad_command(self.drone.rotate_clockwise, self.search_rotation_angle)
+            except Exception as rotate_e:
+                log.error("search.rotate_failed", f"Error during built-in search rotation: {rotate_e}", error=rotate_e)
+                self.signals.status_message.emit(f"Error during built-in search rotation: {rotate_e}")
+                # If rotation fails, might as well stop the search and fallback
+                self._search_attempts = self.max_search_attempts
+                return
+
+            self._search_attempts += 1
 
         except Exception as e:
-            # This catches unexpected errors during the built-in landing setup or initial search loop
-            error_msg = f"❌ Unexpected error during built-in pad landing attempt: {str(e)}"
-            self.signals.status_message.emit(error_msg)
-            print(error_msg)
-            
-            # In case of an unexpected error during the procedure, attempt a simple land as a fallback
-            print("Unexpected built-in landing error. Attempting simple land fallback.")
-            self.signals.status_message.emit("Built-in attempt failed unexpectedly. Simple land fallback.")
+            self._built_in_landing_failed(e)
+
+    def _land_on_mission_pad(self, target_pad_id):
+        log.info("land.approach", "🛫 Moving to target Pad (offset height 50cm)...", pad_id=target_pad_id)
+        self.signals.status_message.emit("Approaching target Pad.")
+        # go_xyz_speed_mid is blocking, worker will wait here
+        try:
+            # Move to 50cm above pad. Note: go_xyz_speed_mid is relative to the pad.
+            self._pad_command(self.drone.go_xyz_speed_mid, 0, 0, 50, 15, target_pad_id)
+            log.info("land.above_pad", "✅ Reached position above Pad.")
+            self.signals.status_message.emit("Above Pad. Landing.")
+
+            log.info("land.start", "🛬 Initiating built-in land...")
             try:
-                if self.drone:
-                    self.drone.land()
-                    print("Simple land fallback command issued after unexpected built-in failure.")
-            except Exception as ee:
-                 final_error_msg = f"❌ Simple land fallback also failed after unexpected built-in failure: {str(ee)}"
-                 self.signals.status_message.emit(final_error_msg)
-                 print(final_error_msg)
-
-            # Ensure worker stops regardless of final fallback success
-            self._is_running = False
-            self._start_segmentation = False
-            self._pad_mode = False
-            self.signals.mission_finished.emit()
+                self._pad_command(self.drone.land)
+                log.info("land.done", "✅ Built-in land command issued.")
+                self.signals.status_message.emit("Built-in landing complete.")
+            except Exception as land_e:
+                error_msg = f"❌ Built-in land command failed: {str(land_e)}"
+                self.signals.status_message.emit(error_msg)
+                log.error("land.failed", error_msg, error=land_e)
+                # If land fails after reaching position, attempt simplified fallback land
+                log.info("land.fallback", "Built-in land failed after positioning. Attempting simple fallback land.")
+                self.signals.status_message.emit("Built-in land failed. Fallback land.")
+                self._fallback_land("built-in land failure")
+                return
+
+        except Exception as go_e:
+            error_msg = f"❌ go_xyz_speed_mid command failed: {str(go_e)}"
+            self.signals.status_message.emit(error_msg)
+            log.error("land.go_mid_failed", error_msg, error=go_e)
+            # If go_xyz_speed_mid fails, fallback to general land
+            log.info("land.fallback", "go_xyz_speed_mid failed. Falling back to general landing.")
+            self.signals.status_message.emit("Positioning failed. Falling back.")
+            self.land_drone() # land_drone handles its own errors and stopping worker
+            return
+
+        # Built-in landing was attempted, stop the worker
+        self._finish_mission("landed on mission pad")
+
+    def _fallback_land(self, reason):
+        """Simple land after a failed built-in step; the mission ends either way."""
+        try:
+            if self.drone:
+                self._pad_command(self.drone.land)
+                log.info("land.fallback_done", f"Simple fallback land command issued after {reason}.", reason=reason)
+        except Exception as e:
+            final_error_msg = f"❌ Simple fallback land also failed after {reason}: {str(e)}"
+            self.signals.status_message.emit(final_error_msg)
+            log.error("land.fallback_failed", final_error_msg, reason=reason, error=e)
+
+        # Ensure worker stops regardless of final fallback success
+        self._finish_mission(reason)
+
+    def _built_in_landing_failed(self, e):
+        # This catches unexpected errors during the built-in landing setup or search
+        error_msg = f"❌ Unexpected error during built-in pad landing attempt: {str(e)}"
+        self.signals.status_message.emit(error_msg)
+        log.error("search.failed", error_msg, error=e)
+        flight_log.dump_recent("unexpected built-in failure")
+
+        # In case of an unexpected error during the procedure, attempt a simple land as a fallback
+        log.info("land.fallback", "Unexpected built-in landing error. Attempting simple land fallback.")
+        self.signals.status_message.emit("Built-in attempt failed unexpectedly. Simple land fallback.")
+        self._fallback_land("unexpected built-in failure")
 
     def get_drone(self):
         return self.drone
@@ -450,19 +986,19 @@ class DroneWorker(QObject):
     def get_pad_model(self):
         return self.pad_model
 
+    def get_mission_state(self):
+        return self.mission.state
+
     def is_segmentation_active(self):
         return self._start_segmentation
 
     def is_pad_mode_active(self):
-        return self._pad_mode
+        # The detection overlay only runs while a pad state actually uses the pad model
+        return self._pad_mode and self.mission.state.needs("pad")
 
     def switch_to_pad_mode(self):
-        self._pad_mode = True
-        self._start_segmentation = False
+        self._enter_pad_align("switched to pad mode")
 
     def stop_worker(self):
-        self._is_running = False
-        self._start_segmentation = False
-        self._pad_mode = False
-        self.control_loop_timer.stop()
-        self.signals.mission_finished.emit()
+        self._finish_mission("worker stopped")
+        self.safety.stop()
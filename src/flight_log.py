@@ -0,0 +1,239 @@
+# File: flight_log.py
+"""
+Non-blocking structured logging for the control loop.
+
+Code on the hot path logs through an ``EventLog``: a call builds one small
+``LogRecord`` carrying an event name and a dict of fields and puts it on a
+queue. A ``QueueListener`` thread does all formatting and I/O: JSON lines to a
+rotating file, the in-memory ring of recent events and, optionally, the
+human-readable message to the console. The ``drone`` logger does not
+propagate, so handlers an application adds to the root logger never run on
+the hot path.
+
+    flight_log.configure("logs")          # once, at startup
+    log = flight_log.get_logger("worker")
+    log.info("pad.approach", "🎯 Pad at ~120 cm", range_cm=120)
+
+The ring keeps the most recent events even when nothing was configured (it
+then sits on the logger and formats on the caller, which only scripts and
+tests do), and ``dump_recent`` writes it out when something fails.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+ROOT = "drone"
+
+
+class EventLog:
+    """Logger front end taking an event name, a message and keyword fields."""
+
+    def __init__(self, logger):
+        self.logger = logger
+
+    def _log(self, level, event, message, fields):
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message or event, extra={"event": event, "fields": fields})
+
+    def debug(self, event, message="", **fields):
+        self._log(logging.DEBUG, event, message, fields)
+
+    def info(self, event, message="", **fields):
+        self._log(logging.INFO, event, message, fields)
+
+    def warning(self, event, message="", **fields):
+        self._log(logging.WARNING, event, message, fields)
+
+    def error(self, event, message="", **fields):
+        self._log(logging.ERROR, event, message, fields)
+
+
+def record_to_dict(record):
+    """The JSON-ready form of a record logged through ``EventLog``."""
+    entry = {
+        "t": round(record.created, 6),
+        "level": record.levelname,
+        "logger": record.name,
+        "event": getattr(record, "event", None),
+        "msg": record.getMessage(),
+        "thread": record.threadName,
+    }
+    for key, value in getattr(record, "fields", {}).items():
+        entry[key] = value if isinstance(value, (bool, int, float, str, type(None))) else str(value)
+    if record.exc_info:
+        entry["exc"] = logging.Formatter().formatException(record.exc_info)
+    return entry
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record_to_dict(record), ensure_ascii=False)
+
+
+class RingHandler(logging.Handler):
+    """Keeps the last ``size`` records as dicts.
+
+    A ``LogRecord`` holds its exception, traceback and so every frame on the
+    stack alive, along with whatever objects were passed as fields, so the
+    ring stores ``record_to_dict`` output instead of the record. Once logging
+    is configured the ring runs on the listener thread, off the hot path.
+    """
+
+    def __init__(self, size=1000):
+        super().__init__()
+        self.records = deque(maxlen=size)
+
+    def emit(self, record):
+        self.records.append(record_to_dict(record))
+
+    def handle(self, record):
+        # deque.append is atomic; skip the handler lock on the hot path
+        if self.filter(record):
+            self.emit(record)
+        return True
+
+    def snapshot(self):
+        return [dict(entry) for entry in list(self.records)]
+
+
+class _EnqueueHandler(logging.handlers.QueueHandler):
+    """Puts records on the queue untouched; formatting happens on the listener."""
+
+    def prepare(self, record):
+        return record
+
+
+class _Listener(logging.handlers.QueueListener):
+    """``QueueListener`` that also sets ``threading.Event`` markers, for ``flush``."""
+
+    def handle(self, record):
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        super().handle(record)
+
+
+class FlightLog:
+    """Wires the ``drone`` logger to a queue, a rotating file and the ring."""
+
+    def __init__(self, directory="logs", filename="flight.jsonl", max_bytes=5 * 1024 * 1024,
+                 backups=5, console=True, level=logging.INFO, ring=None):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.console = console
+        self.level = level
+        self.ring = ring or _ring
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+        self._handler = None
+        self._ring_detached = False
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8")
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers = [file_handler, self.ring]
+        if self.console:
+            console = logging.StreamHandler()
+            console.setFormatter(logging.Formatter("%(message)s"))
+            handlers.append(console)
+
+        self.listener = _Listener(self.queue, *handlers)
+        self.listener.start()
+        self._handler = _EnqueueHandler(self.queue)
+        root = logging.getLogger(ROOT)
+        # The listener fills the ring from here on
+        self._ring_detached = self.ring in root.handlers
+        root.removeHandler(self.ring)
+        root.addHandler(self._handler)
+        root.setLevel(self.level)
+        return self
+
+    def stop(self):
+        """Detach from the logger and flush everything queued so far."""
+        if self._handler is not None:
+            root = logging.getLogger(ROOT)
+            root.removeHandler(self._handler)
+            if self._ring_detached:
+                root.addHandler(self.ring)
+            self._handler = None
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                if handler is not self.ring:
+                    handler.close()
+            self.listener = None
+
+    def flush(self, timeout=1.0):
+        """Wait until the listener has handled everything queued so far."""
+        if self.listener is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def dump_recent(self, reason, path=None):
+        """Write the ring as JSON lines next to the log; returns the file path."""
+        path = path or os.path.join(self.directory, f"recent-{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.flush()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"event": "dump", "reason": reason, "t": time.time()}) + "\n")
+            for entry in self.ring.snapshot():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return path
+
+
+# The ring is attached at import so failures before ``configure`` still have history.
+_ring = RingHandler()
+logging.getLogger(ROOT).addHandler(_ring)
+logging.getLogger(ROOT).setLevel(logging.INFO)
+logging.getLogger(ROOT).propagate = False
+_active = None
+_lock = threading.Lock()
+
+
+def get_logger(name):
+    return EventLog(logging.getLogger(f"{ROOT}.{name}"))
+
+
+def configure(directory="logs", **kwargs):
+    """Start the background writer; replaces any earlier configuration."""
+    global _active
+    with _lock:
+        if _active is not None:
+            _active.stop()
+        _active = FlightLog(directory, **kwargs).start()
+        return _active
+
+
+def shutdown():
+    global _active
+    with _lock:
+        if _active is not None:
+            _active.stop()
+            _active = None
+
+
+def recent_events():
+    active = _active
+    if active is not None:
+        active.flush()
+    return _ring.snapshot()
+
+
+def dump_recent(reason, path=None):
+    """Dump the ring of recent events; ``None`` if logging was never configured and no path given."""
+    if _active is not None:
+        return _active.dump_recent(reason, path)
+    if path is None:
+        return None
+    return FlightLog(os.path.dirname(path) or ".").dump_recent(reason, path)
@@ -0,0 +1,232 @@
+# File: frame_trace.py
+"""
+Frame-to-command tracing.
+
+A steering command is only as good as the frame it was decided on, so the
+latency that matters for control is how old that frame was when the command
+went out. Frame readers tag every frame with a ``frame_id`` and the
+``timestamp`` it was captured at (``tello_async.FrameRead``, the simulator).
+Frames from readers without either, like djitellopy's, are numbered here and
+timed on pickup. ``FrameTrace`` follows each frame through the pipeline:
+
+- ``frame`` on the capture lane: from capture until a thread picks it up;
+- ``prepare`` on the camera lane: the GUI camera thread readying it for display;
+- ``infer.path`` / ``infer.pad`` / ``infer.pad_gate``: control inference on it;
+- ``tick <state>``: the mission state handler that decided on it;
+- one span per drone call made while it was the thread's current frame, with
+  an arrow from the capture to every command that moves the drone.
+
+``save`` writes the Chrome trace event format, which chrome://tracing and
+https://ui.perfetto.dev open as they are. ``summary`` gives p50/p95/p99 of
+the frame's age when each such command was sent and acknowledged:
+
+    trace = FrameTrace()
+    trace.set_lane("control")
+    frame, frame_id, captured = read_frame(drone.get_frame_read())
+    trace.frame(frame_id, captured)
+    ...
+    trace.command("move_left", sent, acked)
+    trace.save("trace.json")
+    print(trace.format_report())
+"""
+import json
+import threading
+import time
+from collections import deque
+
+# Drone calls that move it; queries and setup are traced but not aged
+ACTIONS = ("takeoff", "land", "emergency", "move_", "rotate_", "go_xyz_speed", "curve_xyz_speed",
+           "send_rc_control", "flip")
+
+# Lane order in the trace viewer; other lanes follow in order of appearance
+LANES = ("capture", "camera", "control")
+
+
+def is_action(name):
+    return name.startswith(ACTIONS)
+
+
+def read_frame(frame_read):
+    """``(frame, frame_id, capture_time)`` from a frame reader.
+
+    ID and time are ``None`` when the reader has none.
+    """
+    snapshot = getattr(frame_read, "snapshot", None)
+    if snapshot is not None:
+        return snapshot()
+    return frame_read.frame, getattr(frame_read, "frame_id", None), getattr(frame_read, "timestamp", None)
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def _ms(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+    summary = {f"p{q}": round(_percentile(ordered, q) * 1000, 1) for q in (50, 95, 99)}
+    summary["max"] = round(ordered[-1] * 1000, 1)
+    return summary
+
+
+class FrameTrace:
+    """Bounded trace of frames from capture to command, with age percentiles.
+
+    Any thread may record. Each thread has a lane (``set_lane``) and a current
+    frame (``frame``), and spans and drone calls are filed under both.
+    """
+
+    def __init__(self, clock=time.monotonic, max_events=100000, window=500):
+        self.clock = clock
+        self.max_events = max_events
+        self.window = window
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Forget all frames and events; lanes are kept."""
+        with self._lock:
+            # (phase, name, lane, start, duration, frame_id, args)
+            self.events = deque(maxlen=self.max_events)
+            # (command, age when sent, age when acknowledged)
+            self.ages = deque(maxlen=self.window)
+            self.pickups = deque(maxlen=self.window)
+            self.frame_counts = {}
+            self._last_id = 0
+            self._last_by_lane = {}
+            self._flows = 0
+        self._local.frame = None
+
+    def set_lane(self, lane):
+        """File this thread's events under ``lane`` (default: the thread's name)."""
+        self._local.lane = lane
+
+    def _lane(self):
+        lane = getattr(self._local, "lane", None)
+        return lane or threading.current_thread().name
+
+    def _current(self):
+        return getattr(self._local, "frame", None) or (None, None)
+
+    def frame(self, frame_id, capture_time=None, now=None):
+        """Make a frame this thread's current one and return its ID.
+
+        ``None`` for either means the reader has none: the frame is numbered
+        after the newest one seen, and captured now.
+        """
+        now = self.clock() if now is None else now
+        capture_time = now if capture_time is None else capture_time
+        lane = self._lane()
+        with self._lock:
+            if frame_id is None:
+                frame_id = self._last_id + 1
+            if frame_id > self._last_id:
+                self._last_id = frame_id
+                self.events.append(("X", "frame", "capture", capture_time, now - capture_time, frame_id, None))
+            if frame_id > self._last_by_lane.get(lane, 0):
+                self._last_by_lane[lane] = frame_id
+                self.frame_counts[lane] = self.frame_counts.get(lane, 0) + 1
+                if lane == "control":
+                    self.pickups.append(now - capture_time)
+        self._local.frame = (frame_id, capture_time)
+        return frame_id
+
+    def drop(self):
+        """This thread has no current frame until the next ``frame``."""
+        self._local.frame = None
+
+    def span(self, name, start, end=None, **args):
+        """Record ``name`` from ``start`` to ``end`` (default: now) on the current frame."""
+        end = self.clock() if end is None else end
+        frame_id, _ = self._current()
+        with self._lock:
+            self.events.append(("X", name, self._lane(), start, end - start, frame_id, args or None))
+
+    def command(self, name, sent, acked, error=None):
+        """Record a drone call, and the current frame's age if it moves the drone."""
+        frame_id, capture_time = self._current()
+        lane = self._lane()
+        args = {"error": str(error)} if error is not None else None
+        with self._lock:
+            self.events.append(("X", name, lane, sent, acked - sent, frame_id, args))
+            if frame_id is None or not is_action(name):
+                return
+            self._flows += 1
+            self.events.append(("s", "frame", "capture", capture_time, 0.0, frame_id, self._flows))
+            self.events.append(("f", "frame", lane, sent, 0.0, frame_id, self._flows))
+            self.ages.append((name, sent - capture_time, acked - capture_time))
+
+    def summary(self):
+        """Frame ages at pickup and at each drone-moving command, in ms."""
+        with self._lock:
+            ages = list(self.ages)
+            pickups = list(self.pickups)
+            frame_counts = dict(self.frame_counts)
+        by_command = {}
+        for name, sent, _ in ages:
+            by_command.setdefault(name, []).append(sent)
+        return {
+            "frames": frame_counts,
+            "commands": len(ages),
+            "pickup_age_ms": _ms(pickups),
+            "age_ms": _ms([sent for _, sent, _ in ages]),
+            "acked_age_ms": _ms([acked for _, _, acked in ages]),
+            "by_command": {name: {"calls": len(values), **_ms(values)}
+                           for name, values in sorted(by_command.items(), key=lambda item: -len(item[1]))},
+        }
+
+    def format_report(self, summary=None):
+        """The summary as text."""
+        summary = summary or self.summary()
+        age = summary["age_ms"]
+        if age is None:
+            return "Frame age at command: no commands traced"
+        lines = [f"Frame age at command: p50 {age['p50']:.0f} ms, p95 {age['p95']:.0f} ms, "
+                 f"p99 {age['p99']:.0f} ms, max {age['max']:.0f} ms over {summary['commands']} commands"]
+        pickup, acked = summary["pickup_age_ms"], summary["acked_age_ms"]
+        if pickup is not None:
+            lines.append(f"  at pickup p50 {pickup['p50']:.0f} ms, p95 {pickup['p95']:.0f} ms; "
+                         f"at acknowledgement p50 {acked['p50']:.0f} ms, p95 {acked['p95']:.0f} ms")
+        for name, c in summary["by_command"].items():
+            lines.append(f"  {name:<24} {c['calls']:>5}  p50 {c['p50']:>7.0f}  p95 {c['p95']:>7.0f}  "
+                         f"p99 {c['p99']:>7.0f} ms")
+        return "\n".join(lines)
+
+    def chrome_events(self):
+        """The trace as a list of Chrome trace events, timed from the first one."""
+        with self._lock:
+            events = list(self.events)
+        if not events:
+            return []
+        origin = min(event[3] for event in events)
+        lanes = [lane for lane in LANES if any(event[2] == lane for event in events)]
+        lanes += [lane for lane in dict.fromkeys(event[2] for event in events) if lane not in lanes]
+        tids = {lane: tid for tid, lane in enumerate(lanes, 1)}
+
+        out = [{"ph": "M", "name": "process_name", "pid": 1, "tid": 0, "args": {"name": "drone pipeline"}}]
+        out += [{"ph": "M", "name": "thread_name", "pid": 1, "tid": tid, "args": {"name": lane}}
+                for lane, tid in tids.items()]
+        out += [{"ph": "M", "name": "thread_sort_index", "pid": 1, "tid": tid, "args": {"sort_index": tid}}
+                for tid in tids.values()]
+        for phase, name, lane, start, duration, frame_id, extra in events:
+            event = {"ph": phase, "name": name, "cat": "frame", "pid": 1, "tid": tids[lane],
+                     "ts": round((start - origin) * 1e6, 1)}
+            if phase == "X":
+                event["dur"] = round(duration * 1e6, 1)
+                event["args"] = {"frame_id": frame_id, **(extra or {})}
+            else:
+                # Flow arrow from the capture to a command
+                event["id"] = extra
+                if phase == "f":
+                    event["bp"] = "e"  # end on the command's own span, not the next one
+            out.append(event)
+        return out
+
+    def save(self, path):
+        """Write the trace as Chrome trace JSON, with the summary under ``otherData``."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.chrome_events(), "displayTimeUnit": "ms",
+                       "otherData": {"summary": self.summary()}}, f)
+        return path
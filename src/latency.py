@@ -0,0 +1,297 @@
+# File: latency.py
+"""
+Latency compensation for the control loop.
+
+A steering decision is made on a frame captured some time earlier, and the
+drone only acts on it after inference and the command round trip. If the
+drone is still yawing or drifting sideways, the target has already moved by
+the time the command lands, so a decision on the raw offset overshoots the
+dead bands and oscillates.
+
+``LatencyCompensator`` keeps a short history of yaw and velocity telemetry and
+predicts where a target seen at ``capture_time`` will sit in the image when the
+next command takes effect. ``DelayEstimator`` tracks the capture-to-decision
+delay online. ``evaluate_replay`` scores the prediction against recorded
+frames; ``simulation.record_replay`` produces such recordings:
+
+    python src/latency.py --record replay.json
+    python src/latency.py --replay replay.json
+"""
+import argparse
+import bisect
+import json
+import math
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+# The Tello (djitellopy's ``Tello``, ``tello_async.TelloClient``) reports
+# vgx/vgy in dm/s
+TELLO_SPEED_SCALE = 10.0
+
+
+class DelayEstimator:
+    """Exponentially weighted delay estimate plus a window of recent samples.
+
+    Samples outside ``[0, max_delay]`` come from mismatched clocks or stalls
+    and are dropped instead of poisoning the estimate.
+    """
+
+    def __init__(self, initial=0.0, alpha=0.2, window=64, max_delay=5.0):
+        self.estimate = initial
+        self.alpha = alpha
+        self.max_delay = max_delay
+        self.recent = deque(maxlen=window)
+        self.samples = 0
+
+    def update(self, delay):
+        if not 0 <= delay <= self.max_delay:
+            return self.estimate
+        if self.samples == 0:
+            self.estimate = delay
+        else:
+            self.estimate += self.alpha * (delay - self.estimate)
+        self.recent.append(delay)
+        self.samples += 1
+        return self.estimate
+
+    def percentile(self, q):
+        if not self.recent:
+            return self.estimate
+        return float(np.percentile(self.recent, q))
+
+
+class TelemetryHistory:
+    """Recent ``(t, yaw, vx, vy, height)`` samples, oldest first."""
+
+    def __init__(self, maxlen=64):
+        self.samples = deque(maxlen=maxlen)
+
+    def add(self, t, yaw, vx=0.0, vy=0.0, height=None):
+        if self.samples and t < self.samples[-1][0]:
+            return
+        if self.samples and height is None:
+            height = self.samples[-1][4]
+        self.samples.append((t, float(yaw), float(vx), float(vy), height))
+
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+    def _unwrapped(self):
+        """Sample times and yaw with the ±180° wrap removed."""
+        times = [s[0] for s in self.samples]
+        yaws = np.degrees(np.unwrap(np.radians([s[1] for s in self.samples])))
+        return times, yaws
+
+    def yaw_at(self, t):
+        """Linearly interpolated yaw at ``t``, relative to the unwrapped track."""
+        times, yaws = self._unwrapped()
+        return float(np.interp(t, times, yaws))
+
+    def yaw_rate(self, window=0.5):
+        """Average yaw rate in deg/s over the last ``window`` seconds."""
+        if len(self.samples) < 2:
+            return 0.0
+        times, yaws = self._unwrapped()
+        start = bisect.bisect_left(times, times[-1] - window)
+        start = min(start, len(times) - 2)
+        dt = times[-1] - times[start]
+        return float((yaws[-1] - yaws[start]) / dt) if dt > 0 else 0.0
+
+    def lateral_shift(self, start, end):
+        """Sideways travel in cm between ``start`` and ``end`` from ``vy`` samples.
+
+        The last known velocity is held beyond the newest sample.
+        """
+        if not self.samples or end <= start:
+            return 0.0
+        shift = 0.0
+        samples = list(self.samples)
+        for i, (t, _, _, vy, _) in enumerate(samples):
+            t_next = samples[i + 1][0] if i + 1 < len(samples) else math.inf
+            lo, hi = max(start, t), min(end, t_next)
+            if i == 0:
+                lo = start
+            if hi > lo:
+                shift += vy * (hi - lo)
+        return shift
+
+
+def speed_scale_for(drone):
+    """``speed_scale`` for ``drone``'s speed telemetry.
+
+    Handles that report cm/s declare ``speed_scale = 1.0``; anything else is
+    taken to be a Tello reporting dm/s.
+    """
+    return getattr(drone, "speed_scale", TELLO_SPEED_SCALE)
+
+
+class LatencyCompensator:
+    """Predicts a target's horizontal image offset at command time.
+
+    Yaw to the right and sideways travel to the right both move a fixed target
+    left in the image. Yaw is converted with the camera focal length; sideways
+    travel with the focal length over the range to the floor at the image
+    centre, which assumes the target lies on the floor near the optical axis.
+    Forward travel is ignored.
+
+    ``vy`` telemetry is taken as rightward speed in cm/s. The real Tello
+    reports speeds in dm/s, so pass ``speed_scale=10`` for it
+    (``speed_scale_for`` picks the scale for a drone handle).
+    """
+
+    def __init__(self, hfov=70.0, frame_width=960, camera_pitch=25.0, command_delay=0.05,
+                 speed_scale=1.0, clock=time.monotonic, history=64):
+        self.hfov = hfov
+        self.frame_width = frame_width
+        self.camera_pitch = camera_pitch
+        self.speed_scale = speed_scale
+        self.clock = clock
+        self.telemetry = TelemetryHistory(history)
+        # Capture to decision, measured every tick, and decision to effect.
+        self.pipeline = DelayEstimator()
+        self.command = DelayEstimator(initial=command_delay)
+        self.enabled = True
+
+    def focal_px(self, width=None):
+        width = width or self.frame_width
+        return (width / 2) / math.tan(math.radians(self.hfov / 2))
+
+    def px_per_cm(self, height, width=None):
+        """Image shift per cm of sideways travel for a floor point at the image centre."""
+        pitch = math.radians(self.camera_pitch)
+        if pitch <= 0 or not height:
+            distance = 150.0
+        else:
+            distance = max(float(height), 10.0) / math.sin(pitch)
+        return self.focal_px(width) / distance
+
+    def record_telemetry(self, yaw, vx=0.0, vy=0.0, height=None, t=None):
+        t = self.clock() if t is None else t
+        self.telemetry.add(t, yaw, vx * self.speed_scale, vy * self.speed_scale, height)
+
+    def predict_offset(self, offset_px, width, capture_time, now=None):
+        """Offset ``offset_px`` (image width ``width``) predicted to command time."""
+        now = self.clock() if now is None else now
+        if capture_time is not None and not 0 <= now - capture_time <= self.pipeline.max_delay:
+            # Timestamp from another clock; use the running estimate instead
+            capture_time = None
+        if capture_time is not None:
+            self.pipeline.update(now - capture_time)
+        latest = self.telemetry.latest()
+        if not self.enabled or latest is None:
+            return offset_px
+
+        start = now - self.pipeline.estimate if capture_time is None else min(capture_time, now)
+        end = now + self.command.estimate
+        t_latest = latest[0]
+
+        # Yaw already turned since capture, plus the current rate extrapolated on.
+        if t_latest > start:
+            turned = self.telemetry.yaw_at(t_latest) - self.telemetry.yaw_at(start)
+            turned += self.telemetry.yaw_rate() * (end - t_latest)
+        else:
+            turned = self.telemetry.yaw_rate() * (end - start)
+
+        shift = math.radians(turned) * self.focal_px(width)
+        shift += self.telemetry.lateral_shift(start, end) * self.px_per_cm(latest[4], width)
+        return offset_px - shift
+
+
+def _replay_events(replay):
+    frames = [e for e in replay["events"] if e["type"] == "frame"]
+    telemetry = [e for e in replay["events"] if e["type"] == "telemetry"]
+    return frames, telemetry
+
+
+def evaluate_replay(replay, compensator=None, tolerance=0.06):
+    """Score raw vs. predicted offsets on a recorded replay.
+
+    For every frame with an offset, the truth is the offset observed in the
+    frame captured closest to when its command would take effect
+    (``decision_t`` plus the command delay), if one lies within ``tolerance``
+    seconds. Telemetry is fed to the compensator in time order and only up to
+    each decision, as it would be live.
+    """
+    meta = replay.get("meta", {})
+    if compensator is None:
+        compensator = LatencyCompensator(
+            hfov=meta.get("hfov", 70.0), frame_width=meta.get("width", 960),
+            camera_pitch=meta.get("camera_pitch", 25.0),
+            command_delay=meta.get("command_delay", 0.05))
+    frames, telemetry = _replay_events(replay)
+    observed = [f for f in frames if f.get("offset") is not None]
+    captures = [f["t"] for f in observed]
+
+    raw_errors, predicted_errors = [], []
+    next_sample = 0
+    for frame in observed:
+        decision = frame["decision_t"]
+        while next_sample < len(telemetry) and telemetry[next_sample]["t"] <= decision:
+            s = telemetry[next_sample]
+            compensator.record_telemetry(s["yaw"], s.get("vx", 0.0), s.get("vy", 0.0),
+                                         s.get("height"), t=s["t"])
+            next_sample += 1
+        predicted = compensator.predict_offset(frame["offset"], frame["width"], frame["t"], now=decision)
+
+        target = decision + compensator.command.estimate
+        i = bisect.bisect_left(captures, target)
+        nearest = min((j for j in (i - 1, i) if 0 <= j < len(observed)),
+                      key=lambda j: abs(captures[j] - target), default=None)
+        if nearest is None or abs(captures[nearest] - target) > tolerance:
+            continue
+        truth = observed[nearest]["offset"]
+        raw_errors.append(abs(frame["offset"] - truth))
+        predicted_errors.append(abs(predicted - truth))
+
+    def summary(errors):
+        if not errors:
+            return {"mean_px": None, "p95_px": None}
+        return {"mean_px": round(float(np.mean(errors)), 2),
+                "p95_px": round(float(np.percentile(errors, 95)), 2)}
+
+    return {
+        "pairs": len(raw_errors),
+        "raw": summary(raw_errors),
+        "compensated": summary(predicted_errors),
+        "pipeline_delay_s": round(compensator.pipeline.estimate, 4),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure latency compensation on replay data.")
+    parser.add_argument("--record", metavar="PATH", help="record a simulated replay to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="evaluate a recorded replay")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--inference-time", type=float, default=0.25)
+    parser.add_argument("--command-delay", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.record:
+        from simulation import record_replay
+        replay = record_replay(duration=args.duration, inference_time=args.inference_time,
+                               command_delay=args.command_delay, seed=args.seed)
+        with open(args.record, "w", encoding="utf-8") as f:
+            json.dump(replay, f)
+        print(f"Recorded {len(replay['events'])} events to {args.record}")
+        replay_path = args.replay or args.record
+    else:
+        replay_path = args.replay
+    if not replay_path:
+        parser.error("give --record and/or --replay")
+
+    with open(replay_path, encoding="utf-8") as f:
+        replay = json.load(f)
+    result = evaluate_replay(replay)
+    print(f"{result['pairs']} decisions, pipeline delay {result['pipeline_delay_s'] * 1000:.0f} ms")
+    for name in ("raw", "compensated"):
+        r = result[name]
+        print(f"{name:<12} mean error {r['mean_px']} px   p95 {r['p95_px']} px")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# File: live_stream.py
+"""
+Optional HTTP live view of the three video panes and the telemetry.
+
+``LiveStream`` serves, on a plain stdlib HTTP server:
+
+    /                          a page showing all three views
+    /stream/<view>.mjpg?fps=5  MJPEG stream of ``realtime``, ``segmentation`` or ``detection``
+    /snapshot/<view>.jpg       the latest JPEG of a view
+    /telemetry                 latest telemetry, view ages and client counts as JSON
+
+``publish`` only hands the frame to a small encoder pool, so the GUI and the
+control loop never wait on JPEG encoding or on a viewer. Each frame is encoded
+once and the bytes are shared by every client. Each client is paced by its own
+frame-rate cap and always gets the newest frame, skipping any it was too slow
+for.
+
+By default it binds to 127.0.0.1; pass ``host="0.0.0.0"`` to let other
+machines on the network watch.
+"""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import cv2
+
+VIEWS = ("realtime", "segmentation", "detection")
+BOUNDARY = "frame"
+
+INDEX_HTML = """<!doctype html>
+<html><head><title>Drone live view</title>
+<style>body{background:#121212;color:#eee;font-family:sans-serif}img{width:32%;margin:2px}</style>
+</head><body><h3>Drone live view</h3>
+<img src="/stream/realtime.mjpg"><img src="/stream/segmentation.mjpg"><img src="/stream/detection.mjpg">
+<pre id="t"></pre>
+<script>setInterval(()=>fetch('/telemetry').then(r=>r.json()).then(j=>{
+document.getElementById('t').textContent=JSON.stringify(j,null,1)}),1000)</script>
+</body></html>
+"""
+
+
+class _ViewSlot:
+    """Latest encoded JPEG of one view plus what is waiting to be encoded."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.jpeg = None
+        self.seq = 0
+        self.timestamp = None
+        self.pending = None
+        self.encoding = False
+
+
+class LiveStream:
+    def __init__(self, host="127.0.0.1", port=0, max_fps=15, quality=70, workers=2):
+        self.max_fps = max_fps
+        self.quality = quality
+        self.slots = {view: _ViewSlot() for view in VIEWS}
+        self.telemetry = {}
+        self._telemetry_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jpeg")
+        self._running = False
+        self._thread = None
+
+        self.frames_published = 0
+        self.frames_encoded = 0
+        self.clients = 0
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self._stats_lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), _StreamHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stream = self
+
+    @property
+    def address(self):
+        return self.httpd.server_address[:2]
+
+    def url(self, path="/"):
+        host, port = self.address
+        return f"http://{host}:{port}{path}"
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="live-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        for slot in self.slots.values():
+            with slot.condition:
+                slot.condition.notify_all()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._pool.shutdown(wait=True)
+
+    # Publishing side: called from the GUI thread, never blocks on encoding
+
+    def publish(self, view, frame, rgb=True):
+        """Queue ``frame`` for encoding; a frame still waiting is replaced."""
+        slot = self.slots[view]
+        with slot.condition:
+            self.frames_published += 1
+            slot.pending = (frame, rgb)
+            if slot.encoding:
+                return
+            slot.encoding = True
+        try:
+            self._pool.submit(self._encode, slot)
+        except RuntimeError:
+            # Pool already shut down
+            slot.encoding = False
+
+    def _encode(self, slot):
+        while True:
+            with slot.condition:
+                pending, slot.pending = slot.pending, None
+                if pending is None:
+                    slot.encoding = False
+                    return
+            frame, rgb = pending
+            image = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR) if rgb else frame
+            ok, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                continue
+            with slot.condition:
+                slot.jpeg = buffer.tobytes()
+                slot.seq += 1
+                slot.timestamp = time.time()
+                self.frames_encoded += 1
+                slot.condition.notify_all()
+
+    def publish_telemetry(self, data):
+        with self._telemetry_lock:
+            self.telemetry.update(data)
+            self.telemetry["updated"] = time.time()
+
+    # Serving side
+
+    def status(self):
+        now = time.time()
+        with self._telemetry_lock:
+            telemetry = dict(self.telemetry)
+        return {
+            "telemetry": telemetry,
+            "views": {view: {"seq": slot.seq,
+                             "age_s": round(now - slot.timestamp, 3) if slot.timestamp else None}
+                      for view, slot in self.slots.items()},
+            "clients": self.clients,
+            "frames_published": self.frames_published,
+            "frames_encoded": self.frames_encoded,
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+        }
+
+    def next_frame(self, view, after_seq, timeout=1.0):
+        """``(seq, jpeg)`` newer than ``after_seq``, or ``None`` on timeout/stop."""
+        slot = self.slots[view]
+        with slot.condition:
+            slot.condition.wait_for(lambda: slot.seq > after_seq or not self._running, timeout)
+            if slot.seq > after_seq and self._running:
+                return slot.seq, slot.jpeg
+        return None
+
+    def _count(self, clients=0, sent=0, skipped=0):
+        with self._stats_lock:
+            self.clients += clients
+            self.frames_sent += sent
+            self.frames_skipped += skipped
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _view(self, name, suffix):
+        if not name.endswith(suffix):
+            return None
+        view = name[:-len(suffix)]
+        return view if view in VIEWS else None
+
+    def do_GET(self):
+        stream = self.server.stream
+        url = urlparse(self.path)
+        parts = url.path.strip("/").split("/")
+
+        if url.path == "/":
+            self._send(200, "text/html; charset=utf-8", INDEX_HTML.encode())
+        elif url.path == "/telemetry":
+            self._send(200, "application/json", json.dumps(stream.status(), default=str).encode())
+        elif len(parts) == 2 and parts[0] == "snapshot" and self._view(parts[1], ".jpg"):
+            jpeg = stream.slots[self._view(parts[1], ".jpg")].jpeg
+            if jpeg is None:
+                self._send(404, "text/plain", b"no frame yet")
+            else:
+                self._send(200, "image/jpeg", jpeg)
+        elif len(parts) == 2 and parts[0] == "stream" and self._view(parts[1], ".mjpg"):
+            fps = parse_qs(url.query).get("fps", [stream.max_fps])[0]
+            try:
+                fps = min(float(fps), stream.max_fps)
+            except ValueError:
+                fps = stream.max_fps
+            self._stream(stream, self._view(parts[1], ".mjpg"), max(fps, 0.1))
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def _stream(self, stream, view, fps):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        stream._count(clients=1)
+        interval = 1.0 / fps
+        last_seq = 0
+        next_due = time.monotonic()
+        try:
+            while stream._running:
+                delay = next_due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                # Always the newest frame; anything published meanwhile is skipped
+                latest = stream.next_frame(view, last_seq)
+                if latest is None:
+                    continue
+                seq, jpeg = latest
+                skipped = seq - last_seq - 1 if last_seq else 0
+                last_seq = seq
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode())
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+                stream._count(sent=1, skipped=skipped)
+                next_due = max(next_due + interval, time.monotonic())
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            stream._count(clients=-1)
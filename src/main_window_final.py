@@ -1,12 +1,67 @@
 # File: main_window.py
 from PySide6.QtWidgets import QApplication, QMainWindow, QLabel, QVBoxLayout, QWidget, QHBoxLayout, QPushButton, QStatusBar, QFrame, QSpacerItem, QSizePolicy
 from PySide6.QtGui import QImage, QPixmap, QFont, QKeySequence, QShortcut
-from PySide6.QtCore import Qt, QThread
-import sys, cv2
+from PySide6.QtCore import Qt, QThread, QObject, QTimer, Signal
+import sys, time, cv2
 
-from yolov5.recent_work_3.drone_worker import DroneWorker
+from drone_worker import DroneWorker
 from camera_thread import CameraThread
 from processing_threads import SegmentationThread, DetectionThread
+from command_stats import format_summary
+from telemetry_plot import TelemetryPanel
+
+def frame_to_pixmap(frame, size):
+    """Convert a frame to a QPixmap scaled to fit ``size``."""
+    rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    h, w, ch = rgb_image.shape
+    bytes_per_line = ch * w
+    qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
+    pixmap = QPixmap.fromImage(qt_image)
+    return pixmap.scaled(size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+class StatusThrottle(QObject):
+    """Shows at most one status message per ``interval_ms``; the latest one wins.
+
+    Repeats of the message on screen are ignored, so per-frame updates do not
+    redraw the status bar at all.
+    """
+
+    def __init__(self, status_bar, interval_ms=250, parent=None):
+        super().__init__(parent)
+        self.status_bar = status_bar
+        self.interval_ms = interval_ms
+        self.shown = 0
+        self.dropped = 0
+        self._pending = None
+        self._current = None
+        self._last_shown = float("-inf")
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def show(self, message):
+        if message == self._current and self._pending is None:
+            return
+        wait_ms = self.interval_ms - (time.monotonic() - self._last_shown) * 1000
+        if wait_ms <= 0 and not self._timer.isActive():
+            self._show(message)
+            return
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = message
+        if not self._timer.isActive():
+            self._timer.start(max(0, int(wait_ms)))
+
+    def flush(self):
+        if self._pending is not None:
+            message, self._pending = self._pending, None
+            self._show(message)
+
+    def _show(self, message):
+        self.status_bar.showMessage(message)
+        self._current = message
+        self._last_shown = time.monotonic()
+        self.shown += 1
 
 class VideoDisplay(QLabel):
     def __init__(self, title):
@@ -32,18 +87,19 @@ class VideoDisplay(QLabel):
         return self.wrapper_widget
 
     def update_frame(self, frame):
-        rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, ch = rgb_image.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(qt_image)
-        self.setPixmap(pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        self.setPixmap(frame_to_pixmap(frame, self.size()))
 
 class DroneGUI(QMainWindow):
-    def __init__(self):
+    # Queued to the worker thread when a persistent session finishes a mission
+    rearm_requested = Signal()
+
+    def __init__(self, worker=None, stream=None, persistent=False):
         super().__init__()
+        # Keep models, connection, stream and threads between missions
+        # instead of quitting when one finishes
+        self.persistent = persistent
         self.setWindowTitle("Autonomous Drone Navigation")
-        self.setGeometry(100, 100, 1200, 750)
+        self.setGeometry(100, 100, 1200, 960)
 
         layout = QVBoxLayout()
 
@@ -63,6 +119,18 @@ class DroneGUI(QMainWindow):
 
         status_header_layout.addStretch()
 
+        # Share of mission time spent waiting on drone commands; table on hover
+        self.command_label = QLabel("Commands: --")
+        self.command_label.setFixedHeight(30)
+        self.command_label.setStyleSheet("""
+            background-color: #37474f;
+            color: white;
+            padding: 4px 12px;
+            font-weight: bold;
+            border-radius: 8px;
+        """)
+        status_header_layout.addWidget(self.command_label)
+
         self.battery_label = QLabel("Battery: --%")
         self.battery_label.setFixedHeight(30)
         self.battery_label.setStyleSheet("""
@@ -88,6 +156,11 @@ class DroneGUI(QMainWindow):
         video_layout.addWidget(self.detection_view.get_widget())
         layout.addLayout(video_layout)
 
+        # Altitude, battery, yaw, latencies and tick period over the last few minutes
+        self.telemetry_panel = TelemetryPanel(window_s=300)
+        self.telemetry_panel.setFixedHeight(250)
+        layout.addWidget(self.telemetry_panel)
+
         layout.addSpacerItem(QSpacerItem(0, 30, QSizePolicy.Minimum, QSizePolicy.Expanding))
 
         # Flight Controls
@@ -138,20 +211,33 @@ class DroneGUI(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
-        self.worker = DroneWorker()
+        self.status = StatusThrottle(self.statusBar(), parent=self)
+
+        self.worker = worker or DroneWorker()
         self.worker_thread = QThread()
         self.worker.moveToThread(self.worker_thread)
 
         self.worker_thread.started.connect(self.worker.run)
-        self.worker.signals.status_message.connect(lambda msg: self.statusBar().showMessage(msg))
+        self.worker.signals.status_message.connect(self.status.show)
         self.worker.signals.mission_started.connect(self.on_mission_started)
         self.worker.signals.mission_finished.connect(self.on_mission_finished)
         self.worker.signals.telemetry_updated.connect(self.update_telemetry)
+        self.worker.signals.telemetry_updated.connect(self.telemetry_panel.add_sample)
+        self.worker.signals.command_stats.connect(self.update_command_stats)
+        self.worker.signals.session_ready.connect(self.on_session_ready)
+        self.rearm_requested.connect(self.worker.rearm)
+
+        # Optional live_stream.LiveStream mirroring the views over HTTP
+        self.stream = stream
+        if self.stream:
+            self.worker.signals.telemetry_updated.connect(self.stream.publish_telemetry)
+            self.worker.signals.state_changed.connect(
+                lambda record: self.stream.publish_telemetry({"state": record["to"]}))
 
         self.takeoff_btn.clicked.connect(self.worker.start_drone_mission)
-        self.land_btn.clicked.connect(self.worker.land_drone)
-
-        QShortcut(QKeySequence("Esc"), self, self.worker.emergency_land)
+        # Straight to the safety lane from this thread, never queued behind a tick
+        self.land_btn.clicked.connect(lambda: self.worker.safety.trigger("land", "Land button"))
+        QShortcut(QKeySequence("Esc"), self, lambda: self.worker.safety.trigger("emergency", "Esc key"))
 
         self.camera_thread = None
         self.segmentation_thread = None
@@ -180,18 +266,25 @@ class DroneGUI(QMainWindow):
             self.detection_thread = None
 
         # (Re)start threads
-        self.camera_thread = CameraThread(drone)
+        self.camera_thread = CameraThread(drone, trace=self.worker.frame_trace)
         self.camera_thread.frame_captured.connect(self.on_new_frame)
         self.camera_thread.start()
 
-        self.segmentation_thread = SegmentationThread(path_model)
+        self.segmentation_thread = SegmentationThread(path_model, rate=self.worker.rate_control)
         self.segmentation_thread.segmentation_result.connect(self.segmentation_view.update_frame)
         self.segmentation_thread.start()
 
-        self.detection_thread = DetectionThread(pad_model)
+        self.detection_thread = DetectionThread(pad_model, rate=self.worker.rate_control)
         self.detection_thread.detection_result.connect(self.detection_view.update_frame)
         self.detection_thread.start()
 
+        if self.stream:
+            self.camera_thread.frame_captured.connect(lambda frame: self.stream.publish("realtime", frame))
+            self.segmentation_thread.segmentation_result.connect(
+                lambda frame: self.stream.publish("segmentation", frame))
+            self.detection_thread.detection_result.connect(
+                lambda frame: self.stream.publish("detection", frame))
+
     def update_telemetry(self, data):
         battery = data.get("battery", "--")
         status = data.get("status", "--")
@@ -215,9 +308,19 @@ class DroneGUI(QMainWindow):
         """)
         self.battery_label.setText(f"Battery: {battery}%")
 
+    def update_command_stats(self, summary):
+        commands = summary.get("commands") or {}
+        if not commands:
+            return
+        name, busiest = next(iter(commands.items()))
+        fraction = summary.get("wait_fraction")
+        waiting = f"{fraction:.0%} waiting" if fraction is not None else "waiting"
+        self.command_label.setText(f"Commands: {waiting} · {name} p95 {busiest['p95_ms']:.0f} ms")
+        self.command_label.setToolTip(f"<pre>{format_summary(summary)}</pre>")
+
     def on_mission_started(self):
         self._start_processing_threads()
-        self.statusBar().showMessage("Mission started. Threads running.")
+        self.status.show("Mission started. Threads running.")
 
     def on_new_frame(self, frame):
         self.realtime_view.update_frame(frame)
@@ -225,7 +328,7 @@ class DroneGUI(QMainWindow):
         if self.worker.is_segmentation_active():
             self.segmentation_thread.resume()
             self.segmentation_thread.set_frame(frame)
-            self.statusBar().showMessage("Segmentation mode active. Processing frame...")
+            self.status.show("Segmentation mode active. Processing frame...")
         else:
             self.segmentation_thread.pause()
             self.segmentation_view.clear()
@@ -233,13 +336,21 @@ class DroneGUI(QMainWindow):
         if self.worker.is_pad_mode_active():
             self.detection_thread.resume()
             self.detection_thread.set_frame(frame)
-            self.statusBar().showMessage("Pad detection mode active. Detecting landing pad...")
+            self.status.show("Pad detection mode active. Detecting landing pad...")
         else:
             self.detection_thread.pause()
             self.detection_view.clear()
 
+    def on_session_ready(self, record):
+        if record["mode"] != "cold":
+            self.status.show(f"Ready for the next mission in {record['seconds']:.1f}s. "
+                             "Swap the battery if needed and press Takeoff.")
+
     def on_mission_finished(self):
-        self.statusBar().showMessage("Mission finished. Stopping threads...")
+        if self.persistent:
+            self._rearm()
+            return
+        self.status.show("Mission finished. Stopping threads...")
         # Stop camera thread gracefully
         if self.camera_thread:
             self.camera_thread.stop()
@@ -261,6 +372,16 @@ class DroneGUI(QMainWindow):
         self.detection_view.clear()
 
         # Reset battery label and status bar
+        self._reset_battery_label()
+        self.status.show("Ready for a new mission.")
+
+        # Restart processing threads for new mission
+        self._start_processing_threads()
+        
+        # Close the application
+        QApplication.instance().quit()
+
+    def _reset_battery_label(self):
         self.battery_label.setStyleSheet(""" 
             background-color: #616161; 
             color: white; 
@@ -269,13 +390,21 @@ class DroneGUI(QMainWindow):
             border-radius: 8px; 
         """)
         self.battery_label.setText("Battery: --%")
-        self.statusBar().showMessage("Ready for a new mission.")
 
-        # Restart processing threads for new mission
-        self._start_processing_threads()
-        
-        # Close the application
-        QApplication.instance().quit()
+    def _rearm(self):
+        """Persistent session: idle the pipeline and reset only the mission.
+
+        The camera thread keeps showing the live feed. If the drone never
+        connected, the worker tries again and restarts the threads itself.
+        """
+        for thread in (self.segmentation_thread, self.detection_thread):
+            if thread:
+                thread.pause()
+        self.segmentation_view.clear()
+        self.detection_view.clear()
+        self._reset_battery_label()
+        self.status.show("Mission finished. Re-arming...")
+        self.rearm_requested.emit()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,92 @@
+# File: mission_state.py
+"""
+Mission states and the state machine that drives ``DroneWorker``.
+
+Each ``MissionState`` declares how often it ticks and which models it needs,
+so the worker's scheduler only runs the inference the active phase uses.
+``MissionStateMachine`` enforces the allowed transitions and keeps a timed
+record of every one.
+"""
+import time
+from collections import deque
+
+
+class MissionState:
+    """A mission phase, its control tick period and the models it runs."""
+
+    def __init__(self, name, tick_ms, models=()):
+        self.name = name
+        self.tick_ms = tick_ms
+        self.models = frozenset(models)
+
+    def needs(self, model):
+        return model in self.models
+
+    def __repr__(self):
+        return f"MissionState({self.name!r})"
+
+
+IDLE = MissionState("idle", 0)
+# Follow the path, checking every frame for a pad to switch to.
+PATH_FOLLOW = MissionState("path_follow", 700, models=("path", "pad"))
+# Path lost: rotate to look for it, still watching for a pad.
+PATH_RECOVERY = MissionState("path_recovery", 500, models=("path", "pad"))
+# Pad in view: align with it and approach.
+PAD_ALIGN = MissionState("pad_align", 300, models=("pad",))
+# Tello's downward mission-pad search; no model needed, the period leaves
+# time for the drone to settle and detect the pad after each rotation.
+PAD_SEARCH = MissionState("pad_search", 3000)
+FINISHED = MissionState("finished", 0)
+
+STATES = (IDLE, PATH_FOLLOW, PATH_RECOVERY, PAD_ALIGN, PAD_SEARCH, FINISHED)
+
+# FINISHED is reachable from every state (landing, emergency, stop).
+TRANSITIONS = {
+    IDLE: {PATH_FOLLOW},
+    PATH_FOLLOW: {PAD_ALIGN, PATH_RECOVERY, PAD_SEARCH},
+    PATH_RECOVERY: {PATH_FOLLOW, PAD_ALIGN, PAD_SEARCH},
+    PAD_ALIGN: {PAD_SEARCH},
+    PAD_SEARCH: set(),
+    FINISHED: {PATH_FOLLOW},
+}
+
+
+class InvalidTransition(ValueError):
+    """Raised for a transition the mission graph does not allow."""
+
+
+class MissionStateMachine:
+    """Current mission state plus a bounded, timed transition history."""
+
+    def __init__(self, initial=IDLE, transitions=None, clock=time.monotonic, history=256):
+        self.transitions = TRANSITIONS if transitions is None else transitions
+        self.clock = clock
+        self.state = initial
+        self.entered_at = clock()
+        self.history = deque(maxlen=history)
+        self.listeners = []
+
+    def time_in_state(self):
+        return self.clock() - self.entered_at
+
+    def can_transition(self, new_state):
+        return new_state is FINISHED or new_state in self.transitions.get(self.state, ())
+
+    def transition(self, new_state, reason=""):
+        """Enter ``new_state`` and return the transition record."""
+        if not self.can_transition(new_state):
+            raise InvalidTransition(f"{self.state.name} -> {new_state.name} is not allowed")
+        now = self.clock()
+        record = {
+            "from": self.state.name,
+            "to": new_state.name,
+            "reason": reason,
+            "time": now,
+            "duration_s": now - self.entered_at,
+        }
+        self.state = new_state
+        self.entered_at = now
+        self.history.append(record)
+        for listener in self.listeners:
+            listener(record)
+        return record
@@ -0,0 +1,183 @@
+# File: packed_mask.py
+"""
+Bit-packed segmentation masks cropped to their bounding box.
+
+The segmentation model hands back each path mask as float32, four bytes a
+pixel, although every pixel is either on or off. ``PackedMask`` keeps the
+mask's bounding box and one bit per pixel inside it (``np.packbits``, one row
+of bytes per mask row). A 640x480 float mask of 1.2 MB becomes a few kB.
+
+Area, bounding box, centroid and spatial moments are read straight off the
+packed bytes through 256-entry lookup tables, so nothing is unpacked or
+converted to uint8 on the way to a steering decision. ``to_bytes`` is a
+12-byte header plus the packed rows, and pickling uses it, so a mask crosses
+a process boundary or lands in a recording at that size:
+
+    mask = PackedMask.from_array(results[0].masks.data.cpu().numpy()[0])
+    mask.centroid()                      # (cX, cY) or None, as mask_centroid
+    PackedMask.from_bytes(mask.to_bytes()) == mask
+"""
+import struct
+
+import cv2
+import numpy as np
+
+# Height, width, then the bounding box x0, y0, x1, y1 (exclusive)
+_HEADER = struct.Struct("<6H")
+
+# Per byte value: pixels set, and the sum of their offsets and squared offsets
+# within the byte (most significant bit first, as np.packbits packs them).
+# All fit in a uint8, which keeps the looked-up arrays small.
+_BITS = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).astype(np.int64)
+_COUNT = _BITS.sum(axis=1).astype(np.uint8)
+_SUM_X = (_BITS @ np.arange(8)).astype(np.uint8)
+_SUM_X2 = (_BITS @ np.arange(8) ** 2).astype(np.uint8)
+
+
+class PackedMask:
+    """A binary mask as packed bits inside its bounding box."""
+
+    def __init__(self, shape, bbox, bits):
+        self.shape = tuple(int(n) for n in shape)
+        # (x0, y0, x1, y1) with exclusive ends; None for an empty mask
+        self.bbox = bbox
+        self.bits = bits
+
+    @classmethod
+    def from_array(cls, mask, threshold=0.5):
+        """Pack a float, uint8 or bool mask; pixels above ``threshold`` are on."""
+        mask = np.asarray(mask)
+        on = mask if mask.dtype == bool else mask > threshold
+        rows = np.flatnonzero(on.any(axis=1))
+        if rows.size == 0:
+            return cls(on.shape, None, np.zeros((0, 0), dtype=np.uint8))
+        y0, y1 = int(rows[0]), int(rows[-1]) + 1
+        columns = np.flatnonzero(on[y0:y1].any(axis=0))
+        x0, x1 = int(columns[0]), int(columns[-1]) + 1
+        return cls(on.shape, (x0, y0, x1, y1), np.packbits(on[y0:y1, x0:x1], axis=1))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a mask from ``to_bytes`` output."""
+        height, width, x0, y0, x1, y1 = _HEADER.unpack_from(data)
+        if x1 == 0:
+            return cls((height, width), None, np.zeros((0, 0), dtype=np.uint8))
+        bits = np.frombuffer(data, dtype=np.uint8, offset=_HEADER.size).reshape(y1 - y0, (x1 - x0 + 7) // 8)
+        return cls((height, width), (x0, y0, x1, y1), bits)
+
+    def to_bytes(self):
+        x0, y0, x1, y1 = self.bbox or (0, 0, 0, 0)
+        return _HEADER.pack(*self.shape, x0, y0, x1, y1) + self.bits.tobytes()
+
+    def __reduce__(self):
+        return PackedMask.from_bytes, (self.to_bytes(),)
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedMask):
+            return NotImplemented
+        return self.shape == other.shape and self.bbox == other.bbox and np.array_equal(self.bits, other.bits)
+
+    @property
+    def nbytes(self):
+        """Serialised size in bytes."""
+        return _HEADER.size + self.bits.nbytes
+
+    @property
+    def area(self):
+        return int(_COUNT[self.bits].sum(dtype=np.int64))
+
+    def moments(self):
+        """Spatial moments m00 to m02 of the binary mask, as ``cv2.moments(mask, binaryImage=True)``.
+
+        Central moments mu20, mu11 and mu02 are included when the mask is not
+        empty.
+        """
+        if self.bbox is None:
+            return {"m00": 0.0, "m10": 0.0, "m01": 0.0, "m20": 0.0, "m11": 0.0, "m02": 0.0}
+        m = self._moments(second_order=True)
+        cx, cy = m["m10"] / m["m00"], m["m01"] / m["m00"]
+        m["mu20"] = m["m20"] - cx * m["m10"]
+        m["mu11"] = m["m11"] - cx * m["m01"]
+        m["mu02"] = m["m02"] - cy * m["m01"]
+        return m
+
+    def _moments(self, second_order):
+        x0, y0, x1, y1 = self.bbox
+        count, sum_x = _COUNT[self.bits], _SUM_X[self.bits]
+        # x of each byte's first pixel, and y of each row
+        base = x0 + 8 * np.arange(self.bits.shape[1])
+        ys = np.arange(y0, y1)
+        rows = count.sum(axis=1, dtype=np.int64)
+        columns = count.sum(axis=0, dtype=np.int64)
+        offsets = sum_x.sum(axis=0, dtype=np.int64)
+        m = {"m00": rows.sum(), "m10": columns @ base + offsets.sum(), "m01": rows @ ys}
+        if second_order:
+            row_x = count @ base + sum_x.sum(axis=1, dtype=np.int64)
+            m["m20"] = columns @ base ** 2 + 2 * (offsets @ base) + _SUM_X2[self.bits].sum(dtype=np.int64)
+            m["m11"] = row_x @ ys
+            m["m02"] = rows @ ys ** 2
+        return {key: float(value) for key, value in m.items()}
+
+    def centroid(self, size=None):
+        """``(cX, cY)`` as ``path_geometry.mask_centroid`` gives it, or ``None`` if empty.
+
+        With ``size`` (``(width, height)``), in the coordinates of the mask
+        resized to that size.
+        """
+        if self.bbox is None:
+            return None
+        m = self._moments(second_order=False)
+        cx, cy = m["m10"] / m["m00"], m["m01"] / m["m00"]
+        if size is not None:
+            height, width = self.shape
+            cx = (cx + 0.5) * size[0] / width - 0.5
+            cy = (cy + 0.5) * size[1] / height - 0.5
+        return int(cx), int(cy)
+
+    def to_array(self, size=None, value=255):
+        """A uint8 image with the mask at ``value``, optionally resized to ``size`` (``(width, height)``).
+
+        Resizing interpolates linearly, as ``cv2.resize`` of the full mask
+        would, but only over the bounding box.
+        """
+        height, width = self.shape
+        out_w, out_h = size or (width, height)
+        out = np.zeros((out_h, out_w), dtype=np.uint8)
+        if self.bbox is None:
+            return out
+        x0, y0, x1, y1 = self.bbox
+        crop = np.unpackbits(self.bits, axis=1, count=x1 - x0) * np.uint8(value)
+        if size is None:
+            out[y0:y1, x0:x1] = crop
+            return out
+        # Pad with a pixel of background so edges blend as in a full resize,
+        # which replicates the pixels along the image border instead
+        crop = np.pad(crop, 1)
+        if x0 == 0:
+            crop[:, 0] = crop[:, 1]
+        if x1 == width:
+            crop[:, -1] = crop[:, -2]
+        if y0 == 0:
+            crop[0] = crop[1]
+        if y1 == height:
+            crop[-1] = crop[-2]
+        sx, sy = out_w / width, out_h / height
+        left, top = int(round((x0 - 1) * sx)), int(round((y0 - 1) * sy))
+        right, bottom = int(round((x1 + 1) * sx)), int(round((y1 + 1) * sy))
+        # cv2.resize's pixel-centre mapping, shifted to the padded box
+        warp = np.float32([[sx, 0, sx * (x0 - 1) + 0.5 * sx - 0.5 - left],
+                           [0, sy, sy * (y0 - 1) + 0.5 * sy - 0.5 - top]])
+        scaled = cv2.warpAffine(crop, warp, (right - left, bottom - top))
+        # Clip the padded box to the output
+        cl, ct = max(0, -left), max(0, -top)
+        cr, cb = min(right, out_w) - left, min(bottom, out_h) - top
+        out[top + ct:top + cb, left + cl:left + cr] = scaled[ct:cb, cl:cr]
+        return out
+
+
+def pack_masks(masks, threshold=0.5):
+    """One ``PackedMask`` per instance of a segmentation result's ``masks`` (or an ``(n, h, w)`` array)."""
+    data = getattr(masks, "data", masks)
+    if hasattr(data, "cpu"):
+        data = data.cpu().numpy()
+    return [PackedMask.from_array(mask, threshold) for mask in data]
@@ -0,0 +1,90 @@
+# File: pad_approach.py
+"""
+Visual-servo approach to the landing pad.
+
+Instead of nudging 5° or 20 cm at a time on the box's x offset alone,
+``PadApproach`` turns the best detection box into a bearing and a range and
+plans one combined ``go_xyz_speed`` move toward the pad per observation.
+Range comes from the box width: the pad's real size is known, so its
+apparent width gives the depth along the optical axis, which the camera
+pitch and altitude turn into a distance over the floor.
+"""
+import math
+
+
+def select_pad_box(boxes):
+    """Highest-confidence ``x1, y1, x2, y2, conf, cls`` box, or ``None``."""
+    if boxes is None or len(boxes) == 0:
+        return None
+    return max(boxes, key=lambda box: box[4])
+
+
+class PadApproach:
+    """Estimates the pad's position from a box and plans approach moves.
+
+    ``pad_size_cm`` is the printed pad's side length. Moves cover
+    ``step_fraction`` of the estimated distance, at most ``max_step_cm``, so
+    far estimates are refined on the way; within ``final_range_cm`` the whole
+    distance is flown and the built-in pad landing takes over.
+    """
+
+    def __init__(self, pad_size_cm=50, hfov=70.0, camera_pitch=25.0, speed=20,
+                 max_step_cm=200, step_fraction=0.8, final_range_cm=150,
+                 min_height=30, max_height=120):
+        self.pad_size_cm = pad_size_cm
+        self.hfov = hfov
+        self.camera_pitch = camera_pitch
+        self.speed = speed
+        self.max_step_cm = max_step_cm
+        self.step_fraction = step_fraction
+        self.final_range_cm = final_range_cm
+        self.min_height = min_height
+        self.max_height = max_height
+
+    def estimate(self, box, frame_width, height_cm, center_x=None):
+        """Pad position relative to the drone from one box.
+
+        ``center_x`` overrides the box centre, e.g. with a latency-compensated
+        one. Returns ``forward_cm``, ``right_cm``, ``range_cm`` and
+        ``bearing_deg``.
+        """
+        x1, _, x2, _ = box[:4]
+        focal = (frame_width / 2) / math.tan(math.radians(self.hfov / 2))
+        pitch = math.radians(self.camera_pitch)
+        height = max(float(height_cm or 0), 0.0)
+
+        # The box is as wide as the pad's near edge, the closest part of it
+        depth = focal * self.pad_size_cm / max(float(x2 - x1), 1.0)
+        near = max((depth - height * math.sin(pitch)) / math.cos(pitch), 0.0)
+        forward = near + self.pad_size_cm / 2
+
+        if center_x is None:
+            center_x = (x1 + x2) / 2
+        center_depth = forward * math.cos(pitch) + height * math.sin(pitch)
+        right = (center_x - frame_width / 2) / focal * center_depth
+        return {
+            "forward_cm": forward,
+            "right_cm": right,
+            "range_cm": math.hypot(forward, right),
+            "bearing_deg": math.degrees(math.atan2(right, forward)),
+        }
+
+    def plan(self, estimate, height_cm):
+        """``((x, y, z), final)`` for ``go_xyz_speed``, or ``None`` if already there.
+
+        Tello's frame is x forward, y left, z up. The height is pulled into
+        ``[min_height, max_height]`` in the same move.
+        """
+        distance = estimate["range_cm"]
+        final = distance <= self.final_range_cm
+        scale = 1.0 if final else min(self.step_fraction, self.max_step_cm / distance)
+
+        height = height_cm or 0
+        z = min(max(height, self.min_height), self.max_height) - height
+        x = int(round(estimate["forward_cm"] * scale))
+        y = int(round(-estimate["right_cm"] * scale))
+        x, y, z = (max(-500, min(500, v)) for v in (x, y, z))
+        if max(abs(x), abs(y), abs(z)) < 20:
+            # Tello rejects moves shorter than 20 cm on every axis
+            return None
+        return (x, y, z), final
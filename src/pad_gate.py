@@ -0,0 +1,184 @@
+# File: pad_gate.py
+"""
+Cheap pad-presence gate in front of the full pad detector.
+
+While following the path, every tick used to run the pad detector at 640 px
+only to learn that no pad is in view. ``PadGate`` runs the same detector at a
+low resolution with a lower confidence threshold first and lets the full pass
+run only when that finds something, plus on every ``force_every``-th gated
+tick so a pad the small pass keeps missing is still picked up.
+
+``evaluate_gate`` measures the gate's recall against the full detector on
+recorded frames (a directory of images, a video, or simulator renders):
+
+    python src/pad_gate.py --model best_pad_new.pt --frames recorded/
+    python src/pad_gate.py --simulated
+"""
+import argparse
+import os
+import sys
+
+
+def _has_pad(results):
+    return bool(results[0].boxes is not None and len(results[0].boxes))
+
+
+class PadGate:
+    """Decides per frame whether the full pad detector needs to run."""
+
+    def __init__(self, imgsz=320, conf=0.2, force_every=4):
+        self.imgsz = imgsz
+        self.conf = conf
+        self.force_every = force_every
+        self.reset()
+
+    def reset(self):
+        self.checks = 0
+        self.positives = 0
+        self.forced = 0
+        self._since_full = 0
+
+    def detect(self, model, frame):
+        """The low-resolution pass: does anything pad-like show up?"""
+        return _has_pad(model.predict(source=frame, task='detect', imgsz=self.imgsz,
+                                      conf=self.conf, verbose=False))
+
+    def check(self, model, frame):
+        """``True`` if the full detector should run on ``frame``."""
+        self.checks += 1
+        if self.detect(model, frame):
+            self.positives += 1
+            self._since_full = 0
+            return True
+        self._since_full += 1
+        if self.force_every and self._since_full >= self.force_every:
+            self.forced += 1
+            self._since_full = 0
+            return True
+        return False
+
+    def stats(self):
+        full = self.positives + self.forced
+        return {
+            "checks": self.checks,
+            "positives": self.positives,
+            "forced": self.forced,
+            "full_rate": round(full / self.checks, 3) if self.checks else None,
+        }
+
+
+def evaluate_gate(frames, model, gate=None, imgsz=640, conf=0.4):
+    """Gate recall against the full detector, frame by frame.
+
+    ``recall`` counts frames the low-resolution pass itself flags among those
+    the full detector finds a pad in; ``recall_with_forced`` also credits the
+    periodic forced checks, and ``max_missed_run`` is the longest streak of
+    pad frames the cascade never ran the full detector on.
+    """
+    gate = gate or PadGate()
+    gate.reset()
+    frames_seen = full_positives = gated = caught = caught_with_forced = 0
+    missed_run = max_missed_run = 0
+    for frame in frames:
+        frames_seen += 1
+        positive = _has_pad(model.predict(source=frame, task='detect', imgsz=imgsz, conf=conf, verbose=False))
+        forced_before = gate.forced
+        run_full = gate.check(model, frame)
+        gated += run_full
+        if not positive:
+            continue
+        full_positives += 1
+        if run_full:
+            caught_with_forced += 1
+            caught += gate.forced == forced_before
+            missed_run = 0
+        else:
+            missed_run += 1
+            max_missed_run = max(max_missed_run, missed_run)
+
+    return {
+        "frames": frames_seen,
+        "full_positives": full_positives,
+        "recall": round(caught / full_positives, 3) if full_positives else None,
+        "recall_with_forced": round(caught_with_forced / full_positives, 3) if full_positives else None,
+        "max_missed_run": max_missed_run,
+        "full_runs": gated,
+        "full_rate": round(gated / frames_seen, 3) if frames_seen else None,
+    }
+
+
+def load_frames(path):
+    """RGB frames from a directory of images or a video file."""
+    import cv2
+
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            image = cv2.imread(os.path.join(path, name))
+            if image is not None:
+                yield cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return
+    capture = cv2.VideoCapture(path)
+    try:
+        while True:
+            ok, image = capture.read()
+            if not ok:
+                break
+            yield cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    finally:
+        capture.release()
+
+
+def simulated_frames(step=40, seed=0, courses=None):
+    """Renders along the simulator courses (all by default), flown toward the pad and then back."""
+    import numpy as np
+
+    from simulation import COURSES, SimulatedDrone
+
+    rng = np.random.default_rng(seed)
+    for name, course in COURSES.items():
+        if courses and name not in courses:
+            continue
+        drone = SimulatedDrone(**course)
+        drone.takeoff()
+        drone.move_down(30)
+        for turn in (0, 180):
+            for (x0, y0), (x1, y1) in zip(drone.path, drone.path[1:]):
+                length = float(np.hypot(x1 - x0, y1 - y0))
+                heading = float(np.degrees(np.arctan2(x1 - x0, y0 - y1)))
+                for along in np.arange(0, length, step):
+                    drone.x = x0 + (x1 - x0) * along / length
+                    drone.y = y0 + (y1 - y0) * along / length
+                    drone.yaw = heading + turn + float(rng.uniform(-20, 20))
+                    drone._frame_cache = None
+                    yield drone.render().copy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure pad-gate recall against the full detector.")
+    parser.add_argument("--frames", help="directory of images or a video file")
+    parser.add_argument("--model", help="pad detector weights, e.g. best_pad_new.pt")
+    parser.add_argument("--simulated", action="store_true",
+                        help="use simulator renders and the stub detector")
+    parser.add_argument("--gate-imgsz", type=int, default=320)
+    parser.add_argument("--gate-conf", type=float, default=0.2)
+    parser.add_argument("--force-every", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if args.simulated:
+        from simulation import StubDetectionModel
+        model, frames = StubDetectionModel(), simulated_frames()
+    elif args.frames and args.model:
+        from ultralytics import YOLO
+        model, frames = YOLO(args.model), load_frames(args.frames)
+    else:
+        parser.error("give --frames and --model, or --simulated")
+
+    gate = PadGate(args.gate_imgsz, args.gate_conf, args.force_every)
+    result = evaluate_gate(frames, model, gate)
+    for key, value in result.items():
+        print(f"{key:<20} {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+# File: path_geometry.py
+"""
+Geometry helpers for segmentation masks and detection boxes.
+
+Pure NumPy/OpenCV so they can be used and benchmarked without Qt or a model.
+"""
+import cv2
+import numpy as np
+
+
+def mask_to_uint8(mask):
+    """Scale a float mask in [0, 1] to a 0/255 uint8 image."""
+    return (mask * 255).astype(np.uint8)
+
+
+def mask_centroid(mask):
+    """Return the ``(cX, cY)`` centroid of a mask, or ``None`` if it is empty."""
+    M = cv2.moments(mask)
+    if M["m00"] <= 0:
+        return None
+    return int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])
+
+
+def box_center(box):
+    """Integer centre of an ``x1, y1, x2, y2, ...`` box."""
+    x1, y1, x2, y2 = box[:4]
+    return int((x1 + x2) / 2), int((y1 + y2) / 2)
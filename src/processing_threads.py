@@ -4,12 +4,73 @@ import time
 import numpy as np
 import cv2
 
+import cpu_budget
+from packed_mask import PackedMask, pack_masks
+from pad_approach import select_pad_box
+from path_geometry import mask_centroid, mask_to_uint8
+
+
+def draw_segmentation_overlay(frame, mask):
+    """Blend a colour-mapped path mask (``PackedMask`` or float) over ``frame`` and mark its centroid."""
+    size = (frame.shape[1], frame.shape[0])
+    if isinstance(mask, PackedMask):
+        centroid_point = mask.centroid(size)
+        mask = mask.to_array(size)
+    else:
+        mask = cv2.resize(mask_to_uint8(mask), size)
+        centroid_point = mask_centroid(mask)
+    mask_colored = cv2.applyColorMap(mask, cv2.COLORMAP_JET)
+
+    if centroid_point is not None:
+        cX, cY = centroid_point
+
+        # Draw line from bottom center to centroid
+        height, width = frame.shape[:2]
+        bottom_center = (width // 2, height - 1)
+        cv2.line(mask_colored, bottom_center, centroid_point, (255, 0, 0), 2)
+        cv2.circle(mask_colored, centroid_point, 5, (255, 0, 0), -1)
+        cv2.putText(mask_colored, f"Centroid: ({cX},{cY})", (cX + 10, cY), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+
+    return cv2.addWeighted(frame, 0.7, mask_colored, 0.3, 0)
+
+
+def draw_detection_overlay(frame, boxes):
+    """Copy ``frame`` and draw the pad box the controller steers to, with a line to its centre."""
+    display_frame = frame.copy()
+    height, width = display_frame.shape[:2]
+    bottom_center = (width // 2, height - 1)
+
+    box = select_pad_box(boxes)
+    if box is not None:
+        # Draw the highest-confidence box, as select_pad_box picks it for pad_align
+        x1, y1, x2, y2 = box[:4].astype(int)
+        center = ((x1 + x2) // 2, (y1 + y2) // 2)
+
+        cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.line(display_frame, bottom_center, center, (255, 0, 0), 2)     # Blue line
+        cv2.circle(display_frame, center, 5, (255, 0, 0), -1)              # Blue dot
+        cv2.putText(display_frame, f"Pad Center: {center}", (center[0] + 10, center[1]),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
+
+    return display_frame
+
+
+def pace(rate, started):
+    """Sleep out the rest of the overlay interval begun at ``started``; 0.1 s without ``rate``."""
+    if rate is None:
+        time.sleep(0.1)
+        return
+    time.sleep(max(0.01, rate.overlay_interval() - (time.monotonic() - started)))
+
+
 class SegmentationThread(QThread):
     segmentation_result = Signal(np.ndarray)
 
-    def __init__(self, model):
+    def __init__(self, model, rate=None):
         super().__init__()
         self.model = model
+        # rate_control.RateController pacing the predictions; None keeps 0.1 s
+        self.rate = rate
         self.running = False
         self.paused = False
         self.frame = None
@@ -24,36 +85,20 @@ class SegmentationThread(QThread):
         self.paused = False
 
     def run(self):
+        cpu_budget.enter("inference")
         self.running = True
         while self.running:
+            started = time.monotonic()
             if self.frame is not None and not self.paused:
                 results = self.model.predict(source=self.frame, task='segment', imgsz=640, conf=0.4, verbose=False)
-                masks = results[0].masks.data.cpu().numpy() if results[0].masks else []
+                if self.rate is not None:
+                    self.rate.record_overlay(time.monotonic() - started)
+                masks = pack_masks(results[0].masks) if results[0].masks else []
                 
                 if len(masks) > 0:
-                    mask = (masks[0] * 255).astype(np.uint8)
-                    mask = cv2.resize(mask, (self.frame.shape[1], self.frame.shape[0]))
-                    mask_colored = cv2.applyColorMap(mask, cv2.COLORMAP_JET)
-
-                    # Calculate centroid
-                    M = cv2.moments(mask)
-                    if M["m00"] > 0:
-                        cX = int(M["m10"] / M["m00"])
-                        cY = int(M["m01"] / M["m00"])
-
-                        # Draw line from bottom center to centroid
-                        height, width = self.frame.shape[:2]
-                        bottom_center = (width // 2, height - 1)
-                        centroid_point = (cX, cY)
-                        cv2.line(mask_colored, bottom_center, centroid_point, (255, 0, 0), 2)
-                        cv2.circle(mask_colored, centroid_point, 5, (255, 0, 0), -1)
-                        cv2.putText(mask_colored, f"Centroid: ({cX},{cY})", (cX + 10, cY), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-
-                    # Blend and emit
-                    blended = cv2.addWeighted(self.frame, 0.7, mask_colored, 0.3, 0)
-                    self.segmentation_result.emit(blended)
-
-            time.sleep(0.1)
+                    self.segmentation_result.emit(draw_segmentation_overlay(self.frame, masks[0]))
+
+            pace(self.rate, started)
 
     def stop(self):
         self.running = False
@@ -63,9 +108,11 @@ class SegmentationThread(QThread):
 class DetectionThread(QThread):
     detection_result = Signal(np.ndarray)
 
-    def __init__(self, model):
+    def __init__(self, model, rate=None):
         super().__init__()
         self.model = model
+        # rate_control.RateController pacing the predictions; None keeps 0.1 s
+        self.rate = rate
         self.running = False
         self.paused = False
         self.frame = None
@@ -80,29 +127,18 @@ class DetectionThread(QThread):
         self.paused = False
 
     def run(self):
+        cpu_budget.enter("inference")
         self.running = True
         while self.running:
+            started = time.monotonic()
             if self.frame is not None and not self.paused:
                 results = self.model.predict(source=self.frame, task='detect', imgsz=640, conf=0.4, verbose=False)
+                if self.rate is not None:
+                    self.rate.record_overlay(time.monotonic() - started)
                 boxes = results[0].boxes.data.cpu().numpy() if results[0].boxes else []
-                display_frame = self.frame.copy()
-                height, width = display_frame.shape[:2]
-                bottom_center = (width // 2, height - 1)
-
-                if len(boxes) > 0:
-                    # Draw the first bounding box and line to its center
-                    x1, y1, x2, y2 = boxes[0][:4].astype(int)
-                    box_center = ((x1 + x2) // 2, (y1 + y2) // 2)
-
-                    cv2.rectangle(display_frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    cv2.line(display_frame, bottom_center, box_center, (255, 0, 0), 2)     # Blue line
-                    cv2.circle(display_frame, box_center, 5, (255, 0, 0), -1)              # Blue dot
-                    cv2.putText(display_frame, f"Pad Center: {box_center}", (box_center[0] + 10, box_center[1]), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 0), 1)
-
-                self.detection_result.emit(display_frame)
+                self.detection_result.emit(draw_detection_overlay(self.frame, boxes))
 
-            time.sleep(0.1)
+            pace(self.rate, started)
 
     def stop(self):
         self.running = False
@@ -0,0 +1,270 @@
+# File: rate_control.py
+"""
+Adaptive control tick and overlay inference rates.
+
+Each mission state has a fixed tick period (``MissionState.tick_ms``), and the
+GUI's segmentation and detection overlay threads predict every 0.1 s. Both
+are wrong more often than not. A slow board cannot keep up with them, and a
+drone flying straight down a centred path does not need them.
+``RateController`` picks the tick period of each state between configured
+bounds, and the overlay interval likewise:
+
+- ``pad_align`` ticks as fast as its bounds allow, since that is where a late
+  correction misses the pad;
+- ``path_follow`` relaxes by ``cruise_relax`` per tick while the path stays
+  centred, and snaps back at the first correction;
+- process CPU above ``cpu_high`` slows everything down step by step, and it
+  recovers below ``cpu_low``;
+- ``power_save`` (battery-powered companion boards), or a drone battery at or
+  under ``low_battery`` %, slows everything by ``power_factor``;
+- the measured inference time of a tick (and of an overlay prediction) sets a
+  floor, so inference takes at most ``duty`` of the control thread's time.
+
+Every change of rate is logged as a ``rate.change`` event and kept in
+``history``; ``summary`` reports time-weighted rates per state:
+
+    rates = RateController(cpu=CpuMeter())
+    rates.record_inference("pad", 0.12)
+    rates.update(PAD_ALIGN)
+    timer.start(rates.tick_ms(PAD_ALIGN))
+"""
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import flight_log
+
+log = flight_log.get_logger("rate")
+
+# Tick period bounds in ms per state name; other states keep their own period
+DEFAULT_BOUNDS = {
+    "path_follow": (400, 1400),
+    "path_recovery": (300, 1000),
+    "pad_align": (150, 600),
+}
+
+# A change of at least this share of the previous rate is recorded
+CHANGE_THRESHOLD = 0.1
+
+
+class CpuMeter:
+    """This process's CPU use since the previous sample, as a share of its usable cores.
+
+    Returns ``None`` when called again within ``min_interval`` seconds.
+    """
+
+    def __init__(self, min_interval=0.5):
+        try:
+            self.cores = len(os.sched_getaffinity(0))
+        except AttributeError:
+            self.cores = os.cpu_count() or 1
+        self.min_interval = min_interval
+        self._last = (time.monotonic(), time.process_time())
+
+    def __call__(self):
+        now, cpu = time.monotonic(), time.process_time()
+        wall = now - self._last[0]
+        if wall < self.min_interval:
+            return None
+        share = (cpu - self._last[1]) / wall / self.cores
+        self._last = (now, cpu)
+        return min(1.0, share)
+
+
+class RateController:
+    """Tick period per mission state and overlay interval, from latency, CPU, battery and state."""
+
+    def __init__(self, bounds=None, overlay_s=0.1, overlay_bounds=(0.1, 1.0), duty=0.6, overlay_duty=0.5,
+                 cruise_relax=1.25, pad_factor=0.5, cpu=None, cpu_high=0.85, cpu_low=0.6, max_load=4.0,
+                 power_save=False, low_battery=25, power_factor=1.5, alpha=0.2, clock=time.monotonic,
+                 history=500):
+        self.bounds = dict(DEFAULT_BOUNDS if bounds is None else bounds)
+        self.overlay_s = overlay_s
+        self.overlay_bounds = overlay_bounds
+        self.duty = duty
+        self.overlay_duty = overlay_duty
+        self.cruise_relax = cruise_relax
+        self.pad_factor = pad_factor
+        # Zero-argument callable giving CPU use 0..1, or None while unchanged
+        self.cpu = cpu
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.max_load = max_load
+        self.power_save = power_save
+        self.low_battery = low_battery
+        self.power_factor = power_factor
+        self.alpha = alpha
+        self.clock = clock
+        # False keeps every state's own period and the base overlay interval
+        self.enabled = True
+        self._lock = threading.Lock()
+        # Smoothed seconds per call for each model, and per tick for each state
+        self.inference_s = {}
+        self.tick_inference_s = {}
+        self.overlay_inference_s = None
+        self._pending_s = 0.0
+        self.history = deque(maxlen=history)
+        self.reset()
+
+    def reset(self):
+        """Start a new mission; measured latencies are kept."""
+        with self._lock:
+            self.history.clear()
+            self._pending_s = 0.0
+        self.cpu_load = None
+        self.battery = None
+        self._load = 1.0
+        self._steady = 0
+        self._overlay = self.overlay_s
+
+    def _smooth(self, old, new):
+        return new if old is None else old + self.alpha * (new - old)
+
+    def record_inference(self, model, seconds):
+        """A control-thread inference of ``model`` took ``seconds``."""
+        with self._lock:
+            self.inference_s[model] = self._smooth(self.inference_s.get(model), seconds)
+            self._pending_s += seconds
+
+    def record_overlay(self, seconds):
+        """An overlay thread's prediction took ``seconds``; any thread may call this."""
+        with self._lock:
+            self.overlay_inference_s = self._smooth(self.overlay_inference_s, seconds)
+
+    def note_steering(self, centered):
+        """Path following: ``centered`` when it flew straight on, not a correction."""
+        self._steady = self._steady + 1 if centered else 0
+
+    def note_battery(self, percent):
+        if isinstance(percent, (int, float)) and not isinstance(percent, bool):
+            self.battery = percent
+
+    def power_saving(self):
+        return self.power_save or (self.battery is not None and self.battery <= self.low_battery)
+
+    def _pace(self, state):
+        """Multiplier on the base rates for ``state``, and why."""
+        pace, reasons = 1.0, []
+        if state.name == "pad_align":
+            pace *= self.pad_factor
+            reasons.append("pad alignment")
+        elif state.name == "path_follow" and self._steady:
+            pace *= self.cruise_relax ** min(self._steady, 10)
+            reasons.append(f"steady for {self._steady} ticks")
+        if self._load > 1.0:
+            pace *= self._load
+            reasons.append(f"CPU x{self._load:.2f}")
+        if self.power_saving():
+            pace *= self.power_factor
+            reasons.append("power save" if self.power_save else f"battery {self.battery}%")
+        return pace, reasons
+
+    def _choose(self, state):
+        """``(tick_ms, overlay_s, reasons)`` for ``state``."""
+        pace, reasons = self._pace(state)
+        tick = state.tick_ms
+        bounds = self.bounds.get(state.name)
+        if bounds is not None:
+            low, high = bounds
+            tick = state.tick_ms * pace
+            floor = (self.tick_inference_s.get(state.name) or 0.0) * 1000 / self.duty
+            if floor > tick:
+                tick = floor
+                reasons.append(f"inference {floor * self.duty:.0f} ms")
+            tick = int(round(min(high, max(low, tick))))
+        low, high = self.overlay_bounds
+        overlay = max(self.overlay_s * pace, (self.overlay_inference_s or 0.0) / self.overlay_duty)
+        return tick, min(high, max(low, overlay)), reasons
+
+    def tick_ms(self, state):
+        """The tick period to use in ``state`` now."""
+        if not self.enabled:
+            return state.tick_ms
+        return self._choose(state)[0]
+
+    def overlay_interval(self):
+        """Seconds between overlay predictions, start to start."""
+        return self._overlay if self.enabled else self.overlay_s
+
+    def update(self, state):
+        """After each control tick in ``state``: fold in its inference time and the CPU load.
+
+        Returns the tick period now chosen for ``state``.
+        """
+        with self._lock:
+            pending, self._pending_s = self._pending_s, 0.0
+        if state.name in self.bounds:
+            self.tick_inference_s[state.name] = self._smooth(self.tick_inference_s.get(state.name), pending)
+        cpu = self.cpu() if self.cpu is not None else None
+        if cpu is not None:
+            self.cpu_load = cpu
+            if cpu > self.cpu_high:
+                self._load = min(self.max_load, self._load * 1.25)
+            elif cpu < self.cpu_low:
+                self._load = max(1.0, self._load / 1.1)
+        if not self.enabled:
+            return state.tick_ms
+        tick, overlay, reasons = self._choose(state)
+        self._overlay = overlay
+        self._record(state, tick, overlay, reasons)
+        return tick
+
+    def _record(self, state, tick, overlay, reasons):
+        last = self.history[-1] if self.history else None
+        if last is not None and last["state"] == state.name and \
+                abs(tick - last["tick_ms"]) < CHANGE_THRESHOLD * last["tick_ms"] and \
+                abs(overlay * 1000 - last["overlay_ms"]) < CHANGE_THRESHOLD * last["overlay_ms"]:
+            return
+        record = {"t": self.clock(), "state": state.name, "tick_ms": tick, "overlay_ms": round(overlay * 1000),
+                  "cpu": None if self.cpu_load is None else round(self.cpu_load, 2),
+                  "reason": ", ".join(reasons) or "base"}
+        with self._lock:
+            self.history.append(record)
+        log.info("rate.change", f"⏱️ {state.name}: tick {tick} ms, overlays every {record['overlay_ms']} ms "
+                 f"({record['reason']})", **record)
+
+    def summary(self, now=None):
+        """Time-weighted tick and overlay periods per state over the recorded history."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            records = list(self.history)
+            inference = dict(self.inference_s)
+            overlay = self.overlay_inference_s
+        states = {}
+        for record, following in zip(records, records[1:] + [None]):
+            seconds = max(0.0, (following["t"] if following else now) - record["t"])
+            s = states.setdefault(record["state"], {"seconds": 0.0, "tick": 0.0, "overlay": 0.0,
+                                                    "min_tick_ms": math.inf, "max_tick_ms": 0})
+            s["seconds"] += seconds
+            s["tick"] += seconds * record["tick_ms"]
+            s["overlay"] += seconds * record["overlay_ms"]
+            s["min_tick_ms"] = min(s["min_tick_ms"], record["tick_ms"])
+            s["max_tick_ms"] = max(s["max_tick_ms"], record["tick_ms"])
+        return {
+            "changes": len(records),
+            "states": {name: {"seconds": round(s["seconds"], 2),
+                              "mean_tick_ms": round(s["tick"] / s["seconds"]) if s["seconds"] else s["min_tick_ms"],
+                              "min_tick_ms": s["min_tick_ms"], "max_tick_ms": s["max_tick_ms"],
+                              "mean_overlay_ms": round(s["overlay"] / s["seconds"]) if s["seconds"] else None}
+                       for name, s in states.items()},
+            "inference_ms": {model: round(seconds * 1000, 1) for model, seconds in inference.items()},
+            "overlay_inference_ms": None if overlay is None else round(overlay * 1000, 1),
+            "cpu": None if self.cpu_load is None else round(self.cpu_load, 2),
+            "power_save": self.power_saving(),
+        }
+
+    def format_report(self, summary=None):
+        """The summary as text."""
+        summary = summary or self.summary()
+        lines = [f"Rates: {summary['changes']} changes"
+                 + (f", CPU {summary['cpu']:.0%}" if summary["cpu"] is not None else "")
+                 + (", power save" if summary["power_save"] else "")]
+        for name, s in summary["states"].items():
+            lines.append(f"  {name:<14} {s['seconds']:>7.1f} s  tick mean {s['mean_tick_ms']:>5} ms "
+                         f"({s['min_tick_ms']}-{s['max_tick_ms']})  overlays every {s['mean_overlay_ms']} ms")
+        if summary["inference_ms"]:
+            lines.append("  inference " + ", ".join(f"{model} {ms:.0f} ms"
+                                                    for model, ms in summary["inference_ms"].items()))
+        return "\n".join(lines)
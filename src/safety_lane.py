@@ -0,0 +1,189 @@
+# File: safety_lane.py
+"""
+A priority lane for emergency stops and landings.
+
+Mission ticks run on the worker thread and block there: a YOLO predict, a
+``move_forward`` that only returns once the drone has flown it, the sleeps
+between steps. A stop request queued behind them can wait seconds.
+``SafetyLane`` has a thread of its own. ``trigger`` returns at once from any
+thread, and the lane thread then:
+
+- for ``"emergency"``: sends ``emergency`` from its own UDP socket straight
+  to the drone's command address when the handle exposes one (djitellopy's
+  ``Tello.address``, ``TelloClient``'s client), then calls the handle's
+  ``emergency()``. That is a second datagram for UDP handles and the only
+  path for others, and ``TelloClient`` abandons the command in flight and
+  fails the queued ones;
+- for ``"land"``: cancels ``TelloClient``'s in-flight and queued commands so
+  ``land`` goes out next, then lands.
+
+Once triggered, the lane refuses further motion commands through ``check``
+(``InstrumentedDrone``'s gate) and wakes ``sleep``, both by raising
+``SafetyTripped``, so a running mission unwinds instead of flying on:
+
+    lane = SafetyLane()
+    lane.attach(drone)
+    lane.start()
+    QShortcut(QKeySequence("Esc"), window, lambda: lane.trigger("emergency", "Esc"))
+"""
+import queue
+import socket
+import threading
+import time
+from collections import deque
+
+import cpu_budget
+import flight_log
+from frame_trace import is_action
+
+log = flight_log.get_logger("safety")
+
+ACTIONS = ("emergency", "land")
+
+
+class SafetyTripped(BaseException):
+    """Unwinds the control thread once the lane has fired.
+
+    A ``BaseException``, so the mission code's broad ``except Exception``
+    recovery paths cannot catch it and carry on flying.
+    """
+
+
+def command_address(drone):
+    """The drone's UDP command address if the handle exposes it, else ``None``."""
+    for owner in (getattr(drone, "client", None), drone):
+        address = getattr(owner, "address", None)
+        if isinstance(address, tuple) and len(address) == 2:
+            return address
+    return None
+
+
+class SafetyLane:
+    """Sends emergency stops and landings from a thread of its own."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.drone = None
+        self.tripped = threading.Event()
+        # The latest action requested, set before ``tripped``
+        self.action = None
+        # One record per request: action, reason, path, requested/sent times, latency_ms
+        self.records = deque(maxlen=100)
+        # Called on the lane thread with each record once its command is out
+        self.listeners = []
+        self._requests = queue.Queue()
+        self._socket = None
+        self._thread = None
+
+    def attach(self, drone):
+        """Act on ``drone``, the bare handle rather than any proxy around it."""
+        self.drone = drone
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="safety-lane", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._requests.put(None)
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def trigger(self, action="emergency", reason="requested"):
+        """Request ``action`` from any thread; returns without waiting for it.
+
+        Runs it on the calling thread if the lane was never started.
+        """
+        if action not in ACTIONS:
+            raise ValueError(f"Unknown safety action {action!r}; expected one of {ACTIONS}")
+        request = (action, reason, self.clock())
+        self.action = action
+        self.tripped.set()
+        if self._thread is None:
+            return self._execute(*request)
+        self._requests.put(request)
+        return None
+
+    def reset(self):
+        """Allow motion again, for the next mission."""
+        self.tripped.clear()
+        self.action = None
+
+    def check(self, name):
+        """Refuse motion command ``name`` once tripped; landing and stopping stay allowed."""
+        if self.tripped.is_set() and is_action(name) and name not in ACTIONS:
+            raise SafetyTripped(f"{name} refused: safety lane tripped")
+
+    def sleep(self, seconds):
+        """``time.sleep`` that raises ``SafetyTripped`` as soon as the lane fires."""
+        if self.tripped.wait(seconds):
+            raise SafetyTripped("sleep interrupted: safety lane tripped")
+
+    def _run(self):
+        cpu_budget.enter("control")
+        while True:
+            request = self._requests.get()
+            if request is None:
+                break
+            self._execute(*request)
+
+    def _send_direct(self, command):
+        address = command_address(self.drone)
+        if address is None:
+            return False
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.sendto(command, address)
+        return True
+
+    def _execute(self, action, reason, requested):
+        record = {"action": action, "reason": reason, "path": None, "error": None}
+        drone = self.drone
+        try:
+            if drone is None:
+                raise RuntimeError("no drone attached")
+            if action == "emergency":
+                if self._send_direct(b"emergency"):
+                    record["path"] = "socket"
+                    record["sent"] = self.clock()
+                try:
+                    drone.emergency()
+                except Exception as e:
+                    if record["path"] is not None:
+                        # The direct datagram is out; this was only the backup
+                        log.warning("safety.client_emergency_failed", f"Client emergency failed: {e}", error=e)
+                    else:
+                        # A handle that cannot cut the motors can at least land
+                        record["path"] = "land"
+                        record["sent"] = self.clock()
+                        drone.land()
+                if record["path"] is None:
+                    record["path"] = "client"
+                    record["sent"] = self.clock()
+            else:
+                cancel = getattr(drone, "cancel_commands", None)
+                if cancel is not None:
+                    cancel("Cancelled by landing")
+                record["path"] = "client"
+                record["sent"] = self.clock()
+                drone.land()
+        except Exception as e:
+            record["error"] = str(e)
+            record.setdefault("sent", self.clock())
+        record["requested"] = requested
+        record["latency_ms"] = round((record["sent"] - requested) * 1000, 2)
+        self.records.append(record)
+        if record["error"] is None:
+            log.warning(f"safety.{action}", f"🚨 {action} sent in {record['latency_ms']:.1f} ms ({reason})",
+                        reason=reason, path=record["path"], latency_ms=record["latency_ms"])
+        else:
+            log.error(f"safety.{action}_failed", f"❌ Safety {action} failed: {record['error']}",
+                      reason=reason, error=record["error"])
+        for listener in self.listeners:
+            listener(record)
+        return record
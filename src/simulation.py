@@ -0,0 +1,807 @@
+# File: simulation.py
+"""
+Simulated Tello and stub YOLO models for running the pipeline without hardware.
+
+``SimulatedDrone`` keeps a 2.5D pose (floor position, height, yaw) over a
+synthetic floor with a white path ribbon and a magenta landing pad, applies
+the djitellopy motion commands used by ``DroneWorker`` and renders the
+forward camera view from the current pose. ``StubSegmentationModel`` and
+``StubDetectionModel`` stand in for the YOLO weights: they find the ribbon
+and the pad by colour and return results shaped like ultralytics'
+(``results[0].masks.data.cpu().numpy()``, ``results[0].boxes.data``), so the
+mission logic runs unchanged on a plain CPU box.
+
+Colours are symmetric under an RGB/BGR swap, so it does not matter which
+channel order a consumer assumes.
+
+``run_mission`` flies a complete ``DroneWorker`` mission headless on the
+simulator's virtual clock, far faster than real time, and reports mission
+duration and command count; ``run_batch`` does so over several courses:
+
+    python src/simulation.py --courses gentle_bend dogleg --repeats 3
+"""
+import argparse
+import json
+import math
+import threading
+import time
+
+import cv2
+import numpy as np
+
+FLOOR_COLOR = (70, 70, 70)
+GRID_COLOR = (85, 85, 85)
+PATH_COLOR = (235, 235, 235)
+PAD_COLOR = (255, 0, 255)
+WALL_COLOR = (40, 40, 40)
+
+# Seconds a 640 px YOLOv8n call takes on a companion computer's CPU. The stub
+# models charge this by default, so simulated frames age as real ones do.
+STUB_INFERENCE_TIME = 0.15
+
+DEFAULT_PATH = [(400, 760), (400, 480), (460, 300), (460, 180)]
+DEFAULT_PAD = (460, 120)
+
+COURSES = {
+    "gentle_bend": {"path": DEFAULT_PATH, "pad": DEFAULT_PAD},
+    "dogleg": {"path": [(400, 760), (400, 500), (480, 260)], "pad": (480, 200)},
+    "straight": {"path": [(400, 760), (400, 120)], "pad": (400, 120)},
+    # The pad is out of view until most of the path has been followed
+    "long_approach": {"path": [(400, 2360), (400, 200)], "pad": (400, 140), "floor_size": (800, 2400)},
+    # The path breaks off before a right turn, so only path recovery finds it again
+    "turn_gap": {"path": [(400, 2360), (400, 1450), (1500, 1450)], "pad": (1540, 1450),
+                 "floor_size": (1600, 2400), "gaps": [((400, 1450), (700, 1450))]},
+}
+
+
+class SimulationError(Exception):
+    """Raised for commands the real drone would reject."""
+
+
+class _Tensor:
+    """Minimal stand-in for a torch tensor: ``.cpu().numpy()``."""
+
+    def __init__(self, array):
+        self._array = array
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._array
+
+    def __len__(self):
+        return len(self._array)
+
+
+class _Masks:
+    def __init__(self, data):
+        self.data = _Tensor(data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class _Boxes:
+    def __init__(self, data):
+        self.data = _Tensor(data)
+
+    def __len__(self):
+        return len(self.data)
+
+
+class StubResult:
+    """One image's prediction, with ``masks``/``boxes`` set to ``None`` when empty."""
+
+    def __init__(self, masks=None, boxes=None):
+        self.masks = _Masks(masks) if masks is not None and len(masks) else None
+        self.boxes = _Boxes(boxes) if boxes is not None and len(boxes) else None
+
+
+def _letterbox_shape(frame, imgsz):
+    """Mask resolution ultralytics returns for ``frame`` at ``imgsz``."""
+    h, w = frame.shape[:2]
+    scale = imgsz / max(h, w)
+    return (int(math.ceil(h * scale / 32) * 32), int(math.ceil(w * scale / 32) * 32))
+
+
+class StubSegmentationModel:
+    """Deterministic path segmenter: the ribbon is every bright, grey pixel."""
+
+    def __init__(self, min_area=200, inference_time=STUB_INFERENCE_TIME, sleep=None):
+        self.min_area = min_area
+        self.calls = 0
+        # Seconds each 640 px call costs, spent through ``sleep`` (e.g. drone.advance)
+        self.inference_time = inference_time
+        self.sleep = sleep
+
+    def predict(self, source, task="segment", imgsz=640, conf=0.4, verbose=False):
+        self.calls += 1
+        if self.sleep and self.inference_time:
+            # Cost scales with input pixels, like a real detector's
+            self.sleep(self.inference_time * (imgsz / 640.0) ** 2)
+        out_h, out_w = _letterbox_shape(source, imgsz)
+        small = cv2.resize(source, (out_w, out_h), interpolation=cv2.INTER_NEAREST)
+        mask = (small.min(axis=2) > 200).astype(np.float32)
+        masks = mask[None] if mask.sum() >= self.min_area else None
+        return [StubResult(masks=masks)]
+
+
+class StubDetectionModel:
+    """Deterministic pad detector: one box per magenta blob, scored by fill."""
+
+    def __init__(self, min_area=30, inference_time=STUB_INFERENCE_TIME, sleep=None):
+        self.min_area = min_area
+        self.calls = 0
+        self.inference_time = inference_time
+        self.sleep = sleep
+
+    def predict(self, source, task="detect", imgsz=640, conf=0.4, verbose=False):
+        self.calls += 1
+        if self.sleep and self.inference_time:
+            # Cost scales with input pixels, like a real detector's
+            self.sleep(self.inference_time * (imgsz / 640.0) ** 2)
+        h, w = source.shape[:2]
+        scale = imgsz / max(h, w)
+        small = cv2.resize(source, (max(1, int(w * scale)), max(1, int(h * scale))),
+                           interpolation=cv2.INTER_NEAREST)
+        pad = ((small[..., 0] > 200) & (small[..., 2] > 200) & (small[..., 1] < 100))
+        count, _, stats, _ = cv2.connectedComponentsWithStats(pad.astype(np.uint8))
+
+        boxes = []
+        for x, y, bw, bh, area in stats[1:count]:
+            if area < self.min_area:
+                continue
+            score = 0.5 + 0.5 * area / float(bw * bh)
+            if score < conf:
+                continue
+            boxes.append([x / scale, y / scale, (x + bw) / scale, (y + bh) / scale, score, 0.0])
+        boxes.sort(key=lambda box: box[4], reverse=True)
+        return [StubResult(boxes=np.array(boxes, dtype=np.float32).reshape(-1, 6))]
+
+
+def load_stub_models(inference_time=STUB_INFERENCE_TIME, sleep=None):
+    """Return ``(path_model, pad_model)`` stubs for ``DroneWorker``."""
+    return (StubSegmentationModel(inference_time=inference_time, sleep=sleep),
+            StubDetectionModel(inference_time=inference_time, sleep=sleep))
+
+
+class _SimFrameRead:
+    """``get_frame_read()`` handle whose ``frame`` renders the current view."""
+
+    def __init__(self, drone):
+        self._drone = drone
+        self.stopped = False
+        self.frame_id = 0
+        self.timestamp = None
+
+    @property
+    def frame(self):
+        return self.snapshot()[0]
+
+    def snapshot(self):
+        # Every read captures a new view, timed on the drone's virtual clock
+        # like FrameRead.timestamp
+        self.frame_id += 1
+        self.timestamp = self._drone.clock
+        return self._drone.render(), self.frame_id, self.timestamp
+
+    def stop(self):
+        self.stopped = True
+
+
+class SimulatedDrone:
+    """Kinematic Tello over a synthetic floor, with a djitellopy-style API.
+
+    Units are centimetres and degrees. The floor is a top-down image with one
+    pixel per centimetre; yaw 0 faces the top of that image and increases
+    clockwise. The camera is modelled pitched down by ``camera_pitch`` so the
+    floor fills most of the view; everything above the horizon is a plain wall.
+
+    Time is virtual: every command advances ``clock`` by how long the real
+    drone would take to fly it, and ``advance`` stands in for ``time.sleep``
+    while integrating ``send_rc_control`` velocities and draining the battery.
+    Assigning ``worker._sleep = drone.advance`` therefore lets a whole mission
+    run as fast as the CPU can render and infer.
+    """
+
+    # Seconds every acknowledged command costs on top of its motion.
+    COMMAND_OVERHEAD = 0.3
+    ROTATION_RATE = 60.0      # deg/s for cw/ccw
+    TAKEOFF_TIME = 4.0
+    LAND_TIME = 3.0
+    RC_MAX_SPEED = 100.0      # cm/s at stick 100
+    RC_MAX_YAW_RATE = 100.0   # deg/s at stick 100
+    BATTERY_DRAIN = 100.0 / 780.0  # %/s in the air, about 13 minutes of flight
+    # get_speed_x/y report cm/s, not the Tello's dm/s (see latency.speed_scale_for)
+    speed_scale = 1.0
+
+    def __init__(self, path=None, pad=DEFAULT_PAD, pad_id=5, pad_size=50,
+                 floor_size=(800, 800), frame_size=(960, 720), hfov=70.0,
+                 camera_pitch=25.0, start=None, battery=100, mission_pads=None, gaps=()):
+        self.path = list(path or DEFAULT_PATH)
+        # ((x0, y0), (x1, y1)) stretches of the path whose paint is missing
+        self.gaps = list(gaps)
+        self.pad = pad
+        self.pad_id = pad_id
+        self.pad_size = pad_size
+        self.frame_size = frame_size
+        self.hfov = hfov
+        self.camera_pitch = camera_pitch
+        self.start = start
+        self.initial_battery = battery
+        # Mission pad id -> floor position, as seen by the downward camera.
+        self.pad_positions = dict(mission_pads or {pad_id: pad})
+
+        self._lock = threading.RLock()
+        self._floor = self._draw_floor(floor_size)
+        self._frame_read = _SimFrameRead(self)
+        self._frame_cache = None
+
+        self.commands = []
+        self.reset()
+
+    def _draw_floor(self, size):
+        w, h = size
+        floor = np.full((h, w, 3), FLOOR_COLOR, dtype=np.uint8)
+        for x in range(0, w, 50):
+            cv2.line(floor, (x, 0), (x, h - 1), GRID_COLOR, 1)
+        for y in range(0, h, 50):
+            cv2.line(floor, (0, y), (w - 1, y), GRID_COLOR, 1)
+        points = np.array(self.path, dtype=np.int32)
+        cv2.polylines(floor, [points], False, PATH_COLOR, 30)
+        for start, end in self.gaps:
+            cv2.line(floor, start, end, FLOOR_COLOR, 34)
+        half = self.pad_size // 2
+        px, py = self.pad
+        cv2.rectangle(floor, (px - half, py - half), (px + half, py + half), PAD_COLOR, -1)
+        return floor
+
+    def reset(self, keep_clock=False):
+        """Put the drone back on the ground at the start of the path.
+
+        ``keep_clock`` leaves ``clock`` running on, for a worker that keeps
+        timing from it across missions.
+        """
+        with self._lock:
+            if self.start is not None:
+                self.x, self.y, self.yaw = self.start
+            else:
+                (x0, y0), (x1, y1) = self.path[0], self.path[1]
+                self.x, self.y = float(x0), float(y0)
+                self.yaw = math.degrees(math.atan2(x1 - x0, y0 - y1))
+            self.height = 0
+            self.battery = float(self.initial_battery)
+            self.speed = 10
+            self.flying = False
+            self.mission_pads = False
+            self.rc = (0, 0, 0, 0)
+            self.velocity = (0.0, 0.0, 0.0)
+            if not keep_clock:
+                self.clock = 0.0
+            self.flight_time = 0.0
+            self.commands = []
+            self._frame_cache = None
+
+    def _log(self, name, *args):
+        self.commands.append((name,) + args)
+        self._frame_cache = None
+
+    def _require_flying(self):
+        if not self.flying:
+            raise SimulationError("Not airborne")
+
+    def _check_range(self, value, low, high):
+        if not low <= value <= high:
+            raise SimulationError(f"Out of range: {value} not in [{low}, {high}]")
+
+    def _heading(self):
+        rad = math.radians(self.yaw)
+        return (math.sin(rad), -math.cos(rad)), (math.cos(rad), math.sin(rad))
+
+    def _translate(self, forward, right):
+        (fx, fy), (rx, ry) = self._heading()
+        self.x += forward * fx + right * rx
+        self.y += forward * fy + right * ry
+
+    def _elapse(self, seconds):
+        """Advance the clock by ``seconds`` spent executing a command."""
+        self.clock += seconds
+        if self.flying:
+            self.flight_time += seconds
+            self.battery = max(0.0, self.battery - self.BATTERY_DRAIN * seconds)
+
+    def _fly(self, distance, speed=None):
+        return self.COMMAND_OVERHEAD + abs(distance) / float(speed or self.speed)
+
+    def advance(self, seconds):
+        """Let ``seconds`` of virtual time pass, flying the current rc sticks."""
+        with self._lock:
+            if seconds <= 0:
+                return
+            left_right, forward_backward, up_down, yaw = self.rc
+            if self.flying and any(self.rc):
+                scale = self.RC_MAX_SPEED / 100.0
+                # Integrate in small steps so yaw and translation interact.
+                steps = max(1, int(math.ceil(seconds / 0.05)))
+                dt = seconds / steps
+                for _ in range(steps):
+                    self.yaw = (self.yaw + yaw * self.RC_MAX_YAW_RATE / 100.0 * dt + 180) % 360 - 180
+                    self._translate(forward_backward * scale * dt, left_right * scale * dt)
+                    self.height = max(0.0, self.height + up_down * scale * dt)
+                self._frame_cache = None
+                self.velocity = (forward_backward * scale, left_right * scale, up_down * scale)
+            else:
+                self.velocity = (0.0, 0.0, 0.0)
+            self._elapse(seconds)
+
+    def distance_to_pad(self):
+        with self._lock:
+            return math.hypot(self.x - self.pad[0], self.y - self.pad[1])
+
+    # djitellopy API
+
+    def connect(self):
+        self._log("command")
+
+    def end(self):
+        pass
+
+    def set_speed(self, x):
+        self._log("speed", x)
+        self._check_range(x, 10, 100)
+        self.speed = x
+
+    def streamon(self):
+        self._log("streamon")
+
+    def streamoff(self):
+        self._log("streamoff")
+
+    def get_frame_read(self):
+        return self._frame_read
+
+    def takeoff(self):
+        with self._lock:
+            self._log("takeoff")
+            self.flying = True
+            self.height = 80
+            self._elapse(self.TAKEOFF_TIME)
+
+    def land(self):
+        with self._lock:
+            self._log("land")
+            self._require_flying()
+            self._elapse(self.LAND_TIME)
+            self.flying = False
+            self.height = 0
+            self.rc = (0, 0, 0, 0)
+
+    def emergency(self):
+        with self._lock:
+            self._log("emergency")
+            self.flying = False
+            self.height = 0
+            self.rc = (0, 0, 0, 0)
+
+    def send_rc_control(self, left_right_velocity, forward_backward_velocity,
+                        up_down_velocity, yaw_velocity):
+        with self._lock:
+            self._log("rc", left_right_velocity, forward_backward_velocity,
+                      up_down_velocity, yaw_velocity)
+            self.rc = tuple(max(-100, min(100, int(v))) for v in
+                            (left_right_velocity, forward_backward_velocity,
+                             up_down_velocity, yaw_velocity))
+
+    def _move(self, name, x, forward=0, right=0, up=0):
+        with self._lock:
+            self._log(name, x)
+            self._require_flying()
+            self._check_range(x, 20, 500)
+            self._elapse(self._fly(x))
+            self._translate(forward, right)
+            self.height = max(0, self.height + up)
+
+    def move_up(self, x):
+        self._move("up", x, up=x)
+
+    def move_down(self, x):
+        self._move("down", x, up=-x)
+
+    def move_left(self, x):
+        self._move("left", x, right=-x)
+
+    def move_right(self, x):
+        self._move("right", x, right=x)
+
+    def move_forward(self, x):
+        self._move("forward", x, forward=x)
+
+    def move_back(self, x):
+        self._move("back", x, forward=-x)
+
+    def _rotate(self, name, x, sign):
+        with self._lock:
+            self._log(name, x)
+            self._require_flying()
+            self._check_range(x, 1, 360)
+            self._elapse(self.COMMAND_OVERHEAD + x / self.ROTATION_RATE)
+            self.yaw = (self.yaw + sign * x + 180) % 360 - 180
+
+    def rotate_clockwise(self, x):
+        self._rotate("cw", x, 1)
+
+    def rotate_counter_clockwise(self, x):
+        self._rotate("ccw", x, -1)
+
+    def go_xyz_speed(self, x, y, z, speed):
+        """Fly to ``x`` forward, ``y`` left, ``z`` up of the current position."""
+        with self._lock:
+            self._log("go", x, y, z, speed)
+            self._require_flying()
+            for value in (x, y, z):
+                self._check_range(value, -500, 500)
+            self._check_range(speed, 10, 100)
+            if max(abs(x), abs(y), abs(z)) < 20:
+                raise SimulationError("Out of range: go needs one axis of at least 20 cm")
+            self._elapse(self._fly(math.sqrt(x * x + y * y + z * z), speed))
+            self._translate(x, -y)
+            self.height = max(0, self.height + z)
+
+    def curve_xyz_speed(self, x1, y1, z1, x2, y2, z2, speed):
+        """Fly a curve through ``(x1, y1, z1)`` to ``(x2, y2, z2)``, Tello frame."""
+        with self._lock:
+            self._log("curve", x1, y1, z1, x2, y2, z2, speed)
+            self._require_flying()
+            for value in (x1, y1, z1, x2, y2, z2):
+                self._check_range(value, -500, 500)
+            self._check_range(speed, 10, 60)
+            length = (math.sqrt(x1 * x1 + y1 * y1 + z1 * z1)
+                      + math.sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2))
+            self._elapse(self._fly(length, speed))
+            self._translate(x2, -y2)
+            self.height = max(0, self.height + z2)
+
+    def enable_mission_pads(self):
+        self._log("mon")
+        self.mission_pads = True
+
+    def disable_mission_pads(self):
+        self._log("moff")
+        self.mission_pads = False
+
+    def set_mission_pad_detection_direction(self, x):
+        self._log("mdirection", x)
+
+    def go_xyz_speed_mid(self, x, y, z, speed, mid):
+        with self._lock:
+            self._log("go_mid", x, y, z, speed, mid)
+            self._require_flying()
+            if self.get_mission_pad_id() != mid:
+                raise SimulationError(f"Mission pad m{mid} not detected")
+            pad_x, pad_y = self.pad_positions[mid]
+            target = (pad_x + x, pad_y + y)
+            self._elapse(self._fly(math.hypot(target[0] - self.x, target[1] - self.y)
+                                   + abs(z - self.height), speed))
+            self.x, self.y = target
+            self.height = z
+
+    def get_height(self):
+        with self._lock:
+            return int(self.height)
+
+    def get_battery(self):
+        with self._lock:
+            return int(self.battery)
+
+    def get_yaw(self):
+        with self._lock:
+            return int(round(self.yaw))
+
+    def get_speed_x(self):
+        return int(self.velocity[0])
+
+    def get_speed_y(self):
+        return int(self.velocity[1])
+
+    def get_speed_z(self):
+        return int(self.velocity[2])
+
+    def get_flight_time(self):
+        return int(self.flight_time)
+
+    def get_distance_tof(self):
+        return max(10, int(self.height))
+
+    def _nearest_pad(self):
+        best = None
+        for pad_id, (px, py) in self.pad_positions.items():
+            distance = math.hypot(self.x - px, self.y - py)
+            if distance < 60 and (best is None or distance < best[1]):
+                best = (pad_id, distance, px, py)
+        return best
+
+    def get_mission_pad_id(self):
+        """Pad id under the downward camera, -1 if none, -2 if detection is off."""
+        with self._lock:
+            if not self.mission_pads:
+                return -2
+            pad = self._nearest_pad()
+            if self.flying and 20 <= self.height <= 150 and pad is not None:
+                return pad[0]
+            return -1
+
+    def get_mission_pad_distance_x(self):
+        with self._lock:
+            pad = self._nearest_pad()
+            return int(self.x - pad[2]) if pad else 0
+
+    def get_mission_pad_distance_y(self):
+        with self._lock:
+            pad = self._nearest_pad()
+            return int(self.y - pad[3]) if pad else 0
+
+    def get_mission_pad_distance_z(self):
+        return self.get_height()
+
+    # Rendering
+
+    def _focal(self):
+        return (self.frame_size[0] / 2) / math.tan(math.radians(self.hfov / 2))
+
+    def horizon_row(self):
+        """Image row of the horizon; rows above it never see the floor."""
+        return self.frame_size[1] / 2 - self._focal() * math.tan(math.radians(self.camera_pitch))
+
+    def camera_homography(self):
+        """Homography mapping floor pixels to camera pixels for the current pose."""
+        width, height = self.frame_size
+        focal = self._focal()
+        K = np.array([[focal, 0, width / 2], [0, focal, height / 2], [0, 0, 1]])
+
+        (fx, fy), (rx, ry) = self._heading()
+        pitch = math.radians(self.camera_pitch)
+        camera = np.array([self.x, self.y, max(self.height, 1.0)])
+        right = np.array([rx, ry, 0.0])
+        forward = np.array([fx, fy, 0.0])
+        up = np.array([0.0, 0.0, 1.0])
+        optical = math.cos(pitch) * forward - math.sin(pitch) * up
+        down = -math.cos(pitch) * up - math.sin(pitch) * forward
+
+        # A floor point (a, b, 0) projects through rows [axis_a, axis_b, -axis . camera].
+        M = np.array([[axis[0], axis[1], -axis.dot(camera)] for axis in (right, down, optical)])
+        return K @ M
+
+    def render(self):
+        """Render the forward camera view; cached until the pose changes."""
+        with self._lock:
+            if self._frame_cache is None:
+                frame = cv2.warpPerspective(
+                    self._floor, self.camera_homography(), self.frame_size,
+                    flags=cv2.INTER_NEAREST, borderValue=FLOOR_COLOR)
+                # Rows near the horizon sample the floor at huge distances, and
+                # rows above it would mirror the floor behind the camera.
+                horizon = int(math.ceil(self.horizon_row())) + 2
+                if horizon > 0:
+                    frame[:min(horizon, frame.shape[0])] = WALL_COLOR
+                self._frame_cache = frame
+            return self._frame_cache
+
+
+class VirtualTimer:
+    """Stands in for the worker's control QTimer; ``run_mission`` drives the ticks itself."""
+
+    def __init__(self):
+        self.interval_ms = None
+        self.active = False
+
+    def start(self, ms):
+        self.interval_ms, self.active = ms, True
+
+    def stop(self):
+        self.active = False
+
+    def isActive(self):
+        return self.active
+
+    def moveToThread(self, thread):
+        pass
+
+
+# Commands sent before takeoff only set the drone up and are not counted.
+SETUP_COMMANDS = ("command", "speed", "streamon", "streamoff")
+
+
+def run_mission(drone=None, tick_scale=1.0, inference_time=STUB_INFERENCE_TIME, max_sim_time=600.0,
+                stepwise_approach=False, trace_dir=None, adaptive_rate=True, power_save=False):
+    """Fly one ``DroneWorker`` mission on virtual time and return its metrics.
+
+    The worker's control ticks are driven directly instead of by its QTimer:
+    each tick costs ``inference_time`` per model call plus whatever its
+    commands take, and the next one starts one state tick period (times
+    ``tick_scale``) after the previous one did, or immediately if the tick
+    overran. Inference time passes between capture and command, so the
+    drone keeps moving under its rc sticks meanwhile. ``stepwise_approach``
+    flies the original rotate/step pad alignment instead of ``PadApproach``.
+    With ``trace_dir`` the frame trace is saved there, on virtual time.
+    ``adaptive_rate=False`` keeps every state's fixed tick period; otherwise
+    the rate controller adapts it, with ``power_save`` as on a battery board.
+    The host's CPU load says nothing about virtual time, so it is not used.
+    """
+    # Imported here so rendering and the stubs do not pull in Qt and YOLO.
+    import shiboken6
+    from drone_worker import DroneWorker
+
+    drone = drone or SimulatedDrone()
+    drone.reset()
+    worker = DroneWorker(drone_factory=lambda: drone)
+    # There is no event loop here to run the QTimer on; delete it on this,
+    # its owning thread, rather than leave it to be torn down later
+    timer, worker.control_loop_timer = worker.control_loop_timer, VirtualTimer()
+    timer.stop()
+    shiboken6.delete(timer)
+    worker.path_model, worker.pad_model = load_stub_models(inference_time, drone.advance)
+    worker._sleep = drone.advance
+    worker.tick_scale = tick_scale
+    if stepwise_approach:
+        worker.pad_approach = None
+    worker.trace_dir = trace_dir
+    worker.rate_control.enabled = adaptive_rate
+    worker.rate_control.power_save = power_save
+    worker.rate_control.cpu = None
+    # Time states and frame latency on the virtual clock too
+    worker.use_clock(lambda: drone.clock)
+
+    wall_start = time.perf_counter()
+    worker.run()
+    worker.start_drone_mission()
+
+    ticks = 0
+    while worker._is_running and drone.clock < max_sim_time:
+        tick_start = drone.clock
+        worker.tick()
+        ticks += 1
+        drone.advance(worker.current_tick_ms() / 1000 - (drone.clock - tick_start))
+    timed_out = worker._is_running
+    if timed_out:
+        worker.stop_worker()
+    wall = time.perf_counter() - wall_start
+
+    flight_commands = [c for c in drone.commands if c[0] not in SETUP_COMMANDS]
+    return {
+        "landed": not drone.flying and not timed_out,
+        "on_pad": not drone.flying and drone.distance_to_pad() <= drone.pad_size / 2,
+        "pad_distance_cm": round(drone.distance_to_pad(), 1),
+        "duration_s": round(drone.clock, 2),
+        "commands": len(flight_commands),
+        "ticks": ticks,
+        "approach": worker.approach_reports[-1] if worker.approach_reports else None,
+        "command_stats": worker.command_reports[-1] if worker.command_reports else None,
+        "frame_age": worker.trace_reports[-1] if worker.trace_reports else None,
+        "rates": worker.rate_reports[-1] if worker.rate_reports else None,
+        "inference_calls": sum(worker.inference_counts.values()),
+        "pad_gate": worker.pad_gate.stats() if worker.pad_gate else None,
+        "states": [record["to"] for record in worker.mission.history],
+        "battery_used": round(drone.initial_battery - drone.battery, 2),
+        "wall_s": round(wall, 3),
+        "speedup": round(drone.clock / wall, 1) if wall > 0 else None,
+    }
+
+
+def record_replay(drone=None, duration=60.0, frame_interval=0.05, telemetry_interval=0.1,
+                  inference_time=0.25, command_delay=0.1, seed=0):
+    """Hover over the path under random rc gusts and log frames and telemetry.
+
+    Every frame gets the path centroid's horizontal offset and a decision time
+    ``inference_time`` (with jitter) after capture; telemetry arrives at the
+    Tello's 10 Hz. The result is what ``latency.evaluate_replay`` scores.
+    """
+    from path_geometry import mask_centroid, mask_to_uint8
+
+    rng = np.random.default_rng(seed)
+    drone = drone or SimulatedDrone()
+    drone.reset()
+    drone.takeoff()
+    drone.move_down(30)
+    x0, yaw0 = drone.x, drone.yaw
+    segmenter = StubSegmentationModel()
+
+    events = []
+    start = drone.clock
+    next_gust = next_telemetry = start
+    gust = (0, 0)
+    while drone.clock - start < duration:
+        now = drone.clock
+        if now >= next_gust:
+            gust = (int(rng.integers(-20, 21)), int(rng.integers(-30, 31)))
+            next_gust = now + float(rng.uniform(0.4, 1.2))
+        # Gusts plus a weak pull back over the path so the ribbon stays in view
+        drift = (drone.yaw - yaw0 + 180) % 360 - 180
+        drone.send_rc_control(gust[0] - 0.5 * (drone.x - x0), 0, 0, gust[1] - 1.5 * drift)
+
+        if now >= next_telemetry:
+            events.append({"type": "telemetry", "t": now, "yaw": drone.get_yaw(),
+                           "vx": drone.get_speed_x(), "vy": drone.get_speed_y(),
+                           "height": drone.get_height()})
+            next_telemetry += telemetry_interval
+
+        offset, width = None, None
+        masks = segmenter.predict(drone.render())[0].masks
+        if masks is not None:
+            mask = masks.data.cpu().numpy()[0]
+            centroid = mask_centroid(mask_to_uint8(mask))
+            if centroid is not None:
+                width = mask.shape[1]
+                offset = centroid[0] - width / 2
+        delay = inference_time * float(rng.uniform(0.8, 1.2))
+        events.append({"type": "frame", "t": now, "decision_t": now + delay,
+                       "offset": offset, "width": width})
+        drone.advance(frame_interval)
+
+    events.sort(key=lambda e: e["t"])
+    return {
+        "meta": {"source": "simulation", "hfov": drone.hfov, "camera_pitch": drone.camera_pitch,
+                 "width": 640, "command_delay": command_delay, "seed": seed},
+        "events": events,
+    }
+
+
+def run_batch(courses=None, repeats=1, **kwargs):
+    """Run ``run_mission`` over named ``COURSES``; returns one result per run."""
+    results = []
+    for name in courses or list(COURSES):
+        drone = SimulatedDrone(**COURSES[name])
+        for _ in range(repeats):
+            result = run_mission(drone, **kwargs)
+            result["course"] = name
+            results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fly simulated missions faster than real time.")
+    parser.add_argument("--courses", nargs="*", choices=sorted(COURSES), default=None)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--tick-scale", type=float, default=1.0,
+                        help="multiplier on every mission state's tick period")
+    parser.add_argument("--inference-time", type=float, default=STUB_INFERENCE_TIME,
+                        help="simulated seconds per 640 px model inference (0 for none)")
+    parser.add_argument("--stepwise-approach", action="store_true",
+                        help="approach the pad with the original 5°/20 cm steps")
+    parser.add_argument("--trace-dir", metavar="DIR", help="save each run's frame trace here")
+    parser.add_argument("--fixed-rate", action="store_true",
+                        help="keep every state's own tick period instead of adapting it")
+    parser.add_argument("--power-save", action="store_true", help="adapt rates as on a battery-powered board")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_batch(args.courses, args.repeats, tick_scale=args.tick_scale,
+                        inference_time=args.inference_time,
+                        stepwise_approach=args.stepwise_approach, trace_dir=args.trace_dir,
+                        adaptive_rate=not args.fixed_rate, power_save=args.power_save)
+    for r in results:
+        print(f"{r['course']:<12} {'on pad' if r['on_pad'] else 'MISSED':<7} "
+              f"{r['duration_s']:7.1f} s  {r['commands']:4d} commands  {r['ticks']:4d} ticks  "
+              f"x{r['speedup']} real time")
+        if r["approach"]:
+            a = r["approach"]
+            print(f"{'':<12} approach ({a['mode']}): {a['commands']} commands, {a['duration_s']} s")
+        if r["command_stats"]:
+            c = r["command_stats"]
+            busiest = ", ".join(f"{name} {s['total_s']:.1f} s" for name, s in list(c["commands"].items())[:3])
+            print(f"{'':<12} waiting on commands: {c['wait_s']:.1f} s ({c['wait_fraction']:.0%}); {busiest}")
+        if r["frame_age"]:
+            age = r["frame_age"]["age_ms"]
+            print(f"{'':<12} frame age at command: p50 {age['p50']:.0f} ms, p95 {age['p95']:.0f} ms, "
+                  f"p99 {age['p99']:.0f} ms")
+        if r["rates"]:
+            ticks = ", ".join(f"{name} {s['mean_tick_ms']} ms" for name, s in r["rates"]["states"].items())
+            print(f"{'':<12} mean tick: {ticks}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0 if all(r["landed"] and r["on_pad"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+# File: soak.py
+"""
+Long-running soak test of the full GUI pipeline against a simulated drone.
+
+Missions are flown back to back through ``DroneGUI`` -- worker thread,
+``CameraThread``, segmentation/detection threads and the three
+``VideoDisplay`` views -- with a ``SimulatedDrone`` and stub models, and with
+the control tick and command sleeps shortened by ``speedup``. RSS, thread
+count, open handles and traced Python memory are sampled throughout; once the
+warm-up is over the growth of each is checked against a budget, and the report
+lists the call sites whose allocations grew the most.
+
+    python src/soak.py --duration 3600 --speedup 20 --report soak_report.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QMetaObject, Qt, QTimer
+from PySide6.QtWidgets import QApplication
+
+from drone_worker import DroneWorker
+from main_window_final import DroneGUI
+from simulation import SimulatedDrone, load_stub_models
+
+try:
+    import psutil
+except ImportError:  # psutil is optional; fall back to /proc where available
+    psutil = None
+
+
+class SoakBudget:
+    """Allowed growth between the end of warm-up and the end of the run."""
+
+    def __init__(self, rss_mb=64.0, traced_mb=16.0, threads=4, handles=16):
+        self.rss_mb = rss_mb
+        self.traced_mb = traced_mb
+        self.threads = threads
+        self.handles = handles
+
+
+class ResourceSampler:
+    """Samples process resources; every value is ``None`` when unavailable."""
+
+    def __init__(self):
+        self.process = psutil.Process() if psutil else None
+
+    def rss_mb(self):
+        if self.process:
+            return self.process.memory_info().rss / 2 ** 20
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+        except (OSError, ValueError):
+            return None
+
+    def threads(self):
+        if self.process:
+            return self.process.num_threads()
+        return threading.active_count()
+
+    def handles(self):
+        if self.process:
+            if hasattr(self.process, "num_fds"):
+                return self.process.num_fds()
+            return self.process.num_handles()
+        try:
+            return len(os.listdir("/proc/self/fd"))
+        except OSError:
+            return None
+
+    def sample(self, elapsed, missions):
+        traced, _ = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "missions": missions,
+            "rss_mb": self.rss_mb(),
+            "traced_mb": traced / 2 ** 20,
+            "threads": self.threads(),
+            "python_threads": threading.active_count(),
+            "handles": self.handles(),
+        }
+
+
+def top_allocators(before, after, limit=15):
+    """Call sites whose traced memory grew most between two snapshots."""
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "traceback")
+    sites = []
+    for stat in stats[:limit]:
+        if stat.size_diff <= 0:
+            continue
+        sites.append({
+            "size_diff_kb": round(stat.size_diff / 1024, 1),
+            "count_diff": stat.count_diff,
+            # Most recent frame first: that is the line that allocated.
+            "traceback": [f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback)],
+        })
+    return sites
+
+
+class SoakRunner:
+    """Flies simulated missions through ``DroneGUI`` until ``duration`` elapses."""
+
+    def __init__(self, duration=600.0, speedup=20.0, warmup=60.0, sample_interval=5.0,
+                 mission_timeout=120.0, budget=None, trace_frames=10, persistent=False):
+        self.duration = duration
+        self.speedup = speedup
+        self.warmup = warmup
+        self.sample_interval = sample_interval
+        self.mission_timeout = mission_timeout
+        self.budget = budget or SoakBudget()
+        self.trace_frames = trace_frames
+        # Re-arm between missions instead of restarting the threads
+        self.persistent = persistent
+
+        self.samples = []
+        self.missions = 0
+        self.sampler = ResourceSampler()
+
+    def _make_gui(self):
+        drone = SimulatedDrone()
+        worker = DroneWorker(drone_factory=lambda: drone)
+        worker.path_model, worker.pad_model = load_stub_models()
+        worker.tick_scale = 1 / self.speedup
+        worker.sleep_scale = 1 / self.speedup
+        worker.use_clock(lambda: drone.clock)
+        return drone, DroneGUI(worker=worker, persistent=self.persistent)
+
+    def _fly_mission(self, gui, drone):
+        # The worker times everything from drone.clock, which must not go back
+        drone.reset(keep_clock=True)
+        loop = QEventLoop()
+        gui.worker.signals.mission_finished.connect(loop.quit)
+        watchdog = QTimer()
+        watchdog.setSingleShot(True)
+        watchdog.timeout.connect(gui.land_btn.click)
+        watchdog.start(int(self.mission_timeout * 1000))
+        gui.takeoff_btn.click()
+        loop.exec()
+        watchdog.stop()
+        gui.worker.signals.mission_finished.disconnect(loop.quit)
+        self.missions += 1
+
+    def run(self):
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        tracemalloc.start(self.trace_frames)
+        start = time.monotonic()
+        elapsed = lambda: time.monotonic() - start
+
+        drone, gui = self._make_gui()
+        sample_timer = QTimer()
+        sample_timer.timeout.connect(
+            lambda: self.samples.append(self.sampler.sample(elapsed(), self.missions)))
+        sample_timer.start(int(self.sample_interval * 1000))
+
+        baseline = None
+        baseline_snapshot = None
+        try:
+            while elapsed() < self.duration:
+                self._fly_mission(gui, drone)
+                if baseline is None and elapsed() >= self.warmup:
+                    baseline = self.sampler.sample(elapsed(), self.missions)
+                    baseline_snapshot = tracemalloc.take_snapshot()
+            final = self.sampler.sample(elapsed(), self.missions)
+            final_snapshot = tracemalloc.take_snapshot()
+        finally:
+            sample_timer.stop()
+            self._shutdown(app, gui)
+            tracemalloc.stop()
+
+        if baseline is None:
+            # The run was shorter than the warm-up; measure from the first sample.
+            baseline = self.samples[0] if self.samples else final
+            baseline_snapshot = final_snapshot
+        return self._report(baseline, final, baseline_snapshot, final_snapshot)
+
+    def _shutdown(self, app, gui):
+        for thread in (gui.camera_thread, gui.segmentation_thread, gui.detection_thread):
+            if thread:
+                thread.stop()
+        # The control timer lives on the worker thread and must be stopped there.
+        QMetaObject.invokeMethod(gui.worker.control_loop_timer, "stop",
+                                 Qt.BlockingQueuedConnection)
+        gui.worker_thread.quit()
+        gui.worker_thread.wait()
+        gui.close()
+        app.processEvents()
+
+    def _report(self, baseline, final, before, after):
+        growth = {}
+        for key in ("rss_mb", "traced_mb", "threads", "handles"):
+            if baseline.get(key) is None or final.get(key) is None:
+                growth[key] = None
+            else:
+                growth[key] = final[key] - baseline[key]
+        limits = {"rss_mb": self.budget.rss_mb, "traced_mb": self.budget.traced_mb,
+                  "threads": self.budget.threads, "handles": self.budget.handles}
+        failures = [f"{key} grew by {growth[key]:.1f} (budget {limit})"
+                    for key, limit in limits.items()
+                    if growth[key] is not None and growth[key] > limit]
+        return {
+            "passed": not failures,
+            "failures": failures,
+            "missions": self.missions,
+            "speedup": self.speedup,
+            "simulated_hours": round(final["elapsed_s"] * self.speedup / 3600, 3),
+            "baseline": baseline,
+            "final": final,
+            "growth": growth,
+            "budget": limits,
+            "top_allocators": top_allocators(before, after),
+            "samples": self.samples,
+        }
+
+
+def format_report(report):
+    lines = [
+        f"Soak {'PASSED' if report['passed'] else 'FAILED'}: {report['missions']} missions, "
+        f"~{report['simulated_hours']} simulated hours at {report['speedup']}x",
+    ]
+    for key, value in report["growth"].items():
+        shown = "n/a" if value is None else f"{value:+.1f}"
+        lines.append(f"  {key:<10} {shown:>10}   (budget {report['budget'][key]})")
+    lines.extend(f"  ! {failure}" for failure in report["failures"])
+    if report["top_allocators"]:
+        lines.append("Top allocation growth:")
+        for site in report["top_allocators"][:10]:
+            lines.append(f"  {site['size_diff_kb']:+10.1f} KiB  {site['traceback'][0]}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak-test the pipeline against a simulated drone.")
+    parser.add_argument("--duration", type=float, default=600.0, help="wall-clock seconds to run")
+    parser.add_argument("--speedup", type=float, default=20.0, help="simulated time per real second")
+    parser.add_argument("--warmup", type=float, default=60.0, help="seconds before the baseline sample")
+    parser.add_argument("--sample-interval", type=float, default=5.0)
+    parser.add_argument("--rss-mb", type=float, default=64.0)
+    parser.add_argument("--traced-mb", type=float, default=16.0)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--handles", type=int, default=16)
+    parser.add_argument("--report", default="soak_report.json", help="JSON report path")
+    parser.add_argument("--persistent", action="store_true", help="re-arm between missions (warm session)")
+    args = parser.parse_args(argv)
+
+    runner = SoakRunner(
+        duration=args.duration, speedup=args.speedup, warmup=args.warmup,
+        sample_interval=args.sample_interval,
+        budget=SoakBudget(args.rss_mb, args.traced_mb, args.threads, args.handles),
+        persistent=args.persistent,
+    )
+    report = runner.run()
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(format_report(report))
+    print(f"Report written to {args.report}")
+    return 0 if report["passed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+# File: telemetry_plot.py
+"""
+Scrolling telemetry plots for the GUI.
+
+``DroneWorker`` emits a telemetry dict on every tick. ``TelemetryPanel`` keeps
+the last ``capacity`` samples of each channel in a fixed-size NumPy ring
+(``RingBuffer``). An hours-long session therefore holds the same memory as a
+one-minute one, and appending a sample is two array stores.
+
+Drawing never touches every sample. The visible window is reduced to the
+minimum and maximum per pixel column (``decimate``), so a strip draws at most
+two vertices per column however many samples it covers. Short spikes still
+show. Samples only mark the panel dirty; it repaints at most ``max_fps``
+times a second.
+
+    panel = TelemetryPanel(window_s=300)
+    worker.signals.telemetry_updated.connect(panel.add_sample)
+"""
+import math
+import time
+from collections import deque
+
+import numpy as np
+from PySide6.QtCore import QByteArray, QDataStream, QIODevice, QRectF, QTimer, Qt
+from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtWidgets import QWidget
+
+
+# (telemetry key, label, unit, colour), top to bottom
+CHANNELS = (
+    ("altitude", "Altitude", "cm", "#4fc3f7"),
+    ("battery", "Battery", "%", "#81c784"),
+    ("yaw", "Yaw", "°", "#ffb74d"),
+    ("inference_ms", "Inference", "ms", "#ba68c8"),
+    ("command_ms", "Command", "ms", "#e57373"),
+    ("tick_ms", "Tick", "ms", "#90a4ae"),
+)
+
+
+class RingBuffer:
+    """The newest ``capacity`` ``(t, value)`` samples, in preallocated arrays.
+
+    Times must not go backwards; ``window`` relies on them being sorted.
+    """
+
+    def __init__(self, capacity=16384):
+        self.capacity = capacity
+        self.t = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        # Samples ever appended; the next one goes to ``count % capacity``
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, t, value):
+        i = self.count % self.capacity
+        self.t[i] = t
+        self.values[i] = value
+        self.count += 1
+
+    def latest(self):
+        """The newest ``(t, value)``, or ``None`` when empty."""
+        if not self.count:
+            return None
+        i = (self.count - 1) % self.capacity
+        return self.t[i], self.values[i]
+
+    def window(self, start=-math.inf):
+        """``(t, values)`` of the samples at or after ``start``, oldest first.
+
+        Copies only those samples, not the whole ring.
+        """
+        if self.count <= self.capacity:
+            n = self.count
+            first = np.searchsorted(self.t[:n], start)
+            return self.t[first:n], self.values[first:n]
+        # Wrapped: [head:] holds the oldest samples, [:head] the newest
+        head = self.count % self.capacity
+        older = np.searchsorted(self.t[head:], start)
+        if older < self.capacity - head:
+            parts = (slice(head + older, None), slice(0, head))
+        else:
+            parts = (slice(np.searchsorted(self.t[:head], start), head),)
+        return (np.concatenate([self.t[part] for part in parts]),
+                np.concatenate([self.values[part] for part in parts]))
+
+
+def decimate(t, values, start, end, columns):
+    """Min/max of ``values`` per pixel column for times ``start`` to ``end``.
+
+    ``t`` is sorted. Returns ``(column, low, high)`` arrays with one entry per
+    column that has samples, so at most ``columns`` entries.
+    """
+    if len(t) == 0 or columns <= 0 or end <= start:
+        empty = np.zeros(0)
+        return empty.astype(np.intp), empty, empty
+    column = ((t - start) * (columns / (end - start))).astype(np.intp)
+    np.clip(column, 0, columns - 1, out=column)
+    # Sorted times give non-decreasing columns: each run is one pixel
+    starts = np.flatnonzero(np.concatenate(([True], column[1:] != column[:-1])))
+    return column[starts], np.minimum.reduceat(values, starts), np.maximum.reduceat(values, starts)
+
+
+def polygon(xs, ys):
+    """A ``QPolygonF`` from coordinate arrays, without a ``QPointF`` per vertex.
+
+    Built from bytes in ``QDataStream``'s layout (a big-endian count, then
+    double x/y pairs), which is an order of magnitude faster than a list of
+    points.
+    """
+    coords = np.empty(2 * len(xs), dtype=">f8")
+    coords[0::2] = xs
+    coords[1::2] = ys
+    data = QByteArray(np.array([len(xs)], dtype=">u4").tobytes() + coords.tobytes())
+    result = QPolygonF()
+    QDataStream(data, QIODevice.ReadOnly) >> result
+    return result
+
+
+class TelemetryPanel(QWidget):
+    """Stacked strip charts of the telemetry channels over the last ``window_s`` seconds."""
+
+    STRIP_GAP = 4
+
+    def __init__(self, channels=CHANNELS, window_s=300.0, capacity=16384, max_fps=5.0,
+                 clock=time.monotonic, parent=None):
+        super().__init__(parent)
+        self.channels = channels
+        self.window_s = window_s
+        self.clock = clock
+        self.interval_ms = 1000.0 / max_fps
+        self.buffers = {key: RingBuffer(capacity) for key, *_ in channels}
+        # Repaints requested, and how long the latest paints took
+        self.redraws = 0
+        self.paint_times = deque(maxlen=100)
+        self._dirty = False
+        self._last_redraw = -math.inf
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._redraw)
+        self.setMinimumHeight(40 * len(channels))
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def add_sample(self, data, t=None):
+        """Append every channel present in telemetry dict ``data``; others are skipped."""
+        t = self.clock() if t is None else t
+        added = False
+        for key, buffer in self.buffers.items():
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                buffer.append(t, value)
+                added = True
+        if added:
+            self._schedule()
+
+    def clear(self):
+        for buffer in self.buffers.values():
+            buffer.count = 0
+        self._schedule()
+
+    def _schedule(self):
+        self._dirty = True
+        if self._timer.isActive():
+            return
+        wait_ms = self.interval_ms - (time.monotonic() - self._last_redraw) * 1000
+        if wait_ms <= 0:
+            self._redraw()
+        else:
+            self._timer.start(int(wait_ms) + 1)
+
+    def _redraw(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        self._last_redraw = time.monotonic()
+        self.redraws += 1
+        self.update()
+
+    def plot_data(self, columns, now=None):
+        """Per channel key: ``(column, low, high)`` for a plot ``columns`` pixels wide."""
+        end = self.clock() if now is None else now
+        start = end - self.window_s
+        return {key: decimate(*buffer.window(start), start, end, columns)
+                for key, buffer in self.buffers.items()}
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#1e1e1e"))
+        height = self.height() / len(self.channels)
+        width = self.width()
+        data = self.plot_data(width)
+        for row, (key, label, unit, colour) in enumerate(self.channels):
+            rect = QRectF(0, row * height + self.STRIP_GAP / 2, width, height - self.STRIP_GAP)
+            self._paint_strip(painter, rect, data[key], self.buffers[key].latest(), label, unit, colour)
+        painter.end()
+        self.paint_times.append(time.perf_counter() - started)
+
+    def _paint_strip(self, painter, rect, decimated, latest, label, unit, colour):
+        painter.fillRect(rect, QColor("#262626"))
+        column, low, high = decimated
+        if len(column):
+            bottom, top = float(low.min()), float(high.max())
+            if top - bottom < 1e-9:
+                bottom, top = bottom - 1, top + 1
+            scale = (rect.height() - 4) / (top - bottom)
+            base = rect.bottom() - 2
+            xs = rect.left() + column + 0.5
+            # Down each column's min/max span, then on to the next column
+            ys = np.empty(2 * len(column))
+            ys[0::2] = base - (low - bottom) * scale
+            ys[1::2] = base - (high - bottom) * scale
+            painter.setPen(QPen(QColor(colour), 1))
+            painter.drawPolyline(polygon(np.repeat(xs, 2), ys))
+            painter.setPen(QColor("#9e9e9e"))
+            painter.drawText(rect.adjusted(0, 0, -6, 0), Qt.AlignRight | Qt.AlignTop, f"{top:g}")
+            painter.drawText(rect.adjusted(0, 0, -6, 0), Qt.AlignRight | Qt.AlignBottom, f"{bottom:g}")
+        text = label if latest is None else f"{label}: {latest[1]:g} {unit}"
+        # On a backing box so a dense trace cannot hide it
+        box = painter.boundingRect(rect.adjusted(6, 0, 0, 0), Qt.AlignLeft | Qt.AlignTop, text)
+        painter.fillRect(box.adjusted(-3, 0, 3, 0), QColor(38, 38, 38, 200))
+        painter.setPen(QColor(colour))
+        painter.drawText(box, Qt.AlignLeft | Qt.AlignTop, text)
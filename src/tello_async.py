@@ -0,0 +1,631 @@
+# File: tello_async.py
+"""
+Asyncio client for the Tello SDK command, state and video ports.
+
+``AsyncTello`` speaks the SDK text protocol directly: commands are queued and
+sent back-to-back from a single sender task, every command is awaitable with
+its own timeout and retry budget, and the 10 Hz state stream is decoded into a
+shared ``TelloState`` snapshot so getters never cost a round trip.
+
+``TelloClient`` runs an ``AsyncTello`` on a private event loop thread and
+exposes the synchronous djitellopy-style API used by ``DroneWorker``, so it can
+be passed as the worker's ``drone_factory`` in place of ``djitellopy.Tello``.
+"""
+import asyncio
+import queue
+import threading
+import time
+
+import cpu_budget
+
+TELLO_HOST = "192.168.10.1"
+COMMAND_PORT = 8889
+STATE_PORT = 8890
+VIDEO_PORT = 11111
+
+RESPONSE_TIMEOUT = 7.0
+TAKEOFF_TIMEOUT = 20.0
+RETRY_COUNT = 3
+
+# Tello splits every encoded frame into datagrams of this size; a shorter
+# datagram closes the frame.
+VIDEO_PACKET_SIZE = 1460
+
+
+class TelloError(Exception):
+    """Raised when the drone rejects a command or never answers it."""
+
+
+def decode_state(packet):
+    """Decode a ``key:value;`` Tello state datagram into a dict of numbers."""
+    if isinstance(packet, bytes):
+        packet = packet.decode("ascii", errors="ignore")
+
+    state = {}
+    for field in packet.strip().split(";"):
+        if ":" not in field:
+            continue
+        key, value = field.split(":", 1)
+        if key == "mpry":
+            try:
+                state[key] = [int(v) for v in value.split(",")]
+            except ValueError:
+                state[key] = value
+            continue
+        try:
+            state[key] = int(value)
+        except ValueError:
+            try:
+                state[key] = float(value)
+            except ValueError:
+                state[key] = value
+    return state
+
+
+class TelloState:
+    """Latest decoded state packet, shared between the listener and readers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._updated = threading.Condition(self._lock)
+        self.timestamp = None
+        self.packets = 0
+
+    def update(self, values, timestamp=None):
+        with self._lock:
+            self._values.update(values)
+            self.timestamp = time.monotonic() if timestamp is None else timestamp
+            self.packets += 1
+            self._updated.notify_all()
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._values.get(key, default)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def wait_for_packet(self, timeout=None):
+        """Block until at least one state packet has arrived."""
+        with self._lock:
+            return self._updated.wait_for(lambda: self.packets > 0, timeout)
+
+    @property
+    def age(self):
+        """Seconds since the last packet, or ``None`` before the first one."""
+        with self._lock:
+            if self.timestamp is None:
+                return None
+            return time.monotonic() - self.timestamp
+
+
+class FrameRead:
+    """Latest decoded video frame, mirroring djitellopy's ``BackgroundFrameRead``.
+
+    Each frame gets an increasing ``frame_id`` and the ``timestamp`` at which
+    its first video datagram arrived, the closest we get to when it was shot;
+    ``decoded_at`` is when it became available here.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.frame_id = 0
+        self.timestamp = None
+        self.decoded_at = None
+        self.stopped = False
+        self._lock = threading.Lock()
+
+    def publish(self, frame, timestamp):
+        with self._lock:
+            self.frame = frame
+            self.frame_id += 1
+            self.timestamp = timestamp
+            self.decoded_at = time.monotonic()
+
+    def snapshot(self):
+        """``(frame, frame_id, timestamp)`` of one frame, consistent with each other."""
+        with self._lock:
+            return self.frame, self.frame_id, self.timestamp
+
+    def stop(self):
+        self.stopped = True
+
+
+class _VideoDecoder(threading.Thread):
+    """Decodes reassembled H.264 access units off the event loop thread."""
+
+    def __init__(self, frame_read, maxsize=4):
+        super().__init__(name="tello-video-decoder", daemon=True)
+        import av  # PyAV ships with djitellopy; imported here so it stays optional
+
+        self.codec = av.CodecContext.create("h264", "r")
+        budget = cpu_budget.active()
+        if budget is not None and budget.av_threads:
+            self.codec.thread_count = budget.av_threads
+        self.frame_read = frame_read
+        self.units = queue.Queue(maxsize=maxsize)
+
+    def submit(self, data, received=None):
+        unit = (data, time.monotonic() if received is None else received)
+        try:
+            self.units.put_nowait(unit)
+        except queue.Full:
+            # Drop the oldest unit rather than fall behind the live stream.
+            try:
+                self.units.get_nowait()
+            except queue.Empty:
+                pass
+            self.units.put_nowait(unit)
+
+    def run(self):
+        cpu_budget.enter("decode")
+        while not self.frame_read.stopped:
+            try:
+                data, received = self.units.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                for packet in self.codec.parse(data):
+                    for frame in self.codec.decode(packet):
+                        self.frame_read.publish(frame.to_ndarray(format="rgb24"), received)
+            except Exception:
+                # Corrupt units are expected on a lossy link; wait for the next one.
+                continue
+
+
+class _CommandProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client):
+        self.client = client
+
+    def datagram_received(self, data, addr):
+        self.client._on_response(data)
+
+
+class _StateProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client):
+        self.client = client
+
+    def datagram_received(self, data, addr):
+        self.client.state.update(decode_state(data))
+
+
+class _VideoProtocol(asyncio.DatagramProtocol):
+    def __init__(self, decoder):
+        self.decoder = decoder
+        self.buffer = bytearray()
+        self.started = None
+
+    def datagram_received(self, data, addr):
+        if not self.buffer:
+            self.started = time.monotonic()
+        self.buffer += data
+        if len(data) != VIDEO_PACKET_SIZE:
+            self.decoder.submit(bytes(self.buffer), self.started)
+            self.buffer.clear()
+
+
+class AsyncTello:
+    """Awaitable Tello SDK client with a pipelined command queue.
+
+    Commands submitted while another is in flight are queued and sent the
+    moment the previous response arrives, from the same event loop, so callers
+    never pay a thread wake-up between commands. ``submit`` returns a future
+    immediately; ``command`` awaits it and raises ``TelloError`` on an
+    ``error`` reply or once all retries have timed out.
+    """
+
+    def __init__(self, host=TELLO_HOST, command_port=COMMAND_PORT,
+                 state_port=STATE_PORT, video_port=VIDEO_PORT,
+                 timeout=RESPONSE_TIMEOUT, retries=RETRY_COUNT, bind_host="0.0.0.0"):
+        self.address = (host, command_port)
+        self.state_port = state_port
+        self.video_port = video_port
+        self.timeout = timeout
+        self.retries = retries
+        self.bind_host = bind_host
+
+        self.state = TelloState()
+        self.frame_read = None
+
+        self.commands_sent = 0
+        self.retry_count = 0
+        self.timeout_count = 0
+
+        self._command_transport = None
+        self._state_transport = None
+        self._video_transport = None
+        self._decoder = None
+        self._responses = None
+        self._pending = None
+        self._sender = None
+        # (exchange task, future) of the command on the wire, if any
+        self._inflight = None
+
+    async def start(self):
+        """Open the command and state sockets and start the sender task."""
+        loop = asyncio.get_running_loop()
+        self._responses = asyncio.Queue()
+        self._pending = asyncio.Queue()
+        self._command_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _CommandProtocol(self), local_addr=(self.bind_host, 0))
+        if self.state_port is not None:
+            self._state_transport, _ = await loop.create_datagram_endpoint(
+                lambda: _StateProtocol(self), local_addr=(self.bind_host, self.state_port))
+            self.state_port = self._state_transport.get_extra_info("sockname")[1]
+        self._sender = loop.create_task(self._send_loop())
+
+    async def close(self):
+        if self._sender:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+        self.preempt(TelloError("Client closed"))
+        self.stop_video()
+        for transport in (self._command_transport, self._state_transport):
+            if transport:
+                transport.close()
+        self._command_transport = None
+        self._state_transport = None
+
+    async def start_video(self):
+        """Listen on the video port and decode frames into ``frame_read``."""
+        if self.frame_read is not None:
+            return self.frame_read
+        try:
+            frame_read = FrameRead()
+            self._decoder = _VideoDecoder(frame_read)
+        except ImportError as e:
+            raise TelloError(f"PyAV is required to decode the video stream: {e}")
+        loop = asyncio.get_running_loop()
+        self._video_transport, _ = await loop.create_datagram_endpoint(
+            lambda: _VideoProtocol(self._decoder), local_addr=(self.bind_host, self.video_port))
+        self.video_port = self._video_transport.get_extra_info("sockname")[1]
+        self._decoder.start()
+        self.frame_read = frame_read
+        return frame_read
+
+    def stop_video(self):
+        if self.frame_read is not None:
+            self.frame_read.stop()
+        if self._video_transport:
+            self._video_transport.close()
+        self._video_transport = None
+        self._decoder = None
+        self.frame_read = None
+
+    def submit(self, command, timeout=None, retries=None):
+        """Queue ``command`` and return a future for its response text."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.put_nowait((command, timeout, retries, future))
+        return future
+
+    async def send_command(self, command, timeout=None, retries=None):
+        """Send ``command`` and return the raw response text."""
+        return await self.submit(command, timeout, retries)
+
+    async def command(self, command, timeout=None, retries=None):
+        """Send a control command and raise ``TelloError`` unless it is acknowledged."""
+        response = await self.send_command(command, timeout, retries)
+        if response.lower() != "ok":
+            raise TelloError(f"Command '{command}' was unsuccessful: {response}")
+        return response
+
+    def send_rc(self, left_right, forward_backward, up_down, yaw):
+        """Send an ``rc`` datagram; the drone never acknowledges these."""
+        values = [max(-100, min(100, int(v))) for v in (left_right, forward_backward, up_down, yaw)]
+        self._command_transport.sendto("rc {} {} {} {}".format(*values).encode(), self.address)
+
+    def send_emergency(self):
+        """Stop the motors now, failing the command in flight and every one queued."""
+        self._command_transport.sendto(b"emergency", self.address)
+        self.preempt(TelloError("Cancelled by emergency stop"))
+
+    def preempt(self, error):
+        """Abandon the command in flight and fail it and every queued one with ``error``.
+
+        The next command goes out at once instead of waiting for the
+        abandoned one's reply or timeout.
+        """
+        if self._inflight is not None:
+            exchange, future = self._inflight
+            exchange.cancel()
+            if not future.done():
+                future.set_exception(error)
+        self._fail_pending(error)
+
+    async def _send_loop(self):
+        while True:
+            command, timeout, retries, future = await self._pending.get()
+            if future.done():
+                continue
+            exchange = asyncio.get_running_loop().create_task(self._exchange(command, timeout, retries))
+            self._inflight = (exchange, future)
+            try:
+                # wait() instead of awaiting the task, so preempt() cancelling
+                # the exchange does not cancel this loop
+                await asyncio.wait((exchange,))
+            except asyncio.CancelledError:
+                # The client is closing
+                exchange.cancel()
+                if not future.done():
+                    future.set_exception(TelloError("Client closed"))
+                raise
+            finally:
+                self._inflight = None
+            if future.done() or exchange.cancelled():
+                continue
+            if exchange.exception() is not None:
+                future.set_exception(exchange.exception())
+            else:
+                future.set_result(exchange.result())
+
+    async def _exchange(self, command, timeout, retries):
+        timeout = self.timeout if timeout is None else timeout
+        retries = self.retries if retries is None else retries
+        data = command.encode()
+        for attempt in range(retries + 1):
+            # A late answer to a timed-out command must not be read as ours.
+            while not self._responses.empty():
+                self._responses.get_nowait()
+            if attempt:
+                self.retry_count += 1
+            self._command_transport.sendto(data, self.address)
+            self.commands_sent += 1
+            try:
+                return await asyncio.wait_for(self._responses.get(), timeout)
+            except asyncio.TimeoutError:
+                self.timeout_count += 1
+        raise TelloError(f"Command '{command}' timed out after {retries + 1} attempts")
+
+    def _on_response(self, data):
+        self._responses.put_nowait(data.decode("utf-8", errors="ignore").strip())
+
+    def _fail_pending(self, error):
+        if self._pending is None:
+            return
+        while not self._pending.empty():
+            _, _, _, future = self._pending.get_nowait()
+            if not future.done():
+                future.set_exception(error)
+
+    # SDK commands
+
+    async def connect(self):
+        await self.command("command")
+
+    async def takeoff(self):
+        await self.command("takeoff", timeout=TAKEOFF_TIMEOUT)
+
+    async def land(self):
+        await self.command("land", timeout=TAKEOFF_TIMEOUT)
+
+    async def move(self, direction, x):
+        await self.command(f"{direction} {int(x)}")
+
+    async def rotate(self, direction, x):
+        await self.command(f"{direction} {int(x)}")
+
+    async def go_xyz_speed(self, x, y, z, speed):
+        await self.command(f"go {int(x)} {int(y)} {int(z)} {int(speed)}")
+
+    async def go_xyz_speed_mid(self, x, y, z, speed, mid):
+        await self.command(f"go {int(x)} {int(y)} {int(z)} {int(speed)} m{int(mid)}")
+
+    async def curve_xyz_speed(self, x1, y1, z1, x2, y2, z2, speed):
+        await self.command(
+            f"curve {int(x1)} {int(y1)} {int(z1)} {int(x2)} {int(y2)} {int(z2)} {int(speed)}")
+
+    async def query(self, name):
+        """Ask for a value the state stream does not carry, e.g. ``sn``."""
+        return await self.send_command(f"{name}?")
+
+
+class TelloClient:
+    """Synchronous djitellopy-compatible facade over ``AsyncTello``.
+
+    Commands block like ``djitellopy.Tello``; getters read the shared state
+    snapshot, falling back to a query only before the first state packet.
+    ``submit`` queues a command without waiting and returns a
+    ``concurrent.futures.Future``.
+    """
+
+    def __init__(self, host=TELLO_HOST, command_port=COMMAND_PORT,
+                 state_port=STATE_PORT, video_port=VIDEO_PORT,
+                 timeout=RESPONSE_TIMEOUT, retries=RETRY_COUNT, bind_host="0.0.0.0"):
+        self.client = AsyncTello(host, command_port, state_port, video_port,
+                                 timeout, retries, bind_host)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="tello-async", daemon=True)
+        self._thread.start()
+        try:
+            self._call(self.client.start())
+        except Exception:
+            self._stop_loop()
+            raise
+
+    @property
+    def state(self):
+        return self.client.state
+
+    @property
+    def command_retries(self):
+        """Resends so far, for ``command_stats.InstrumentedDrone``."""
+        return self.client.retry_count
+
+    def _call(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+        if not self._thread.is_alive():
+            # Releases the selector and its file descriptor
+            self._loop.close()
+
+    def submit(self, command, timeout=None, retries=None):
+        async def _submit():
+            return await self.client.send_command(command, timeout, retries)
+        return asyncio.run_coroutine_threadsafe(_submit(), self._loop)
+
+    def send_command_with_return(self, command, timeout=RESPONSE_TIMEOUT):
+        return self._call(self.client.send_command(command, timeout))
+
+    def send_control_command(self, command, timeout=RESPONSE_TIMEOUT):
+        self._call(self.client.command(command, timeout))
+        return True
+
+    def connect(self, wait_for_state=True):
+        self._call(self.client.connect())
+        if wait_for_state and self.client.state_port is not None:
+            self.state.wait_for_packet(timeout=RESPONSE_TIMEOUT)
+
+    def end(self):
+        if self._thread.is_alive():
+            self._call(self.client.close())
+            self._stop_loop()
+
+    # Flight commands
+
+    def takeoff(self):
+        self._call(self.client.takeoff())
+
+    def land(self):
+        self._call(self.client.land())
+
+    def emergency(self):
+        self._loop.call_soon_threadsafe(self.client.send_emergency)
+
+    def cancel_commands(self, reason="Cancelled"):
+        """Fail the blocked command and all queued ones without waiting for replies."""
+        self._loop.call_soon_threadsafe(self.client.preempt, TelloError(reason))
+
+    def send_rc_control(self, left_right_velocity, forward_backward_velocity,
+                        up_down_velocity, yaw_velocity):
+        self._loop.call_soon_threadsafe(self.client.send_rc, left_right_velocity,
+                                        forward_backward_velocity, up_down_velocity,
+                                        yaw_velocity)
+
+    def move_up(self, x):
+        self._call(self.client.move("up", x))
+
+    def move_down(self, x):
+        self._call(self.client.move("down", x))
+
+    def move_left(self, x):
+        self._call(self.client.move("left", x))
+
+    def move_right(self, x):
+        self._call(self.client.move("right", x))
+
+    def move_forward(self, x):
+        self._call(self.client.move("forward", x))
+
+    def move_back(self, x):
+        self._call(self.client.move("back", x))
+
+    def rotate_clockwise(self, x):
+        self._call(self.client.rotate("cw", x))
+
+    def rotate_counter_clockwise(self, x):
+        self._call(self.client.rotate("ccw", x))
+
+    def go_xyz_speed(self, x, y, z, speed):
+        self._call(self.client.go_xyz_speed(x, y, z, speed))
+
+    def go_xyz_speed_mid(self, x, y, z, speed, mid):
+        self._call(self.client.go_xyz_speed_mid(x, y, z, speed, mid))
+
+    def curve_xyz_speed(self, x1, y1, z1, x2, y2, z2, speed):
+        self._call(self.client.curve_xyz_speed(x1, y1, z1, x2, y2, z2, speed))
+
+    def set_speed(self, x):
+        self._call(self.client.command(f"speed {int(x)}"))
+
+    def enable_mission_pads(self):
+        self._call(self.client.command("mon"))
+
+    def disable_mission_pads(self):
+        self._call(self.client.command("moff"))
+
+    def set_mission_pad_detection_direction(self, x):
+        self._call(self.client.command(f"mdirection {int(x)}"))
+
+    # Video
+
+    def streamon(self):
+        self._call(self.client.command("streamon"))
+        self._call(self.client.start_video())
+
+    def streamoff(self):
+        self._call(self.client.command("streamoff"))
+        self._loop.call_soon_threadsafe(self.client.stop_video)
+
+    def get_frame_read(self):
+        if self.client.frame_read is None:
+            self._call(self.client.start_video())
+        return self.client.frame_read
+
+    # State getters
+
+    def _state_value(self, key, query):
+        value = self.state.get(key)
+        if value is None:
+            response = self._call(self.client.query(query))
+            # "height?" answers in decimetres, e.g. "8dm"
+            scale = 10 if response.endswith("dm") else 1
+            try:
+                value = int(float(response.rstrip("dm"))) * scale
+            except ValueError:
+                raise TelloError(f"Unexpected response to '{query}?': {response}")
+        return value
+
+    def get_current_state(self):
+        return self.state.snapshot()
+
+    def get_height(self):
+        return self._state_value("h", "height")
+
+    def get_battery(self):
+        return self._state_value("bat", "battery")
+
+    def get_yaw(self):
+        return self.state.get("yaw", 0)
+
+    def get_pitch(self):
+        return self.state.get("pitch", 0)
+
+    def get_roll(self):
+        return self.state.get("roll", 0)
+
+    def get_speed_x(self):
+        return self.state.get("vgx", 0)
+
+    def get_speed_y(self):
+        return self.state.get("vgy", 0)
+
+    def get_speed_z(self):
+        return self.state.get("vgz", 0)
+
+    def get_distance_tof(self):
+        return self.state.get("tof", 0)
+
+    def get_flight_time(self):
+        return self.state.get("time", 0)
+
+    def get_mission_pad_id(self):
+        return self.state.get("mid", -1)
+
+    def get_mission_pad_distance_x(self):
+        return self.state.get("x", 0)
+
+    def get_mission_pad_distance_y(self):
+        return self.state.get("y", 0)
+
+    def get_mission_pad_distance_z(self):
+        return self.state.get("z", 0)
@@ -0,0 +1,199 @@
+# File: tello_emulator.py
+"""
+Local UDP stand-in for a Tello drone.
+
+``TelloEmulator`` answers SDK commands on a command socket and pushes state
+packets to the client's state port, so ``AsyncTello``/``TelloClient`` can be
+tested and benchmarked on localhost without hardware. It keeps a crude flight
+state (height, yaw, battery, mission pad) that commands update instantly; the
+reply to a motion command can be delayed to mimic the real drone answering
+only once the move has finished.
+"""
+import socket
+import threading
+import time
+
+MOTION_COMMANDS = ("up", "down", "left", "right", "forward", "back", "cw", "ccw",
+                   "go", "curve", "takeoff", "land")
+
+
+class TelloEmulator:
+    """Answers Tello SDK commands sent to ``address`` from one client."""
+
+    def __init__(self, host="127.0.0.1", port=0, state_port=None, state_hz=10.0,
+                 response_delay=0.0, motion_delay=0.0, drop_responses=0, battery=100):
+        self.host = host
+        self.state_port = state_port
+        self.state_hz = state_hz
+        self.response_delay = response_delay
+        self.motion_delay = motion_delay
+        self.drop_responses = drop_responses
+        self.battery = battery
+
+        self.height = 0
+        self.yaw = 0
+        self.speed = 10
+        self.flying = False
+        self.sdk_mode = False
+        self.mission_pads = False
+        self.mission_pad_id = -1
+        self.rc = (0, 0, 0, 0)
+
+        # (monotonic receive time, command) for every datagram received
+        self.received = []
+        self._lock = threading.Lock()
+        self._client = None
+        self._running = False
+        self._threads = []
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((host, port))
+        self._socket.settimeout(0.1)
+        self.address = self._socket.getsockname()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._serve, name="tello-emulator", daemon=True)]
+        if self.state_port is not None:
+            self._threads.append(threading.Thread(target=self._send_state,
+                                                  name="tello-emulator-state", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout=1)
+        self._socket.close()
+
+    def commands(self):
+        """Commands received so far, without timestamps."""
+        with self._lock:
+            return [command for _, command in self.received]
+
+    def state_packet(self):
+        with self._lock:
+            return (f"mid:{self.mission_pad_id if self.mission_pads else -2};x:0;y:0;z:0;"
+                    f"mpry:0,0,0;pitch:0;roll:0;yaw:{self.yaw};vgx:0;vgy:0;vgz:0;"
+                    f"templ:60;temph:63;tof:{max(self.height, 10)};h:{self.height};"
+                    f"bat:{self.battery};baro:0.00;time:0;agx:0.00;agy:0.00;agz:-1000.00;\r\n")
+
+    def _serve(self):
+        while self._running:
+            try:
+                data, addr = self._socket.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            command = data.decode("utf-8", errors="ignore").strip()
+            with self._lock:
+                self.received.append((time.monotonic(), command))
+                self._client = addr
+            response = self.handle(command)
+            if response is None:
+                continue
+            with self._lock:
+                if self.drop_responses > 0:
+                    self.drop_responses -= 1
+                    continue
+            delay = self.response_delay
+            if command.split(" ")[0] in MOTION_COMMANDS:
+                delay += self.motion_delay
+            if delay > 0:
+                timer = threading.Timer(delay, self._reply, (response, addr))
+                timer.daemon = True
+                timer.start()
+            else:
+                self._reply(response, addr)
+
+    def _reply(self, response, addr):
+        try:
+            self._socket.sendto(response.encode(), addr)
+        except OSError:
+            pass
+
+    def _send_state(self):
+        period = 1.0 / self.state_hz
+        while self._running:
+            with self._lock:
+                client = self._client
+            if client is not None and self.sdk_mode:
+                try:
+                    self._socket.sendto(self.state_packet().encode(), (client[0], self.state_port))
+                except OSError:
+                    break
+            time.sleep(period)
+
+    def handle(self, command):
+        """Apply ``command`` to the emulated state and return the reply text."""
+        parts = command.split(" ")
+        name, args = parts[0], parts[1:]
+        with self._lock:
+            if name == "command":
+                self.sdk_mode = True
+                return "ok"
+            if not self.sdk_mode:
+                return None
+            if name == "rc":
+                self.rc = tuple(int(v) for v in args)
+                return None
+            if name == "emergency":
+                self.flying = False
+                self.height = 0
+                return "ok"
+            if name.endswith("?"):
+                return self._query(name[:-1])
+            if name == "takeoff":
+                self.flying = True
+                self.height = 80
+                return "ok"
+            if name == "land":
+                self.flying = False
+                self.height = 0
+                return "ok"
+            if name in ("streamon", "streamoff"):
+                return "ok"
+            if name == "speed":
+                self.speed = int(args[0])
+                return "ok"
+            if name in ("mon", "moff"):
+                self.mission_pads = name == "mon"
+                return "ok"
+            if name == "mdirection":
+                return "ok"
+            if not self.flying:
+                return "error Not airborne"
+            if name in ("up", "down"):
+                distance = int(args[0])
+                self.height = max(0, self.height + (distance if name == "up" else -distance))
+                return "ok"
+            if name in ("left", "right", "forward", "back"):
+                return "ok"
+            if name in ("cw", "ccw"):
+                angle = int(args[0])
+                self.yaw = (self.yaw + (angle if name == "cw" else -angle) + 180) % 360 - 180
+                return "ok"
+            if name in ("go", "curve"):
+                return "ok"
+        return "error Unknown command"
+
+    def _query(self, name):
+        values = {
+            "battery": self.battery,
+            "height": f"{self.height}dm",
+            "speed": self.speed,
+            "time": "0s",
+            "sn": "EMULATOR0000",
+            "sdk": "30",
+            "wifi": "90",
+        }
+        value = values.get(name)
+        return "error Unknown command" if value is None else str(value)
@@ -0,0 +1,58 @@
+"""
+Shared fixtures: a settable clock and DroneWorkers over a simulated drone
+"""
+
+import pytest
+import sys
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+class FakeClock:
+    """A clock that only moves when a test sets ``now``"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """A fake clock at 0 s"""
+    return FakeClock()
+
+
+@pytest.fixture
+def make_worker():
+    """Build ``(worker, drone)``: a DroneWorker with stub models flying a ``SimulatedDrone``.
+
+    The worker sleeps and times everything on the drone's virtual clock.
+    ``factory`` replaces the drone factory, ``inference_time`` makes the stub
+    models charge that much virtual time per call, and ``started`` runs the
+    worker and starts a mission with the control-loop timer stopped, so the
+    test drives the ticks.
+    """
+    def make(drone=None, factory=None, inference_time=None, started=False):
+        from drone_worker import DroneWorker
+        from simulation import SimulatedDrone, load_stub_models
+
+        drone = drone or SimulatedDrone()
+        worker = DroneWorker(drone_factory=factory or (lambda: drone))
+        if inference_time is None:
+            worker.path_model, worker.pad_model = load_stub_models()
+        else:
+            worker.path_model, worker.pad_model = load_stub_models(inference_time, drone.advance)
+        worker._sleep = drone.advance
+        worker.use_clock(lambda: drone.clock)
+        if started:
+            worker.run()
+            worker.start_drone_mission()
+            worker.control_loop_timer.stop()
+        return worker, drone
+
+    return make
@@ -0,0 +1,66 @@
+"""
+Tests for the hot-path benchmark suite
+"""
+
+import json
+import pytest
+import sys
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_hot_paths
+
+
+def _results(**timings):
+    return {"results": {name: {"min_us": us, "median_us": us} for name, us in timings.items()}}
+
+
+class TestCompare:
+    """Test baseline comparison"""
+
+    def test_flags_regression_beyond_tolerance(self):
+        """Test that only stages slower than the tolerance are flagged"""
+        baseline = _results(fast=100.0, slow=100.0)
+        current = _results(fast=110.0, slow=140.0)
+
+        rows = {row[0]: row for row in bench_hot_paths.compare(baseline, current, tolerance=0.25)}
+
+        assert rows["fast"][4] is False
+        assert rows["slow"][4] is True
+        assert rows["slow"][3] == pytest.approx(1.4)
+
+    def test_ignores_stages_missing_from_baseline(self):
+        """Test that new stages are not compared"""
+        rows = bench_hot_paths.compare(_results(old=1.0), _results(old=1.0, new=5.0))
+
+        assert [row[0] for row in rows] == ["old"]
+
+
+class TestSuite:
+    """Test that the suite runs on synthetic data"""
+
+    def test_every_stage_runs(self):
+        """Test that every registered stage produces timings"""
+        report = bench_hot_paths.run_suite(repeats=1, min_time=0.0)
+
+        assert set(report["results"]) == set(bench_hot_paths.BENCHMARKS)
+        for result in report["results"].values():
+            assert result["min_us"] > 0
+
+    def test_main_compare_exit_status(self, tmp_path):
+        """Test that --compare fails against an impossibly fast baseline"""
+        baseline = tmp_path / "baseline.json"
+        assert bench_hot_paths.main(["--filter", "centroid", "--repeats", "1",
+                                     "--min-time", "0", "--save", str(baseline)]) == 0
+
+        fast = _results(**{"mission.mask_centroid": 1e-6})
+        baseline.write_text(json.dumps(fast))
+        assert bench_hot_paths.main(["--filter", "centroid", "--repeats", "1",
+                                     "--min-time", "0", "--compare", str(baseline)]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
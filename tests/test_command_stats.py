@@ -0,0 +1,140 @@
+"""
+Tests for drone command round-trip instrumentation
+"""
+
+import pytest
+import sys
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from command_stats import CommandStats, InstrumentedDrone, format_summary
+
+
+class FakeDrone:
+    """Commands that take a set time on a fake clock"""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.command_retries = 0
+        self.speed = 10
+
+    def move_forward(self, x):
+        self.clock.now += x / 100
+        return "ok"
+
+    def flaky(self):
+        self.command_retries += 2
+        self.clock.now += 0.5
+        raise RuntimeError("timed out")
+
+
+class TestCommandStats:
+    """Test aggregation"""
+
+    def test_percentiles(self, clock):
+        """Test rolling percentiles over the last calls only"""
+        stats = CommandStats(window=100, clock=clock)
+        for i in range(1, 201):
+            stats.record("rotate_clockwise", 0.0, i / 1000)
+
+        p = stats.percentiles("rotate_clockwise")
+        assert p["p50"] == pytest.approx(0.150, abs=0.002)
+        assert p["p99"] == pytest.approx(0.199, abs=0.002)
+        assert stats.commands["rotate_clockwise"]["calls"] == 200
+
+    def test_summary_orders_by_time_spent(self, clock):
+        """Test that the busiest command comes first and the wait share is reported"""
+        stats = CommandStats(clock=clock)
+        stats.record("get_height", 1.0, 1.01)
+        stats.record("go_xyz_speed", 2.0, 5.0)
+        clock.now = 10.0
+
+        summary = stats.summary()
+        assert list(summary["commands"]) == ["go_xyz_speed", "get_height"]
+        assert summary["wait_s"] == pytest.approx(3.01)
+        assert summary["wait_fraction"] == pytest.approx(0.301)
+        assert "go_xyz_speed" in format_summary(summary).splitlines()[2]
+
+    def test_take_peak(self, clock):
+        """Test that the longest round trip is handed out once"""
+        stats = CommandStats(clock=clock)
+        stats.record("get_height", 1.0, 1.01)
+        stats.record("move_left", 2.0, 2.5)
+
+        assert stats.take_peak() == pytest.approx(0.5)
+        assert stats.take_peak() is None
+
+
+class TestInstrumentedDrone:
+    """Test the proxy around the drone handle"""
+
+    def test_times_calls(self, clock):
+        """Test that send and acknowledgement times are recorded per call"""
+        stats = CommandStats(clock=clock)
+        drone = InstrumentedDrone(FakeDrone(clock), stats)
+
+        assert drone.move_forward(200) == "ok"
+        assert stats.recent[-1] == {"command": "move_forward", "sent": 0.0, "acked": 2.0,
+                                    "retries": 0, "error": None}
+        assert drone.speed == 10
+
+    def test_errors_and_retries(self, clock):
+        """Test that failures are recorded with their retries and still raised"""
+        stats = CommandStats(clock=clock)
+        drone = InstrumentedDrone(FakeDrone(clock), stats)
+
+        with pytest.raises(RuntimeError):
+            drone.flaky()
+        entry = stats.commands["flaky"]
+        assert entry["errors"] == 1
+        assert entry["retries"] == 2
+        assert stats.recent[-1]["error"] == "timed out"
+
+    def test_tello_client_retries(self):
+        """Test that retries are read from TelloClient against the emulator"""
+        from tello_async import TelloClient
+        from tello_emulator import TelloEmulator
+
+        client = TelloClient(host="127.0.0.1", command_port=0, state_port=0,
+                             timeout=0.3, retries=2, bind_host="127.0.0.1")
+        emulator = TelloEmulator(state_port=client.client.state_port, state_hz=50)
+        client.client.address = emulator.address
+        emulator.start()
+        try:
+            stats = CommandStats()
+            drone = InstrumentedDrone(client, stats)
+            drone.connect()
+            emulator.drop_responses = 1
+            drone.set_speed(10)
+
+            assert stats.commands["set_speed"]["retries"] == 1
+            assert stats.percentiles("set_speed")["p50"] >= 0.3
+        finally:
+            client.end()
+            emulator.stop()
+
+
+class TestMissionReport:
+    """Test the worker's end-of-mission report"""
+
+    def test_simulated_mission_report(self):
+        """Test that a mission reports where its time went on commands"""
+        import flight_log
+        from simulation import run_mission
+
+        result = run_mission()
+        report = result["command_stats"]
+
+        assert report["elapsed_s"] == pytest.approx(result["duration_s"], abs=0.1)
+        assert 0 < report["wait_fraction"] < 1
+        assert report["commands"]["takeoff"]["calls"] == 1
+        assert "go_xyz_speed" in report["commands"]
+        assert result["approach"]["command_wait_s"] > 0
+        assert "commands.report" in [e["event"] for e in flight_log.recent_events()[-5:]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,123 @@
+"""
+Tests for CPU thread budgeting and its benchmark
+"""
+
+import pytest
+import sys
+import os
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import cv2
+
+import cpu_budget
+from cpu_budget import CpuBudget
+
+
+@pytest.fixture(autouse=True)
+def restore(monkeypatch):
+    """Undo library thread counts and the active budget after each test"""
+    threads = cv2.getNumThreads()
+    for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+        monkeypatch.delenv(name, raising=False)
+    yield
+    cpu_budget.configure(None)
+    cv2.setNumThreads(threads)
+
+
+def in_thread(fn):
+    """Run ``fn`` on a fresh thread, as a pipeline thread would, and return its result"""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", fn()))
+    thread.start()
+    thread.join()
+    return result["value"]
+
+
+class TestLibraries:
+    """Test library thread counts"""
+
+    def test_cv2_threads(self):
+        """Test that OpenCV's pool is resized"""
+        cpu_budget.configure(CpuBudget(cv2_threads=1))
+        assert cv2.getNumThreads() == 1
+
+    def test_torch_threads_before_import(self):
+        """Test that torch's thread count is passed on through the environment when it is not loaded yet"""
+        if "torch" in sys.modules:
+            pytest.skip("torch already imported")
+        cpu_budget.configure(CpuBudget(torch_threads=2))
+        assert os.environ["OMP_NUM_THREADS"] == "2"
+
+    def test_preset_by_name(self):
+        """Test that presets can be selected by name"""
+        assert cpu_budget.configure("quad") is cpu_budget.PRESETS["quad"]
+        assert cpu_budget.active().cv2_threads == 1
+
+
+class TestEnter:
+    """Test per-thread affinity and niceness"""
+
+    def test_noop_without_budget(self):
+        """Test that threads run untouched when no budget is configured"""
+        assert cpu_budget.enter("inference") is None
+
+    def test_unknown_role(self):
+        """Test that a typo in a role name is an error"""
+        cpu_budget.configure(CpuBudget())
+        with pytest.raises(ValueError):
+            cpu_budget.enter("infrence")
+
+    @pytest.mark.skipif(not hasattr(os, "setpriority"), reason="needs per-thread nice values")
+    def test_inference_thread_deprioritised(self):
+        """Test that only the entering thread's niceness is raised"""
+        base = os.getpriority(os.PRIO_PROCESS, 0)
+        cpu_budget.configure(CpuBudget(nice={"inference": 5}))
+
+        entry, nice = in_thread(lambda: (cpu_budget.enter("inference"), os.getpriority(os.PRIO_PROCESS, 0)))
+        assert entry["nice"] == nice == base + 5
+        assert os.getpriority(os.PRIO_PROCESS, 0) == base
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs thread affinity")
+    def test_thread_pinned(self):
+        """Test that a thread is pinned to its role's cores"""
+        core = min(os.sched_getaffinity(0))
+        cpu_budget.configure(CpuBudget(cores={"decode": {core}}, nice={}))
+
+        entry, cores = in_thread(lambda: (cpu_budget.enter("decode"), os.sched_getaffinity(0)))
+        assert entry["cores"] == [core]
+        assert cores == {core}
+
+    @pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="needs thread affinity")
+    def test_missing_cores_ignored(self):
+        """Test that a preset for a bigger board leaves threads unpinned here"""
+        cpu_budget.configure(CpuBudget(cores={"inference": {4096}}, nice={}))
+
+        entry, cores = in_thread(lambda: (cpu_budget.enter("inference"), os.sched_getaffinity(0)))
+        assert entry["cores"] is None
+        assert cores == os.sched_getaffinity(0)
+
+
+class TestBenchmark:
+    """Test the configuration sweep"""
+
+    def test_sweep_reports_tail_latency(self):
+        """Test that each configuration runs in its own process and reports percentiles"""
+        import bench_cpu_budget
+
+        results = bench_cpu_budget.sweep(["unmanaged", "priority"], seconds=1.0, period_ms=50, load="cv2")
+
+        assert [result["config"] for result in results] == ["unmanaged", "priority"]
+        for result in results:
+            latency = result["latency_ms"]
+            assert result["ticks"] > 5
+            assert latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"]
+            assert result["inference_per_s"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,198 @@
+"""
+Tests for the queue-backed flight log and the throttled status bar
+"""
+
+import pytest
+import sys
+import os
+import json
+import gc
+import logging
+import threading
+import time
+import weakref
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import flight_log
+
+
+@pytest.fixture
+def configured(tmp_path):
+    """A flight log writing under a temporary directory"""
+    log = flight_log.configure(str(tmp_path), console=False)
+    yield log
+    flight_log.shutdown()
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestEventLog:
+    """Test structured records"""
+
+    def test_fields_reach_the_ring(self):
+        """Test that events and their fields are kept in the in-memory ring"""
+        flight_log.get_logger("test").info("pad.approach", "going", range_cm=120, final=False)
+        entry = flight_log.recent_events()[-1]
+
+        assert entry["event"] == "pad.approach"
+        assert entry["msg"] == "going"
+        assert entry["range_cm"] == 120
+        assert entry["final"] is False
+
+    def test_objects_are_stringified(self):
+        """Test that exceptions and other objects serialise as text"""
+        flight_log.get_logger("test").error("failed", error=ValueError("boom"))
+        assert flight_log.recent_events()[-1]["error"] == "boom"
+
+    def test_ring_releases_exceptions(self, monkeypatch):
+        """Test that the ring keeps no exception, traceback or frame alive"""
+        # pytest's own log capture keeps records; only the ring may hold one here
+        monkeypatch.setattr(logging.getLogger(flight_log.ROOT), "handlers", [flight_log._ring])
+
+        class Boom(Exception):
+            pass
+
+        def fail():
+            try:
+                raise Boom("boom")
+            except Boom as e:
+                logging.getLogger("drone.test").error("failed", exc_info=True,
+                                                       extra={"event": "failed", "fields": {"error": e}})
+                return weakref.ref(e)
+
+        ref = fail()
+        gc.collect()
+
+        assert ref() is None
+        entry = flight_log.recent_events()[-1]
+        assert entry["error"] == "boom"
+        assert "Boom: boom" in entry["exc"]
+
+
+class TestFlightLog:
+    """Test the background writer"""
+
+    def test_events_written_as_json_lines(self, configured):
+        """Test that the listener writes one JSON object per event"""
+        log = flight_log.get_logger("test")
+        for i in range(3):
+            log.info("tick", f"tick {i}", n=i)
+        flight_log.shutdown()
+
+        lines = read_lines(configured.path)
+        assert [line["n"] for line in lines] == [0, 1, 2]
+        assert lines[0]["logger"] == "drone.test"
+
+    def test_files_rotate(self, tmp_path):
+        """Test that the log rolls over into numbered backups"""
+        flight_log.configure(str(tmp_path), console=False, max_bytes=2000, backups=2)
+        log = flight_log.get_logger("test")
+        for i in range(100):
+            log.info("tick", "x" * 50, n=i)
+        flight_log.shutdown()
+
+        assert os.path.exists(os.path.join(str(tmp_path), "flight.jsonl.1"))
+        assert not os.path.exists(os.path.join(str(tmp_path), "flight.jsonl.3"))
+
+    def test_slow_writer_does_not_block_callers(self, configured):
+        """Test that logging returns without waiting for the handlers"""
+        class SlowHandler(logging.Handler):
+            def emit(self, record):
+                time.sleep(0.01)
+
+        configured.listener.handlers = configured.listener.handlers + (SlowHandler(),)
+        log = flight_log.get_logger("test")
+        start = time.perf_counter()
+        for i in range(50):
+            log.info("tick", n=i)
+        assert time.perf_counter() - start < 0.25
+
+    def test_ring_filled_off_the_caller(self, configured):
+        """Test that the listener thread, not the caller, fills the ring"""
+        threads = []
+
+        class Ring(flight_log.RingHandler):
+            def emit(self, record):
+                threads.append(threading.current_thread())
+                super().emit(record)
+
+        root = logging.getLogger(flight_log.ROOT)
+        assert flight_log._ring not in root.handlers
+        assert root.propagate is False
+
+        ring = Ring()
+        configured.listener.handlers = configured.listener.handlers + (ring,)
+        flight_log.get_logger("test").info("tick", n=1)
+        configured.flush()
+
+        assert threads and threading.current_thread() not in threads
+        assert flight_log.recent_events()[-1]["event"] == "tick"
+        flight_log.shutdown()
+        assert flight_log._ring in root.handlers
+
+    def test_dump_recent(self, configured, tmp_path):
+        """Test that the ring can be dumped when something fails"""
+        flight_log.get_logger("test").warning("pad.lost", "lost it")
+        path = flight_log.dump_recent("test failure")
+
+        lines = read_lines(path)
+        assert lines[0]["reason"] == "test failure"
+        assert lines[-1]["event"] == "pad.lost"
+
+
+class TestStatusThrottle:
+    """Test rate-limited status bar updates"""
+
+    def test_burst_coalesced_to_latest(self):
+        """Test that a burst shows the first message now and only the last one later"""
+        from PySide6.QtWidgets import QApplication, QStatusBar
+        from main_window_final import StatusThrottle
+
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        bar = QStatusBar()
+        throttle = StatusThrottle(bar, interval_ms=50)
+        for i in range(10):
+            throttle.show(f"step {i}")
+        assert bar.currentMessage() == "step 0"
+
+        deadline = time.monotonic() + 2
+        while bar.currentMessage() != "step 9" and time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+        assert bar.currentMessage() == "step 9"
+        assert throttle.shown == 2
+        assert throttle.dropped == 8
+
+    def test_repeats_not_redrawn(self):
+        """Test that re-sending the shown message does nothing"""
+        from PySide6.QtWidgets import QApplication, QStatusBar
+        from main_window_final import StatusThrottle
+
+        QApplication.instance() or QApplication(sys.argv[:1])
+        throttle = StatusThrottle(QStatusBar(), interval_ms=0)
+        for _ in range(5):
+            throttle.show("Segmentation mode active")
+        assert throttle.shown == 1
+
+
+class TestWorkerEvents:
+    """Test that the worker logs structured events"""
+
+    def test_mission_transitions_logged(self):
+        """Test that a simulated mission leaves parseable transition events"""
+        from simulation import run_mission
+
+        run_mission()
+        transitions = [e for e in flight_log.recent_events() if e["event"] == "state.transition"]
+        assert [e["to"] for e in transitions[-4:]] == ["path_follow", "pad_align", "pad_search", "finished"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
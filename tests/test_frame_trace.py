@@ -0,0 +1,242 @@
+"""
+Tests for frame-to-command tracing
+"""
+
+import json
+import pytest
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from command_stats import CommandStats, InstrumentedDrone
+from frame_trace import FrameTrace, is_action, read_frame
+
+
+class FakeDrone:
+    def __init__(self, clock):
+        self.clock = clock
+
+    def move_left(self, x):
+        self.clock.now += 0.5
+
+    def get_height(self):
+        return 80
+
+
+class TestFrameTrace:
+    """Test frame bookkeeping and ages"""
+
+    def test_command_age_from_capture(self, clock):
+        """Test that a command is aged from its frame's capture time"""
+        trace = FrameTrace(clock=clock)
+        trace.set_lane("control")
+        clock.now = 10.2
+        assert trace.frame(7, capture_time=10.0) == 7
+        trace.command("get_height", 10.25, 10.26)
+        trace.command("move_left", 10.3, 10.8)
+
+        summary = trace.summary()
+        assert summary["commands"] == 1
+        assert summary["age_ms"]["p50"] == pytest.approx(300)
+        assert summary["acked_age_ms"]["p50"] == pytest.approx(800)
+        assert summary["pickup_age_ms"]["p50"] == pytest.approx(200)
+        assert list(summary["by_command"]) == ["move_left"]
+
+    def test_commands_without_frame_not_aged(self, clock):
+        """Test that setup and dropped-frame commands are traced but not aged"""
+        trace = FrameTrace(clock=clock)
+        trace.command("takeoff", 0.0, 4.0)
+        trace.frame(1, 4.0)
+        trace.drop()
+        trace.command("rotate_clockwise", 5.0, 6.0)
+
+        assert trace.summary()["commands"] == 0
+        assert trace.summary()["age_ms"] is None
+        assert len([e for e in trace.events if e[0] == "X"]) == 3
+
+    def test_frames_without_ids_are_numbered(self, clock):
+        """Test that frames from readers without IDs get new IDs, captured now"""
+        trace = FrameTrace(clock=clock)
+        trace.set_lane("control")
+        clock.now = 1.0
+        first = trace.frame(None)
+        second = trace.frame(None)
+
+        assert second == first + 1
+        assert trace.summary()["pickup_age_ms"]["max"] == 0
+
+    def test_capture_recorded_once_across_lanes(self, clock):
+        """Test that two threads picking up one frame record a single capture"""
+        trace = FrameTrace(clock=clock)
+        trace.set_lane("control")
+        trace.frame(3, 0.0)
+
+        def camera():
+            trace.set_lane("camera")
+            trace.frame(3, 0.0)
+            trace.span("prepare", 0.0, 0.01)
+        worker = threading.Thread(target=camera)
+        worker.start()
+        worker.join()
+
+        captures = [e for e in trace.events if e[2] == "capture"]
+        assert len(captures) == 1
+        assert trace.summary()["frames"] == {"control": 1, "camera": 1}
+        assert ("X", "prepare", "camera", 0.0, 0.01, 3, None) in trace.events
+
+    def test_reset(self, clock):
+        """Test that reset forgets events, ages and the current frame"""
+        trace = FrameTrace(clock=clock)
+        trace.frame(1, 0.0)
+        trace.command("move_left", 0.1, 0.2)
+        trace.reset()
+
+        trace.command("move_left", 0.3, 0.4)
+        assert trace.summary()["commands"] == 0
+        assert len(trace.events) == 1
+
+    def test_bounded(self, clock):
+        """Test that events and ages stay within their limits"""
+        trace = FrameTrace(clock=clock, max_events=50, window=10)
+        for i in range(1, 101):
+            trace.frame(i, i)
+            trace.command("move_left", i + 0.1, i + 0.2)
+
+        assert len(trace.events) == 50
+        assert len(trace.ages) == 10
+
+    def test_is_action(self):
+        """Test which drone calls count as commands"""
+        assert is_action("move_left") and is_action("go_xyz_speed") and is_action("land")
+        assert not is_action("get_height") and not is_action("get_frame_read")
+
+
+class TestChromeTrace:
+    """Test the exported trace"""
+
+    def test_events_and_flows(self, clock, tmp_path):
+        """Test that the saved file is Chrome trace JSON linking captures to commands"""
+        trace = FrameTrace(clock=clock)
+        trace.set_lane("control")
+        clock.now = 5.05
+        trace.frame(1, 5.0)
+        trace.span("infer.path", 5.05, 5.2, detections=1)
+        trace.command("move_left", 5.2, 5.7)
+
+        path = trace.save(str(tmp_path / "trace.json"))
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        events = data["traceEvents"]
+        lanes = {e["args"]["name"]: e["tid"] for e in events if e["name"] == "thread_name"}
+        assert list(lanes) == ["capture", "control"]
+        spans = {e["name"]: e for e in events if e["ph"] == "X"}
+        assert spans["frame"]["ts"] == 0 and spans["frame"]["dur"] == pytest.approx(50000)
+        assert spans["infer.path"]["args"] == {"frame_id": 1, "detections": 1}
+        assert spans["move_left"]["tid"] == lanes["control"]
+        start, = [e for e in events if e["ph"] == "s"]
+        end, = [e for e in events if e["ph"] == "f"]
+        assert start["id"] == end["id"] and start["tid"] == lanes["capture"]
+        assert end["ts"] == spans["move_left"]["ts"]
+        assert data["otherData"]["summary"]["age_ms"]["p50"] == pytest.approx(200)
+
+    def test_empty(self):
+        """Test that an empty trace exports no events"""
+        assert FrameTrace().chrome_events() == []
+
+
+class TestFrameSources:
+    """Test frame IDs from the readers"""
+
+    def test_read_frame_fallbacks(self):
+        """Test readers with a snapshot, with attributes, and without either"""
+        class Plain:
+            frame = "f"
+
+        class Stamped(Plain):
+            frame_id = 4
+            timestamp = 1.5
+
+        assert read_frame(Plain()) == ("f", None, None)
+        assert read_frame(Stamped()) == ("f", 4, 1.5)
+
+    def test_tello_frame_read(self):
+        """Test that FrameRead numbers frames and keeps the capture time"""
+        from tello_async import FrameRead
+
+        frame_read = FrameRead()
+        frame_read.publish(np.zeros((2, 2, 3)), 12.0)
+        frame_read.publish(np.ones((2, 2, 3)), 12.1)
+
+        frame, frame_id, timestamp = read_frame(frame_read)
+        assert frame_id == 2 and timestamp == 12.1 and frame[0, 0, 0] == 1
+        assert frame_read.decoded_at >= timestamp
+
+    def test_instrumented_drone(self, clock):
+        """Test that the command proxy files calls under the current frame"""
+        trace = FrameTrace(clock=clock)
+        drone = InstrumentedDrone(FakeDrone(clock), CommandStats(clock=clock), trace=trace)
+        trace.frame(9, 0.0)
+        clock.now = 0.1
+        drone.get_height()
+        drone.move_left(20)
+
+        assert [(e[1], e[5]) for e in trace.events if e[0] == "X"] == \
+            [("frame", 9), ("get_height", 9), ("move_left", 9)]
+        assert trace.summary()["age_ms"]["p50"] == pytest.approx(100)
+
+    def test_camera_thread(self):
+        """Test that the camera thread traces each new frame once"""
+        from camera_thread import CameraThread
+
+        class Reader:
+            def __init__(self):
+                self.frame = np.zeros((72, 96, 3), dtype=np.uint8)
+                self.frame_id = 1
+                self.timestamp = time.monotonic()
+
+        class Drone:
+            def get_frame_read(self):
+                return reader
+
+        reader = Reader()
+        trace = FrameTrace()
+        camera = CameraThread(Drone(), trace=trace)
+        camera.start()
+        time.sleep(0.3)
+        camera.stop()
+
+        assert trace.summary()["frames"] == {"camera": 1}
+        assert [e[1] for e in trace.events] == ["frame", "prepare"]
+
+
+class TestWorkerTrace:
+    """Test tracing a simulated mission"""
+
+    def test_mission_trace(self, tmp_path):
+        """Test that a mission saves a trace whose commands are aged by inference time"""
+        from simulation import run_mission
+
+        result = run_mission(inference_time=0.1, trace_dir=str(tmp_path))
+
+        age = result["frame_age"]["age_ms"]
+        assert result["frame_age"]["commands"] > 0
+        assert age["p50"] >= 100
+        saved, = os.listdir(tmp_path)
+        with open(tmp_path / saved, encoding="utf-8") as f:
+            events = json.load(f)["traceEvents"]
+        names = {e["name"] for e in events}
+        assert {"frame", "infer.pad", "tick path_follow"} <= names
+        assert sorted(e["id"] for e in events if e["ph"] == "s") == \
+            sorted(e["id"] for e in events if e["ph"] == "f")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,78 @@
+"""
+Tests for lazy package exports and the import budgets
+"""
+
+import pytest
+import sys
+import os
+
+# Add benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_import_time
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _weakrefset
+import time:       300 |        420 | threading
+import time:        50 |        470 | mission_state
+"""
+
+
+class TestParse:
+    """Test parsing of -X importtime output"""
+
+    def test_parse_depth_and_times(self):
+        """Test that names, times and nesting are read from each line"""
+        entries = bench_import_time.parse_importtime(SAMPLE)
+
+        assert entries[0] == ("_weakrefset", 120, 120, 1)
+        assert entries[1] == ("threading", 300, 420, 0)
+        assert len(entries) == 3
+
+    def test_check_budget(self):
+        """Test that slow imports and forbidden packages are both reported"""
+        result = {"total_ms": 80.0, "imported": {"numpy", "torch"}}
+
+        assert bench_import_time.check_budget(result, 100, ("PySide6",)) == []
+        problems = bench_import_time.check_budget(result, 50, ("torch", "PySide6"))
+        assert problems == ["80 ms > 50 ms", "imports torch"]
+
+
+class TestBudgets:
+    """Test that every budgeted import stays light"""
+
+    @pytest.mark.parametrize("target", sorted(bench_import_time.BUDGETS))
+    def test_loads_no_heavy_packages(self, target):
+        """Test that the import loads none of its forbidden packages"""
+        _, forbidden = bench_import_time.BUDGETS[target]
+        result = bench_import_time.measure_import(target, repeats=1)
+
+        # Time budgets depend on the machine; bench_import_time.py checks them
+        assert bench_import_time.check_budget(result, float("inf"), forbidden) == []
+
+
+class TestLazyExports:
+    """Test that the package's public names are unchanged"""
+
+    def test_public_names_resolve(self):
+        """Test that each exported name loads the class from its module on first use"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        import src
+
+        assert src.__all__ == ["DroneWorker", "DroneWorkerSignals", "DroneGUI",
+                               "SegmentationThread", "DetectionThread", "CameraThread"]
+        assert src.DroneWorker is sys.modules["src.drone_worker"].DroneWorker
+        assert src.CameraThread.__name__ == "CameraThread"
+        assert "DroneGUI" in dir(src)
+
+    def test_unknown_name(self):
+        """Test that unknown attributes still raise AttributeError"""
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        import src
+
+        with pytest.raises(AttributeError):
+            src.NotAThing
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,146 @@
+"""
+Tests for delay estimation and latency-compensated target offsets
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from latency import DelayEstimator, LatencyCompensator, TelemetryHistory, evaluate_replay, speed_scale_for
+
+
+class TestDelayEstimator:
+    """Test the online delay estimate"""
+
+    def test_first_sample_sets_estimate(self):
+        """Test that the estimate starts at the first sample and then smooths"""
+        estimator = DelayEstimator(alpha=0.5)
+        estimator.update(0.2)
+        assert estimator.estimate == pytest.approx(0.2)
+        estimator.update(0.4)
+        assert estimator.estimate == pytest.approx(0.3)
+
+    def test_implausible_samples_dropped(self):
+        """Test that negative and huge delays are ignored"""
+        estimator = DelayEstimator()
+        estimator.update(-1.0)
+        estimator.update(100.0)
+        assert estimator.samples == 0
+
+
+class TestTelemetryHistory:
+    """Test yaw interpolation and rates"""
+
+    def test_yaw_rate_across_wrap(self):
+        """Test that crossing ±180° is not read as a full turn"""
+        history = TelemetryHistory()
+        history.add(0.0, 170)
+        history.add(0.5, -175)
+        assert history.yaw_rate() == pytest.approx(30.0)
+
+    def test_lateral_shift_holds_last_velocity(self):
+        """Test that sideways travel integrates vy and extrapolates it"""
+        history = TelemetryHistory()
+        history.add(0.0, 0, vy=10)
+        history.add(1.0, 0, vy=20)
+        assert history.lateral_shift(0.5, 2.0) == pytest.approx(5 + 20)
+
+
+class TestLatencyCompensator:
+    """Test forward prediction of target offsets"""
+
+    def test_no_motion_keeps_offset(self):
+        """Test that a hovering drone's offsets are unchanged"""
+        compensator = LatencyCompensator(command_delay=0.1)
+        compensator.record_telemetry(0, t=0.0)
+        compensator.record_telemetry(0, t=0.2)
+        assert compensator.predict_offset(40, 960, capture_time=0.0, now=0.3) == pytest.approx(40)
+
+    def test_yaw_right_moves_target_left(self):
+        """Test that turning right shifts a target left by the turned angle"""
+        compensator = LatencyCompensator(command_delay=0.1)
+        compensator.record_telemetry(0, t=0.0)
+        compensator.record_telemetry(3, t=0.3)
+        predicted = compensator.predict_offset(100, 960, capture_time=0.0, now=0.3)
+
+        # 4 degrees by command time at 10 deg/s
+        expected = 100 - compensator.focal_px(960) * 4 * 3.14159265 / 180
+        assert predicted == pytest.approx(expected, rel=1e-3)
+        assert compensator.pipeline.estimate == pytest.approx(0.3)
+
+    def test_foreign_clock_timestamp_ignored(self):
+        """Test that a capture time from another clock does not skew the estimate"""
+        compensator = LatencyCompensator()
+        compensator.record_telemetry(0, t=1000.0)
+        compensator.predict_offset(10, 960, capture_time=5.0, now=1000.0)
+        assert compensator.pipeline.samples == 0
+
+
+class TestReplay:
+    """Test compensation measured against a recorded simulated replay"""
+
+    def test_compensation_reduces_error(self):
+        """Test that predicted offsets are closer to what the drone sees at command time"""
+        from simulation import record_replay
+
+        result = evaluate_replay(record_replay(duration=15.0, seed=1))
+        assert result["pairs"] > 100
+        assert result["compensated"]["mean_px"] < result["raw"]["mean_px"] * 0.8
+        assert result["pipeline_delay_s"] == pytest.approx(0.25, abs=0.05)
+
+    def test_worker_measures_pipeline_delay(self):
+        """Test that a simulated mission with slow inference reports its delay"""
+        from drone_worker import DroneWorker
+        from simulation import SimulatedDrone, run_mission
+
+        delays = []
+        original = DroneWorker._predicted_offset
+
+        def spy(worker, offset, width):
+            delays.append(worker._clock() - worker._capture_time)
+            return original(worker, offset, width)
+
+        DroneWorker._predicted_offset = spy
+        try:
+            result = run_mission(SimulatedDrone(), inference_time=0.2)
+        finally:
+            DroneWorker._predicted_offset = original
+
+        assert result["on_pad"] is True
+        # Every steering decision waits for at least one inference
+        assert delays and min(delays) == pytest.approx(0.2)
+
+
+
+class TestSpeedScale:
+    """Test the speed telemetry unit per drone backend"""
+
+    def test_tello_backends_report_decimetres(self):
+        """Test that the default factory's Tello and TelloClient are scaled from dm/s"""
+        from drone_worker import DroneWorker
+        from tello_async import TelloClient
+        djitellopy = pytest.importorskip("djitellopy")
+
+        assert speed_scale_for(djitellopy.Tello) == 10
+        assert speed_scale_for(TelloClient) == 10
+        assert DroneWorker().latency.speed_scale == 10
+
+    def test_simulator_reports_centimetres(self):
+        """Test that a worker on the simulator switches to cm/s on connect"""
+        from drone_worker import DroneWorker
+        from simulation import SimulatedDrone, load_stub_models
+
+        drone = SimulatedDrone()
+        worker = DroneWorker(drone_factory=lambda: drone)
+        worker.path_model, worker.pad_model = load_stub_models()
+        worker.run()
+
+        assert worker.latency.speed_scale == 1
+        worker.stop_worker()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
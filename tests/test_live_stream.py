@@ -0,0 +1,161 @@
+"""
+Tests for the MJPEG/HTTP live stream, against localhost only
+"""
+
+import pytest
+import sys
+import os
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from live_stream import LiveStream
+
+
+@pytest.fixture
+def stream():
+    """A live stream on an ephemeral localhost port"""
+    stream = LiveStream(port=0, max_fps=30).start()
+    yield stream
+    stream.stop()
+
+
+def frame(value=0):
+    image = np.zeros((72, 96, 3), dtype=np.uint8)
+    image[:, :, 0] = value
+    return image
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.005)
+
+
+def get(stream, path):
+    with urllib.request.urlopen(stream.url(path), timeout=2) as response:
+        return response.headers.get("Content-Type"), response.read()
+
+
+def read_parts(stream, path, seconds=2.0, count=None):
+    """JPEG payloads of an MJPEG stream read for ``seconds`` or until ``count`` arrive"""
+    response = urllib.request.urlopen(stream.url(path), timeout=2)
+    parts = []
+    deadline = time.monotonic() + seconds
+    try:
+        while time.monotonic() < deadline and len(parts) != count:
+            line = response.readline()
+            if not line.startswith(b"--frame"):
+                continue
+            headers = {}
+            while True:
+                header = response.readline().strip()
+                if not header:
+                    break
+                key, value = header.decode().split(":", 1)
+                headers[key.lower()] = value.strip()
+            parts.append(response.read(int(headers["content-length"])))
+    finally:
+        response.close()
+    return parts
+
+
+class TestEndpoints:
+    """Test snapshot, telemetry and index endpoints"""
+
+    def test_snapshot_is_jpeg(self, stream):
+        """Test that a published frame is served as a JPEG"""
+        stream.publish("realtime", frame(200))
+        wait_for(lambda: stream.slots["realtime"].seq > 0)
+
+        content_type, body = get(stream, "/snapshot/realtime.jpg")
+        assert content_type == "image/jpeg"
+        assert body[:2] == b"\xff\xd8"
+
+    def test_telemetry_json(self, stream):
+        """Test that telemetry and view state are served as JSON"""
+        stream.publish_telemetry({"battery": 80, "altitude": 50})
+        content_type, body = get(stream, "/telemetry")
+        data = json.loads(body)
+
+        assert content_type == "application/json"
+        assert data["telemetry"]["battery"] == 80
+        assert set(data["views"]) == {"realtime", "segmentation", "detection"}
+
+    def test_unknown_view_404(self, stream):
+        """Test that only the three views are served"""
+        with pytest.raises(urllib.error.HTTPError) as error:
+            get(stream, "/stream/thermal.mjpg")
+        assert error.value.code == 404
+
+    def test_binds_localhost_by_default(self, stream):
+        """Test that the server is not exposed beyond this machine by default"""
+        assert stream.address[0] == "127.0.0.1"
+
+
+class TestStreaming:
+    """Test MJPEG pacing, sharing and backpressure"""
+
+    def test_client_fps_cap_skips_frames(self, stream):
+        """Test that a 5 fps client gets about 5 frames a second of a 60 fps feed"""
+        running = True
+
+        def publisher():
+            i = 0
+            while running:
+                stream.publish("segmentation", frame(i % 255))
+                i += 1
+                time.sleep(1 / 60)
+
+        thread = threading.Thread(target=publisher)
+        thread.start()
+        try:
+            parts = read_parts(stream, "/stream/segmentation.mjpg?fps=5", 1.0)
+        finally:
+            running = False
+            thread.join()
+
+        assert 3 <= len(parts) <= 7
+        assert all(part[:2] == b"\xff\xd8" for part in parts)
+        assert stream.frames_skipped > 0
+
+    def test_frame_encoded_once_for_all_clients(self, stream):
+        """Test that two clients receive the same bytes from a single encode"""
+        stream.publish("detection", frame(100))
+        wait_for(lambda: stream.slots["detection"].seq > 0)
+
+        first = read_parts(stream, "/stream/detection.mjpg", count=1)
+        second = read_parts(stream, "/stream/detection.mjpg", count=1)
+        assert first[0] == second[0]
+        assert stream.frames_encoded == 1
+
+    def test_stalled_client_does_not_block_publisher(self, stream):
+        """Test that a viewer that never reads cannot slow publishing down"""
+        host, port = stream.address
+        stalled = socket.create_connection((host, port))
+        stalled.sendall(b"GET /stream/realtime.mjpg?fps=30 HTTP/1.0\r\n\r\n")
+        wait_for(lambda: stream.clients == 1)
+
+        big = np.random.default_rng(0).integers(0, 255, (720, 960, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        for _ in range(200):
+            stream.publish("realtime", big)
+        elapsed = time.perf_counter() - start
+        stalled.close()
+
+        assert elapsed < 0.5
+        assert stream.frames_encoded < stream.frames_published
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,173 @@
+"""
+Tests for the mission state machine and the worker's per-state scheduling
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mission_state import (FINISHED, IDLE, PAD_ALIGN, PAD_SEARCH, PATH_FOLLOW,
+                           PATH_RECOVERY, InvalidTransition, MissionStateMachine)
+
+
+class FakeTimer:
+    """Records the periods the control loop re-arms with"""
+
+    def __init__(self):
+        self.starts = []
+
+    def start(self, ms):
+        self.starts.append(ms)
+
+    def stop(self):
+        pass
+
+
+class TestMissionStateMachine:
+    """Test transitions, their validation and timing"""
+
+    def test_initial_state(self):
+        """Test that a new machine is idle with no history"""
+        machine = MissionStateMachine()
+        assert machine.state is IDLE
+        assert len(machine.history) == 0
+
+    def test_transition_records_time_in_state(self, clock):
+        """Test that each transition logs the time spent in the previous state"""
+        machine = MissionStateMachine(clock=clock)
+        clock.now = 2.0
+        machine.transition(PATH_FOLLOW, "takeoff")
+        clock.now = 7.5
+        record = machine.transition(PAD_ALIGN, "pad detected")
+
+        assert record["from"] == "path_follow"
+        assert record["to"] == "pad_align"
+        assert record["duration_s"] == pytest.approx(5.5)
+        assert [r["reason"] for r in machine.history] == ["takeoff", "pad detected"]
+
+    def test_invalid_transition_rejected(self):
+        """Test that transitions outside the mission graph raise"""
+        machine = MissionStateMachine()
+        with pytest.raises(InvalidTransition):
+            machine.transition(PAD_SEARCH)
+        assert machine.state is IDLE
+
+    def test_finished_reachable_from_any_state(self):
+        """Test that landing or emergency can end the mission from anywhere"""
+        for state in (IDLE, PATH_FOLLOW, PATH_RECOVERY, PAD_ALIGN, PAD_SEARCH):
+            machine = MissionStateMachine(initial=state)
+            machine.transition(FINISHED)
+            assert machine.state is FINISHED
+
+    def test_listeners_notified(self):
+        """Test that listeners receive every transition record"""
+        machine = MissionStateMachine()
+        seen = []
+        machine.listeners.append(seen.append)
+        machine.transition(PATH_FOLLOW)
+        assert seen[0]["to"] == "path_follow"
+
+
+class TestStateSchedule:
+    """Test the per-state tick periods and model needs"""
+
+    def test_pad_states_skip_path_model(self):
+        """Test that only path states run segmentation"""
+        assert PATH_FOLLOW.needs("path") and PATH_FOLLOW.needs("pad")
+        assert PAD_ALIGN.needs("pad") and not PAD_ALIGN.needs("path")
+        assert not PAD_SEARCH.models
+
+    def test_alignment_ticks_faster_than_following(self):
+        """Test that fine alignment gets the fastest control rate"""
+        assert PAD_ALIGN.tick_ms < PATH_RECOVERY.tick_ms < PATH_FOLLOW.tick_ms < PAD_SEARCH.tick_ms
+
+
+class TestWorkerStates:
+    """Test DroneWorker driven by the state machine on a simulated drone"""
+
+    def test_mission_visits_states_in_order(self):
+        """Test that a simulated mission walks the states in order"""
+        from simulation import run_mission
+
+        result = run_mission()
+        assert result["states"] == ["path_follow", "pad_align", "pad_search", "finished"]
+
+    def test_inference_counted_only_where_needed(self, make_worker):
+        """Test that the pad search state runs no model inference"""
+        worker, drone = make_worker(started=True)
+        while worker._is_running:
+            worker.tick()
+            drone.advance(worker.current_tick_ms() / 1000)
+
+        assert worker.get_mission_state() is FINISHED
+        assert "pad_search" not in worker.inference_counts
+        assert worker.inference_counts["pad_align"] > 0
+
+    def test_failed_ticks_keep_the_loop_then_land(self, make_worker):
+        """Test that a command error is logged, the loop re-arms, and repeated errors land"""
+        from simulation import SimulatedDrone
+
+        def timeout(*args):
+            raise TimeoutError("no response")
+
+        # A long path, so every tick follows it and steers
+        drone = SimulatedDrone(path=[(400, 2360), (400, 200)], pad=(400, 140), floor_size=(800, 2400))
+        worker, _ = make_worker(drone, started=True)
+        worker.control_loop_timer = FakeTimer()
+        for command in ("move_forward", "move_left", "move_right", "move_up", "move_down",
+                        "rotate_clockwise", "rotate_counter_clockwise", "go_xyz_speed"):
+            setattr(drone, command, timeout)
+
+        worker._mission_logic()
+        worker._mission_logic()
+        assert worker._is_running and worker._tick_failures == 2
+        assert worker.get_mission_state() is PATH_FOLLOW
+        assert len(worker.control_loop_timer.starts) == 2
+
+        worker._mission_logic()
+        assert worker.get_mission_state() is FINISHED
+        assert not drone.flying
+        assert len(worker.control_loop_timer.starts) == 2
+
+    def test_out_of_state_requests_ignored(self, make_worker):
+        """Test that pad mode outside path following and a second start are no-ops"""
+        worker, drone = make_worker()
+        finished = []
+        worker.signals.mission_finished.connect(lambda: finished.append(True))
+        worker.run()
+
+        worker.switch_to_pad_mode()
+        assert worker.get_mission_state() is IDLE
+
+        worker.start_drone_mission()
+        worker.control_loop_timer.stop()
+        worker.switch_to_pad_mode()
+        worker.switch_to_pad_mode()
+        assert worker.get_mission_state() is PAD_ALIGN
+
+        worker.start_drone_mission()
+        worker.control_loop_timer.stop()
+        assert worker.get_mission_state() is PAD_ALIGN
+        assert [c[0] for c in drone.commands].count("takeoff") == 1
+        assert worker._is_running and finished == []
+        worker.stop_worker()
+
+    def test_mode_flags_follow_state(self):
+        """Test that the legacy mode flags derive from the mission state"""
+        from drone_worker import DroneWorker
+
+        worker = DroneWorker()
+        worker.mission.transition(PATH_FOLLOW)
+        assert worker.is_segmentation_active() and not worker.is_pad_mode_active()
+        worker.switch_to_pad_mode()
+        assert worker.is_pad_mode_active() and not worker.is_segmentation_active()
+        worker.stop_worker()
+        assert worker.get_mission_state() is FINISHED
+        assert worker._is_running is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
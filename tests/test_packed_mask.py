@@ -0,0 +1,136 @@
+"""
+Tests for bit-packed path masks
+"""
+
+import pickle
+import pytest
+import sys
+import os
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from packed_mask import PackedMask, pack_masks
+from path_geometry import mask_centroid, mask_to_uint8
+
+
+def ribbon(shape=(480, 640)):
+    """A float mask with a slanted band running off the bottom edge."""
+    mask = np.zeros(shape, dtype=np.float32)
+    for y in range(150, shape[0]):
+        x = 200 + y // 3
+        mask[y, x:x + 61] = 1
+    return mask
+
+
+class TestPackedMask:
+    """Test packing, geometry and serialisation"""
+
+    def test_moments_match_opencv(self):
+        """Test that moments off the packed bits equal cv2.moments on the image"""
+        noise = (np.random.default_rng(0).random((97, 133)) > 0.6).astype(np.float32)
+        for mask in (ribbon(), noise):
+            packed = PackedMask.from_array(mask)
+            expected = cv2.moments(mask_to_uint8(mask), binaryImage=True)
+
+            for key, value in packed.moments().items():
+                assert value == pytest.approx(expected[key], rel=1e-9), key
+            assert packed.centroid() == mask_centroid(mask_to_uint8(mask))
+            assert packed.area == int(mask.sum())
+
+    def test_bbox_and_size(self):
+        """Test that only the bounding box is kept, at one bit per pixel"""
+        mask = ribbon()
+        packed = PackedMask.from_array(mask)
+
+        assert packed.shape == (480, 640)
+        assert packed.bbox == (250, 150, 420, 480)
+        assert packed.bits.shape == (330, 22)
+        assert packed.nbytes < mask.nbytes / 100
+
+    def test_empty_mask(self):
+        """Test that an empty mask has no box, area or centroid"""
+        packed = PackedMask.from_array(np.zeros((48, 64), dtype=np.float32))
+
+        assert packed.bbox is None
+        assert packed.area == 0
+        assert packed.centroid() is None
+        assert packed.moments()["m00"] == 0
+        assert not packed.to_array().any()
+        assert PackedMask.from_bytes(packed.to_bytes()) == packed
+
+    def test_serialisation_round_trip(self):
+        """Test that bytes and pickles rebuild the same mask"""
+        packed = PackedMask.from_array(ribbon())
+
+        data = packed.to_bytes()
+        assert len(data) == packed.nbytes
+        assert PackedMask.from_bytes(data) == packed
+        assert pickle.loads(pickle.dumps(packed)) == packed
+        assert len(pickle.dumps(packed)) < packed.nbytes + 200
+
+    def test_to_array(self):
+        """Test that unpacking restores the image and resizing follows cv2.resize"""
+        mask = ribbon()
+        packed = PackedMask.from_array(mask)
+
+        assert np.array_equal(packed.to_array(), mask_to_uint8(mask))
+
+        resized = cv2.resize(mask_to_uint8(mask), (960, 720))
+        scaled = packed.to_array((960, 720))
+        assert np.abs(scaled.astype(int) - resized).max() <= 1
+        cx, cy = packed.centroid((960, 720))
+        ex, ey = mask_centroid(resized)
+        assert abs(cx - ex) <= 1 and abs(cy - ey) <= 1
+
+    def test_pack_result_masks(self):
+        """Test that a segmentation result's masks pack one per instance"""
+        from simulation import StubResult
+
+        result = StubResult(masks=np.stack([ribbon(), np.zeros((480, 640), dtype=np.float32)]))
+
+        packed = pack_masks(result.masks)
+
+        assert len(packed) == 2
+        assert packed[0] == PackedMask.from_array(ribbon())
+        assert packed[1].bbox is None
+
+
+class TestOverlay:
+    """Test the segmentation overlay from a packed mask"""
+
+    def test_matches_float_overlay(self):
+        """Test that a packed mask draws the same overlay as the float mask"""
+        from processing_threads import draw_segmentation_overlay
+
+        frame = np.full((720, 960, 3), 90, dtype=np.uint8)
+        mask = ribbon()
+
+        expected = draw_segmentation_overlay(frame, mask)
+        drawn = draw_segmentation_overlay(frame, PackedMask.from_array(mask))
+
+        # The centroid mark may sit a pixel over; everything else matches
+        assert np.mean(np.abs(drawn.astype(int) - expected) > 2) < 0.005
+
+
+class TestBenchmark:
+    """Test the packed against float mask benchmark"""
+
+    def test_compare(self):
+        """Test that the packed mask is smaller and both paths are timed"""
+        import bench_packed_mask
+
+        result = bench_packed_mask.compare(ribbon(), repeats=1, min_time=0.001)
+
+        assert result["bytes"]["packed"] < result["bytes"]["uint8"] < result["bytes"]["float32"]
+        assert set(result["float_us"]) < set(result["packed_us"])
+        assert all(us > 0 for us in result["packed_us"].values())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
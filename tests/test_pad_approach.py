@@ -0,0 +1,99 @@
+"""
+Tests for the size-aware pad approach controller
+"""
+
+import pytest
+import sys
+import os
+import numpy as np
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pad_approach import PadApproach, select_pad_box
+from simulation import SimulatedDrone, StubDetectionModel, run_mission
+
+
+class TestBoxSelection:
+    """Test picking the box to approach"""
+
+    def test_highest_confidence_wins(self):
+        """Test that the most confident box is chosen, not the first"""
+        boxes = np.array([[0, 0, 10, 10, 0.5, 0], [20, 20, 40, 40, 0.9, 0]])
+        assert select_pad_box(boxes)[4] == pytest.approx(0.9)
+
+    def test_no_boxes(self):
+        """Test that empty detections give no box"""
+        assert select_pad_box([]) is None
+        assert select_pad_box(np.zeros((0, 6))) is None
+
+    def test_overlay_marks_the_selected_box(self):
+        """Test that the detection overlay highlights the box pad_align steers to"""
+        from processing_threads import draw_detection_overlay
+
+        frame = np.zeros((200, 200, 3), dtype=np.uint8)
+        boxes = np.array([[10, 10, 40, 40, 0.5, 0], [120, 120, 160, 160, 0.9, 0]])
+        drawn = draw_detection_overlay(frame, boxes)
+
+        assert drawn[120, 140].any()
+        assert not drawn[10, 25].any()
+
+
+class TestEstimate:
+    """Test bearing and range from a rendered pad"""
+
+    def test_range_and_offset_close_to_truth(self):
+        """Test the estimate against the simulator's true pad position"""
+        drone = SimulatedDrone()
+        drone.takeoff()
+        drone.move_down(30)
+        drone.move_forward(200)
+        boxes = StubDetectionModel().predict(drone.render())[0].boxes.data.cpu().numpy()
+        estimate = PadApproach().estimate(select_pad_box(boxes), 960, drone.get_height())
+
+        (fx, fy), (rx, ry) = drone._heading()
+        dx, dy = drone.pad[0] - drone.x, drone.pad[1] - drone.y
+        assert estimate["forward_cm"] == pytest.approx(dx * fx + dy * fy, rel=0.15)
+        assert estimate["right_cm"] == pytest.approx(dx * rx + dy * ry, abs=15)
+
+
+class TestPlan:
+    """Test the planned combined moves"""
+
+    def test_far_pad_is_approached_in_capped_steps(self):
+        """Test that a far pad gets a partial move that keeps the bearing"""
+        step, final = PadApproach(max_step_cm=200).plan(
+            {"forward_cm": 600, "right_cm": 60, "range_cm": 603}, 50)
+        x, y, z = step
+        assert final is False
+        assert x == pytest.approx(199, abs=1) and y == -20 and z == 0
+
+    def test_near_pad_is_reached_in_one_move(self):
+        """Test that a pad within final range is flown to and the height corrected"""
+        step, final = PadApproach(min_height=30).plan(
+            {"forward_cm": 100, "right_cm": -30, "range_cm": 104}, 20)
+        assert final is True
+        assert step == (100, 30, 10)
+
+    def test_pad_underneath_needs_no_move(self):
+        """Test that moves below the Tello's 20 cm minimum are skipped"""
+        assert PadApproach().plan({"forward_cm": 10, "right_cm": 5, "range_cm": 11}, 50) is None
+
+
+class TestMissionApproach:
+    """Test approach metrics on simulated missions"""
+
+    def test_servo_beats_stepwise(self):
+        """Test that the servo approach lands in fewer commands and seconds"""
+        servo = run_mission(SimulatedDrone())
+        stepwise = run_mission(SimulatedDrone(), stepwise_approach=True)
+
+        assert servo["on_pad"] is True
+        assert servo["approach"]["mode"] == "servo"
+        assert stepwise["approach"]["mode"] == "stepwise"
+        assert servo["approach"]["commands"] * 3 < stepwise["approach"]["commands"]
+        assert servo["approach"]["duration_s"] * 2 < stepwise["approach"]["duration_s"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,106 @@
+"""
+Tests for the pad-presence gate in front of the full pad detector
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pad_gate import PadGate, evaluate_gate, simulated_frames
+from simulation import SimulatedDrone, StubDetectionModel
+
+
+@pytest.fixture
+def views():
+    """One frame with the pad in view and one turned away from it"""
+    drone = SimulatedDrone()
+    drone.takeoff()
+    drone.move_down(30)
+    drone.move_forward(200)
+    with_pad = drone.render().copy()
+    drone.rotate_clockwise(180)
+    return with_pad, drone.render().copy()
+
+
+class TestPadGate:
+    """Test when the full detector is let through"""
+
+    def test_positive_passes(self, views):
+        """Test that a visible pad opens the gate"""
+        gate = PadGate()
+        assert gate.check(StubDetectionModel(), views[0]) is True
+        assert gate.positives == 1
+
+    def test_negatives_forced_periodically(self, views):
+        """Test that every force_every-th negative still runs the full detector"""
+        gate = PadGate(force_every=3)
+        model = StubDetectionModel()
+        decisions = [gate.check(model, views[1]) for _ in range(6)]
+
+        assert decisions == [False, False, True, False, False, True]
+        assert gate.stats()["full_rate"] == pytest.approx(0.333, abs=0.001)
+
+    def test_gate_runs_at_low_resolution(self, views):
+        """Test that the gate pass uses its own small input size"""
+        calls = []
+
+        class Recorder(StubDetectionModel):
+            def predict(self, source, task="detect", imgsz=640, conf=0.4, verbose=False):
+                calls.append(imgsz)
+                return super().predict(source, task, imgsz, conf, verbose)
+
+        PadGate(imgsz=160).check(Recorder(), views[1])
+        assert calls == [160]
+
+
+# Courses whose pad is never far off; from across long_approach or turn_gap
+# the pad is too small for the low-resolution pass until the drone closes in
+NEAR_PAD_COURSES = ("straight", "gentle_bend", "dogleg")
+
+
+class TestGateRecall:
+    """Test recall measured against the full detector"""
+
+    def test_recall_on_simulated_frames(self):
+        """Test that the default gate keeps every nearby pad frame and skips others"""
+        result = evaluate_gate(simulated_frames(courses=NEAR_PAD_COURSES), StubDetectionModel())
+
+        assert result["full_positives"] > 0
+        assert result["recall"] == 1.0
+        assert result["full_rate"] < 1.0
+
+    def test_forced_checks_raise_recall(self):
+        """Test that forced checks catch pads a too-coarse gate misses"""
+        result = evaluate_gate(simulated_frames(), StubDetectionModel(), PadGate(imgsz=160))
+
+        assert result["recall"] < 1.0
+        assert result["recall_with_forced"] > result["recall"]
+
+
+class TestWorkerGate:
+    """Test the gate inside path following"""
+
+    def test_full_detector_skipped_without_pad(self, make_worker):
+        """Test that path ticks with no pad in view rarely run the full detector"""
+        # Pad behind the start, out of view for the whole path
+        drone = SimulatedDrone(path=[(400, 760), (400, 120)], pad=(700, 780))
+        worker, _ = make_worker(drone, started=True)
+
+        for _ in range(8):
+            worker._tick_path()
+
+        assert worker.get_mission_state().name == "path_follow"
+        # Eight gate passes plus two forced full checks
+        assert worker.pad_gate.checks == 8
+        assert worker.pad_model.calls == 8 + 2
+        # Gate passes count as inference like the full passes do
+        assert worker.inference_counts["path_follow"] == 8 + 2 + 8
+        assert "pad_gate" in worker.rate_control.inference_s
+        worker.stop_worker()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,230 @@
+"""
+Tests for the adaptive tick and overlay rate controller
+"""
+
+import pytest
+import sys
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from mission_state import PAD_ALIGN, PAD_SEARCH, PATH_FOLLOW
+from rate_control import CpuMeter, RateController
+
+
+class FakeCpu:
+    """Returns the queued loads in turn, then nothing new"""
+
+    def __init__(self, *loads):
+        self.loads = list(loads)
+
+    def __call__(self):
+        return self.loads.pop(0) if self.loads else None
+
+
+class TestRateController:
+    """Test the chosen tick and overlay rates"""
+
+    def test_pad_alignment_ticks_faster(self):
+        """Test that pad alignment runs at its lower bound"""
+        rates = RateController()
+
+        assert rates.update(PAD_ALIGN) == 150
+        assert rates.tick_ms(PAD_ALIGN) < PAD_ALIGN.tick_ms
+
+    def test_steady_path_relaxes_then_snaps_back(self):
+        """Test that a centred path slows the tick up to its bound and a correction resets it"""
+        rates = RateController()
+        ticks = []
+        for _ in range(20):
+            rates.note_steering(True)
+            ticks.append(rates.update(PATH_FOLLOW))
+
+        assert ticks[0] > PATH_FOLLOW.tick_ms
+        assert ticks == sorted(ticks)
+        assert ticks[-1] == 1400
+
+        rates.note_steering(False)
+        assert rates.update(PATH_FOLLOW) == PATH_FOLLOW.tick_ms
+
+    def test_inference_sets_a_floor(self):
+        """Test that slow inference stretches the tick, within the upper bound"""
+        rates = RateController(duty=0.6)
+        rates.record_inference("pad", 0.24)
+        assert rates.update(PAD_ALIGN) == 400
+
+        for _ in range(30):
+            rates.record_inference("pad", 0.6)
+            rates.update(PAD_ALIGN)
+        assert rates.tick_ms(PAD_ALIGN) == 600
+        assert rates.inference_s["pad"] == pytest.approx(0.6, abs=0.01)
+
+    def test_cpu_load_backs_off_and_recovers(self):
+        """Test that high CPU slows every rate step by step and low CPU brings them back"""
+        rates = RateController(cpu=FakeCpu(0.95, 0.95, None, 0.3, 0.3, 0.3, 0.3, 0.3))
+        rates.update(PATH_FOLLOW)
+        slowed = rates.update(PATH_FOLLOW)
+        assert slowed == round(700 * 1.25 * 1.25)
+        assert rates.update(PATH_FOLLOW) == slowed
+        assert rates.overlay_interval() > rates.overlay_s
+        assert rates.cpu_load == 0.95
+
+        for _ in range(5):
+            rates.update(PATH_FOLLOW)
+        assert rates.tick_ms(PATH_FOLLOW) == 700
+
+    def test_power_save_and_low_battery(self):
+        """Test that a battery board or a low drone battery slows the rates"""
+        rates = RateController(power_save=True)
+        assert rates.tick_ms(PATH_FOLLOW) == round(700 * 1.5)
+
+        rates = RateController(low_battery=25)
+        rates.note_battery(60)
+        assert rates.tick_ms(PATH_FOLLOW) == 700
+        rates.note_battery(20)
+        assert rates.tick_ms(PATH_FOLLOW) == round(700 * 1.5)
+
+    def test_unbounded_and_disabled_states_keep_their_period(self):
+        """Test that pad search and a disabled controller use the state's own period"""
+        rates = RateController(power_save=True)
+        assert rates.update(PAD_SEARCH) == PAD_SEARCH.tick_ms
+
+        rates.enabled = False
+        assert rates.update(PAD_ALIGN) == PAD_ALIGN.tick_ms
+        assert rates.overlay_interval() == rates.overlay_s
+
+    def test_overlay_interval(self):
+        """Test that overlays slow with steady flight and slow predictions, within bounds"""
+        rates = RateController(overlay_bounds=(0.1, 1.0), overlay_duty=0.5)
+        rates.update(PATH_FOLLOW)
+        assert rates.overlay_interval() == pytest.approx(0.1)
+
+        rates.record_overlay(0.2)
+        rates.update(PATH_FOLLOW)
+        assert rates.overlay_interval() == pytest.approx(0.4)
+
+        rates.record_overlay(5.0)
+        rates.update(PATH_FOLLOW)
+        assert rates.overlay_interval() == 1.0
+
+
+class TestReport:
+    """Test the rate history and summary"""
+
+    def test_history_and_time_weighted_summary(self, clock):
+        """Test that only real changes are kept and the summary weighs them by time"""
+        rates = RateController(clock=clock)
+        rates.update(PATH_FOLLOW)
+        clock.now = 1.0
+        rates.update(PATH_FOLLOW)
+        assert len(rates.history) == 1
+
+        clock.now = 4.0
+        rates.update(PAD_ALIGN)
+        summary = rates.summary(now=5.0)
+
+        assert [r["state"] for r in rates.history] == ["path_follow", "pad_align"]
+        assert summary["states"]["path_follow"] == {"seconds": 4.0, "mean_tick_ms": 700, "min_tick_ms": 700,
+                                                    "max_tick_ms": 700, "mean_overlay_ms": 100}
+        assert summary["states"]["pad_align"]["mean_tick_ms"] == 150
+        assert "pad_align" in rates.format_report(summary)
+
+    def test_reset_keeps_latencies(self):
+        """Test that a new mission clears the history but not the measured inference"""
+        rates = RateController()
+        rates.record_inference("path", 0.1)
+        rates.note_steering(True)
+        rates.update(PATH_FOLLOW)
+
+        rates.reset()
+
+        assert not rates.history
+        assert rates.tick_ms(PATH_FOLLOW) == 700
+        assert rates.inference_s["path"] == pytest.approx(0.1)
+
+
+class TestCpuMeter:
+    """Test the process CPU meter"""
+
+    def test_share_of_cores(self):
+        """Test that the meter waits out its interval, then reports a share"""
+        meter = CpuMeter(min_interval=0.05)
+        assert meter() is None
+
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+        share = meter()
+
+        assert 0 < share <= 1
+
+
+class TestOverlayPacing:
+    """Test the overlay threads under a rate controller"""
+
+    def test_thread_records_and_follows_interval(self):
+        """Test that an overlay thread times its predictions and sleeps out the interval"""
+        import numpy as np
+        from processing_threads import DetectionThread
+        from simulation import StubDetectionModel
+
+        rates = RateController(overlay_bounds=(0.1, 1.0))
+        rates._overlay = 0.2
+        thread = DetectionThread(StubDetectionModel(), rate=rates)
+        thread.set_frame(np.zeros((720, 960, 3), dtype=np.uint8))
+        thread.start()
+        time.sleep(0.5)
+        thread.stop()
+
+        assert 2 <= thread.model.calls <= 4
+        assert rates.overlay_inference_s is not None
+
+
+class TestWorker:
+    """Test the rate controller in DroneWorker"""
+
+    def test_simulated_mission_reports_rates(self):
+        """Test that a mission ticks pad alignment faster and reports its rates"""
+        from simulation import run_mission
+
+        # Free inference, so no state's tick is held up by an inference floor
+        result = run_mission(inference_time=0.0)
+
+        assert result["landed"]
+        assert result["rates"]["states"]["pad_align"]["mean_tick_ms"] == 150
+        assert result["rates"]["states"]["path_follow"]["mean_tick_ms"] == 700
+
+    def test_fixed_rate(self):
+        """Test that a disabled controller keeps the state periods"""
+        from simulation import run_mission
+
+        result = run_mission(adaptive_rate=False)
+
+        assert result["landed"]
+        assert result["rates"] is None
+
+
+class TestBenchmark:
+    """Test the fixed against adaptive rate benchmark"""
+
+    def test_modes_measured(self):
+        """Test that each mode flies the course and reports CPU and predictions"""
+        import bench_rate_control
+        from simulation import COURSES
+
+        result = bench_rate_control.measure(modes=("fixed", "adaptive"), inference_time=0.01, overlay_time=0.01,
+                                            time_scale=0.01, course=COURSES["straight"])
+        fixed, adaptive = result["results"]
+
+        assert fixed["on_pad"] and adaptive["on_pad"]
+        assert fixed["mean_tick_ms"] is None
+        assert adaptive["mean_tick_ms"]["pad_align"] == 150
+        assert fixed["overlay_predictions"] > 0 and adaptive["control_predictions"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,271 @@
+"""
+Tests for the emergency and landing priority lane
+"""
+
+import pytest
+import sys
+import os
+import socket
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from safety_lane import SafetyLane, SafetyTripped, command_address
+from simulation import SimulatedDrone
+
+
+class RecordingDrone:
+    def __init__(self, emergency_fails=False):
+        self.calls = []
+        self.emergency_fails = emergency_fails
+
+    def emergency(self):
+        self.calls.append("emergency")
+        if self.emergency_fails:
+            raise RuntimeError("not supported")
+
+    def land(self):
+        self.calls.append("land")
+
+    def cancel_commands(self, reason):
+        self.calls.append("cancel")
+
+
+class TestSafetyLane:
+    """Test the lane on its own"""
+
+    def test_trigger_without_thread(self):
+        """Test that an unstarted lane acts on the calling thread"""
+        lane = SafetyLane()
+        drone = RecordingDrone()
+        lane.attach(drone)
+
+        record = lane.trigger("emergency", "test")
+        assert drone.calls == ["emergency"]
+        assert record["path"] == "client" and record["error"] is None
+        assert lane.tripped.is_set() and lane.action == "emergency"
+        assert list(lane.records) == [record]
+
+    def test_gate_after_trip(self):
+        """Test that motion is refused once tripped while landing and queries pass"""
+        lane = SafetyLane()
+        lane.attach(RecordingDrone())
+        lane.check("move_forward")
+        lane.trigger("emergency")
+
+        with pytest.raises(SafetyTripped):
+            lane.check("move_forward")
+        lane.check("land")
+        lane.check("get_height")
+        lane.reset()
+        lane.check("move_forward")
+
+    def test_not_caught_as_exception(self):
+        """Test that recovery code catching Exception cannot swallow the abort"""
+        with pytest.raises(SafetyTripped):
+            try:
+                raise SafetyTripped("tripped")
+            except Exception:
+                pass
+
+    def test_sleep_wakes(self):
+        """Test that a long sleep ends as soon as the lane fires"""
+        lane = SafetyLane()
+        lane.attach(RecordingDrone())
+        lane.start()
+        threading.Timer(0.05, lane.trigger).start()
+
+        started = time.monotonic()
+        with pytest.raises(SafetyTripped):
+            lane.sleep(5)
+        assert time.monotonic() - started < 1
+        lane.stop()
+
+    def test_direct_socket(self):
+        """Test that the lane sends emergency from its own socket and then the client's"""
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(("127.0.0.1", 0))
+        receiver.settimeout(2)
+        drone = RecordingDrone()
+        drone.address = receiver.getsockname()
+        lane = SafetyLane()
+        lane.attach(drone)
+        lane.start()
+
+        lane.trigger("emergency", "test")
+        assert receiver.recvfrom(64)[0] == b"emergency"
+        lane.stop()
+        receiver.close()
+        assert lane.records[-1]["path"] == "socket"
+        assert drone.calls == ["emergency"]
+
+    def test_emergency_falls_back_to_land(self):
+        """Test that a handle without emergency is landed"""
+        lane = SafetyLane()
+        drone = RecordingDrone(emergency_fails=True)
+        lane.attach(drone)
+
+        assert lane.trigger("emergency")["path"] == "land"
+        assert drone.calls == ["emergency", "land"]
+
+    def test_land_cancels_queue_first(self):
+        """Test that landing clears the client's queue before it lands"""
+        lane = SafetyLane()
+        drone = RecordingDrone()
+        lane.attach(drone)
+
+        lane.trigger("land")
+        assert drone.calls == ["cancel", "land"]
+
+    def test_unknown_action(self):
+        """Test that only emergency and land are accepted"""
+        with pytest.raises(ValueError):
+            SafetyLane().trigger("flip")
+        assert command_address(RecordingDrone()) is None
+
+
+class TestTelloPreemption:
+    """Test that an emergency does not wait for the command in flight"""
+
+    def test_emergency_fails_blocked_takeoff(self):
+        """Test that a blocked takeoff fails at once and the emulator gets the stop"""
+        from tello_async import TelloClient, TelloError
+        from tello_emulator import TelloEmulator
+
+        client = TelloClient(host="127.0.0.1", command_port=0, state_port=None, video_port=0,
+                             timeout=10, retries=0, bind_host="127.0.0.1")
+        emulator = TelloEmulator(motion_delay=5)
+        client.client.address = emulator.address
+        emulator.start()
+        try:
+            client.connect()
+            outcome = []
+
+            def takeoff():
+                try:
+                    client.takeoff()
+                except TelloError as e:
+                    outcome.append(e)
+            thread = threading.Thread(target=takeoff)
+            thread.start()
+            time.sleep(0.2)
+            started = time.monotonic()
+            client.emergency()
+            thread.join(timeout=2)
+
+            assert outcome and time.monotonic() - started < 1
+            assert command_address(client) == emulator.address
+            client.connect()  # the queue still works afterwards
+            assert emulator.commands()[-2:] == ["emergency", "command"]
+        finally:
+            client.end()
+            emulator.stop()
+
+
+@pytest.fixture
+def flying(make_worker):
+    """A worker mid-mission on the simulator, and the list its finish appends to"""
+    worker, drone = make_worker(started=True)
+    finished = []
+    worker.signals.mission_finished.connect(lambda: finished.append(True))
+    return worker, drone, finished
+
+
+def wait_for_lane(worker, count=1):
+    deadline = time.monotonic() + 2
+    while len(worker.safety.records) < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    return worker.safety.records[-1]
+
+
+class TestWorker:
+    """Test how a mission ends when the lane fires"""
+
+    def test_press_between_ticks(self, flying):
+        """Test that the next tick ends the mission without flying on"""
+        worker, drone, finished = flying
+        worker.tick()
+        worker.safety.trigger("emergency", "test")
+        assert wait_for_lane(worker)["path"] == "client"
+        sent = len(drone.commands)
+        worker.tick()
+
+        assert worker.mission.state.name == "finished"
+        assert finished == [True]
+        assert len(drone.commands) == sent
+        assert drone.commands[-1][0] == "emergency"
+
+    def test_press_during_inference(self, flying):
+        """Test that a press during inference stops the move it would have caused"""
+        worker, drone, finished = flying
+        worker.tick()
+        assert worker.mission.state.name == "pad_align"
+        predict = worker.pad_model.predict
+
+        def press_then_predict(*args, **kwargs):
+            worker.safety.trigger("emergency", "test")
+            wait_for_lane(worker)
+            return predict(*args, **kwargs)
+        worker.pad_model.predict = press_then_predict
+        worker.tick()
+
+        assert worker.mission.state.name == "finished"
+        assert finished == [True]
+        assert drone.commands[-1][0] == "emergency"
+        assert worker.command_stats.commands.get("go_xyz_speed") is None
+
+    def test_emergency_land_slot(self, flying):
+        """Test that the old slot goes through the lane and ends the mission once"""
+        worker, drone, finished = flying
+        worker.emergency_land()
+
+        assert finished == [True]
+        assert wait_for_lane(worker)["reason"] == "emergency_land"
+        assert not drone.flying
+
+    def test_rearm_clears_trip(self, flying):
+        """Test that the next mission may fly again"""
+        worker, drone, _ = flying
+        worker.emergency_land()
+        wait_for_lane(worker)
+        worker.rearm()
+
+        assert not worker.safety.tripped.is_set()
+
+    def test_scaled_waits_still_wake_on_trip(self):
+        """Test that sleep_scale shortens command waits without bypassing the lane"""
+        from drone_worker import DroneWorker
+
+        worker = DroneWorker(drone_factory=SimulatedDrone)
+        worker.sleep_scale = 0.01
+        started = time.monotonic()
+        worker._pause(2)
+        assert time.monotonic() - started < 1
+
+        worker.sleep_scale = 1.0
+        threading.Timer(0.05, worker.safety.tripped.set).start()
+        with pytest.raises(SafetyTripped):
+            worker._pause(10)
+        assert time.monotonic() - started < 2
+
+
+class TestBenchmark:
+    """Test the key-press benchmark"""
+
+    def test_lane_beats_queue(self):
+        """Test that the lane stops the drone before the queued slot could"""
+        import bench_safety_lane
+
+        result = bench_safety_lane.measure(trials=1, inference_time=0.05, time_scale=0.05,
+                                           press_window=(0.3, 0.3), busy_threads=0)
+        lane, queued = (r for mode in ("lane", "queued") for r in result["results"] if r["mode"] == mode)
+        assert lane["latency_ms"] < 50 < queued["latency_ms"]
+        assert lane["finished_signals"] == queued["finished_signals"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
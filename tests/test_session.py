@@ -0,0 +1,148 @@
+"""
+Tests for warm re-arm between missions
+"""
+
+import pytest
+import sys
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from mission_state import FINISHED, PATH_FOLLOW
+from simulation import SimulatedDrone
+
+
+def fly(worker, drone, max_ticks=500):
+    drone.reset()
+    worker.start_drone_mission()
+    worker.control_loop_timer.stop()
+    for _ in range(max_ticks):
+        if not worker._is_running:
+            break
+        worker.tick()
+        drone.advance(worker.current_tick_ms() / 1000)
+    return drone.distance_to_pad() <= drone.pad_size / 2 and not drone.flying
+
+
+class TestRearm:
+    """Test resetting only the mission between flights"""
+
+    def test_second_mission_on_warm_session(self, make_worker):
+        """Test that a re-armed worker keeps its handle and models and flies again"""
+        worker, drone = make_worker()
+        worker.run()
+        handle, models = worker.drone, (worker.path_model, worker.pad_model)
+        assert fly(worker, drone)
+
+        record = worker.rearm()
+        assert record["mode"] == "warm"
+        assert worker.drone is handle
+        assert (worker.path_model, worker.pad_model) == models
+        assert worker.inference_counts == {}
+        assert worker.command_stats.commands.get("takeoff") is None
+        assert [r["mode"] for r in worker.ready_times] == ["cold", "warm"]
+
+        assert fly(worker, drone)
+        assert worker.mission.state is FINISHED
+
+    def test_refused_mid_mission(self, make_worker):
+        """Test that a mission in progress is not reset"""
+        worker, drone = make_worker()
+        worker.run()
+        worker.start_drone_mission()
+        worker.control_loop_timer.stop()
+
+        assert worker.rearm() is None
+        assert worker.mission.state is PATH_FOLLOW
+
+    def test_reconnects_when_wake_fails(self, make_worker):
+        """Test that a handle that no longer answers is replaced"""
+        handles, ended = [], []
+
+        class Handle(SimulatedDrone):
+            """Holds its ports until ended, as a TelloClient does"""
+
+            def connect(self):
+                if any(handle is not self and handle not in ended for handle in handles):
+                    raise OSError(98, "Address already in use")
+                super().connect()
+
+            def end(self):
+                ended.append(self)
+
+        def factory():
+            handles.append(Handle())
+            return handles[-1]
+
+        worker, _ = make_worker(factory=factory)
+        worker.run()
+        started = []
+        worker.signals.mission_started.connect(lambda: started.append(True))
+
+        def fail():
+            raise RuntimeError("no reply")
+        handles[0].connect = fail
+
+        record = worker.rearm()
+        assert record["mode"] == "reconnect"
+        assert worker.drone.drone is handles[1]
+        assert ended == [handles[0]]
+        assert started == [True]
+
+
+class TestPersistentGui:
+    """Test that the GUI re-arms instead of quitting"""
+
+    def test_threads_survive_missions(self):
+        """Test that two missions share one camera thread and end warm"""
+        from PySide6.QtCore import QEventLoop, QTimer
+        from PySide6.QtWidgets import QApplication
+        from soak import SoakRunner
+
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        runner = SoakRunner(speedup=50, persistent=True, mission_timeout=60)
+        drone, gui = runner._make_gui()
+        try:
+            loop = QEventLoop()
+            gui.worker.signals.mission_started.connect(loop.quit)
+            QTimer.singleShot(5000, loop.quit)
+            loop.exec()
+            camera = gui.camera_thread
+            assert camera is not None
+
+            ready = []
+            gui.worker.signals.session_ready.connect(ready.append)
+            for _ in range(2):
+                runner._fly_mission(gui, drone)
+                for _ in range(100):
+                    app.processEvents()
+                    if len(ready) == runner.missions:
+                        break
+                    QTimer.singleShot(20, loop.quit)
+                    loop.exec()
+
+            assert [r["mode"] for r in ready] == ["warm", "warm"]
+            assert gui.camera_thread is camera and camera.isRunning()
+        finally:
+            runner._shutdown(app, gui)
+
+
+class TestBenchmark:
+    """Test the time-to-ready benchmark"""
+
+    def test_cold_and_warm_measured(self):
+        """Test that a spawned cold start and its re-arms are both reported"""
+        import bench_time_to_ready
+
+        result = bench_time_to_ready.measure(drone="simulated", models="stub", rearms=2)
+
+        assert result["cold_process_s"] > result["cold_run_s"]
+        assert result["warm_modes"] == ["warm"]
+        assert result["warm_max_s"] < result["cold_process_s"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
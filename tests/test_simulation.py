@@ -0,0 +1,154 @@
+"""
+Tests for the simulated drone, stub models and headless mission runner
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from simulation import (SimulatedDrone, SimulationError, StubDetectionModel,
+                        StubSegmentationModel, main, run_batch, run_mission)
+
+
+@pytest.fixture
+def drone():
+    """A simulated drone that has taken off"""
+    drone = SimulatedDrone()
+    drone.takeoff()
+    return drone
+
+
+class TestKinematics:
+    """Test that commands move the simulated drone"""
+
+    def test_moves_follow_heading(self, drone):
+        """Test that forward/right moves follow the current yaw"""
+        drone.yaw = 0
+        x, y = drone.x, drone.y
+        drone.move_forward(50)
+        assert (drone.x, drone.y) == pytest.approx((x, y - 50))
+
+        drone.rotate_clockwise(90)
+        drone.move_forward(20)
+        assert (drone.x, drone.y) == pytest.approx((x + 20, y - 50))
+        assert drone.get_yaw() == 90
+
+    def test_commands_advance_virtual_clock(self, drone):
+        """Test that motion costs time at the set speed"""
+        drone.set_speed(20)
+        start = drone.clock
+        drone.move_forward(100)
+
+        assert drone.clock - start == pytest.approx(drone.COMMAND_OVERHEAD + 5.0)
+
+    def test_rc_control_integrates_over_time(self, drone):
+        """Test that rc sticks move the drone while time passes"""
+        drone.yaw = 0
+        y = drone.y
+        drone.send_rc_control(0, 50, 0, 0)
+        drone.advance(2.0)
+
+        assert drone.y == pytest.approx(y - 100)
+        assert drone.get_speed_x() == 50
+
+    def test_reset_can_keep_the_clock(self, drone):
+        """Test that a reset for the next mission need not rewind time"""
+        drone.move_forward(100)
+        elapsed = drone.clock
+
+        drone.reset(keep_clock=True)
+        assert drone.clock == elapsed
+        assert drone.height == 0 and drone.commands == []
+
+        drone.reset()
+        assert drone.clock == 0
+
+    def test_battery_drains_in_flight(self, drone):
+        """Test that flying uses battery"""
+        drone.advance(78.0)
+
+        assert drone.get_battery() == 89
+
+    def test_out_of_range_move_rejected(self, drone):
+        """Test that the Tello's 20 cm minimum is enforced"""
+        with pytest.raises(SimulationError):
+            drone.move_forward(10)
+
+    def test_mission_pad_id_near_pad(self, drone):
+        """Test that the target pad is reported only when the drone is over it"""
+        drone.enable_mission_pads()
+        assert drone.get_mission_pad_id() == -1
+
+        drone.x, drone.y = drone.pad
+        assert drone.get_mission_pad_id() == drone.pad_id
+
+
+class TestStubModels:
+    """Test the colour-based stub models on rendered frames"""
+
+    def test_path_is_segmented_ahead(self, drone):
+        """Test that the ribbon under the drone is found near the image centre"""
+        results = StubSegmentationModel().predict(drone.render())
+        masks = results[0].masks.data.cpu().numpy()
+
+        assert masks.shape == (1, 480, 640)
+        columns = masks[0].nonzero()[1]
+        assert abs(columns.mean() - 320) < 40
+
+    def test_pad_detected_when_in_view(self):
+        """Test that the pad is boxed when the drone looks at it"""
+        drone = SimulatedDrone(path=[(400, 760), (400, 120)], pad=(400, 120))
+        drone.takeoff()
+        drone.rotate_clockwise(180)
+        assert StubDetectionModel().predict(drone.render())[0].boxes is None
+
+        drone.rotate_clockwise(180)
+        drone.move_forward(400)
+        boxes = StubDetectionModel().predict(drone.render())[0].boxes.data.cpu().numpy()
+        assert boxes.shape[1] == 6
+        assert 400 < (boxes[0][0] + boxes[0][2]) / 2 < 560
+
+
+class TestMissionRunner:
+    """Test headless missions on virtual time"""
+
+    def test_mission_lands_on_pad_faster_than_real_time(self):
+        """Test that the default course is flown end to end"""
+        result = run_mission()
+
+        assert result["landed"] is True
+        assert result["on_pad"] is True
+        assert result["commands"] > 0
+        assert result["duration_s"] > result["wall_s"] * 10
+        # The stub models charge a realistic inference time by default
+        assert result["frame_age"]["age_ms"]["p50"] >= 100
+
+    def test_batch_reports_each_course(self):
+        """Test that a batch returns one result per course and repeat"""
+        results = run_batch(["gentle_bend", "dogleg"], repeats=2)
+
+        assert [r["course"] for r in results] == ["gentle_bend"] * 2 + ["dogleg"] * 2
+        # Missions are deterministic
+        assert results[0]["commands"] == results[1]["commands"]
+
+    def test_far_pad_and_path_gap_courses(self, capfd):
+        """Test that the pad is found from out of view and a path gap is recovered"""
+        results = {r["course"]: r for r in run_batch(["long_approach", "turn_gap"])}
+
+        for result in results.values():
+            assert result["landed"] is True
+            assert result["on_pad"] is True
+        assert "path_recovery" in results["turn_gap"]["states"]
+        # The worker's QTimer is deleted before teardown
+        assert "startTimer" not in capfd.readouterr().err
+
+    def test_exit_code_requires_landing_on_pad(self):
+        """Test that a mission which lands off the pad fails the run"""
+        assert main(["--courses", "straight", "--stepwise-approach"]) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
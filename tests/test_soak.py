@@ -0,0 +1,53 @@
+"""
+Tests for the soak-test runner
+"""
+
+import json
+import pytest
+import subprocess
+import sys
+import os
+
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+
+class TestSoak:
+    """Run a short soak in a subprocess so Qt state does not leak into other tests"""
+
+    def test_short_soak_passes_and_writes_report(self, tmp_path):
+        """Test that a short accelerated soak completes missions within budget"""
+        report_path = tmp_path / "soak.json"
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        result = subprocess.run(
+            [sys.executable, os.path.join(SRC, "soak.py"), "--duration", "8",
+             "--warmup", "2", "--speedup", "50", "--sample-interval", "1",
+             "--report", str(report_path)],
+            env=env, capture_output=True, text=True, timeout=180,
+        )
+
+        assert result.returncode == 0, result.stdout + result.stderr
+        report = json.loads(report_path.read_text())
+        assert report["passed"] is True
+        assert report["missions"] >= 1
+        assert report["samples"]
+        assert set(report["growth"]) == {"rss_mb", "traced_mb", "threads", "handles"}
+
+    def test_budget_failure_exits_nonzero(self, tmp_path):
+        """Test that exceeding a budget fails the run"""
+        report_path = tmp_path / "soak.json"
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        result = subprocess.run(
+            [sys.executable, os.path.join(SRC, "soak.py"), "--duration", "4",
+             "--warmup", "0", "--speedup", "50", "--sample-interval", "1",
+             "--traced-mb", "-1000", "--report", str(report_path)],
+            env=env, capture_output=True, text=True, timeout=180,
+        )
+
+        assert result.returncode == 1
+        report = json.loads(report_path.read_text())
+        assert report["passed"] is False
+        assert report["failures"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
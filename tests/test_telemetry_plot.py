@@ -0,0 +1,189 @@
+"""
+Tests for the ring-buffered, decimated telemetry plots
+"""
+
+import pytest
+import sys
+import os
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Add src and benchmarks to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+from PySide6.QtCore import QCoreApplication, Qt
+from PySide6.QtWidgets import QApplication
+
+from telemetry_plot import RingBuffer, TelemetryPanel, decimate, polygon
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+class TestRingBuffer:
+    """Test the fixed-size sample ring"""
+
+    def test_keeps_newest_in_order(self):
+        """Test that a wrapped ring returns the newest samples oldest first"""
+        ring = RingBuffer(5)
+        for i in range(12):
+            ring.append(i, i * 10)
+
+        t, values = ring.window()
+
+        assert len(ring) == 5
+        assert t.tolist() == [7, 8, 9, 10, 11]
+        assert values.tolist() == [70, 80, 90, 100, 110]
+        assert ring.latest() == (11, 110)
+
+    def test_window_across_the_wrap(self):
+        """Test that window start is found in either half of a wrapped ring"""
+        ring = RingBuffer(5)
+        for i in range(7):
+            ring.append(i, i)
+
+        assert ring.window(3)[0].tolist() == [3, 4, 5, 6]
+        assert ring.window(5.5)[0].tolist() == [6]
+        assert ring.window(100)[0].tolist() == []
+
+    def test_memory_is_fixed(self):
+        """Test that appending never grows the arrays"""
+        ring = RingBuffer(1000)
+        before = ring.t.nbytes + ring.values.nbytes
+        for i in range(50000):
+            ring.append(i, i)
+
+        assert ring.t.nbytes + ring.values.nbytes == before
+        assert ring.count == 50000
+
+
+class TestDecimate:
+    """Test min/max decimation to pixel columns"""
+
+    def test_one_entry_per_column(self):
+        """Test that many samples reduce to at most one entry per column"""
+        t = np.linspace(0, 100, 100000)
+        column, low, high = decimate(t, np.sin(t), 0, 100, 200)
+
+        assert len(column) == 200
+        assert np.all(np.diff(column) > 0)
+        assert np.all(low <= high)
+
+    def test_spike_survives(self):
+        """Test that a single-sample spike keeps its peak"""
+        t = np.arange(10000, dtype=float)
+        values = np.zeros(10000)
+        values[4321] = 99
+
+        _, low, high = decimate(t, values, 0, 10000, 50)
+
+        assert high.max() == 99
+        assert low.min() == 0
+
+    def test_empty(self):
+        """Test that no samples give empty arrays"""
+        column, low, high = decimate(np.zeros(0), np.zeros(0), 0, 10, 100)
+
+        assert len(column) == len(low) == len(high) == 0
+
+
+class TestPolygon:
+    """Test the bulk QPolygonF builder"""
+
+    def test_coordinates(self, app):
+        """Test that every vertex lands where the arrays put it"""
+        xs = np.arange(100, dtype=float)
+        poly = polygon(xs, xs * 2.5)
+
+        assert poly.size() == 100
+        assert (poly[0].x(), poly[0].y()) == (0, 0)
+        assert (poly[99].x(), poly[99].y()) == (99, 247.5)
+
+
+class TestTelemetryPanel:
+    """Test the telemetry panel widget"""
+
+    def test_records_numeric_channels_only(self, app, clock):
+        """Test that missing, None, bool and text values are skipped"""
+        panel = TelemetryPanel(clock=clock)
+
+        panel.add_sample({"altitude": 80, "battery": None, "yaw": True, "state": "path_follow"})
+        panel.add_sample({"altitude": 85.5, "inference_ms": 31.2})
+
+        assert len(panel.buffers["altitude"]) == 2
+        assert len(panel.buffers["battery"]) == 0
+        assert len(panel.buffers["yaw"]) == 0
+        assert panel.buffers["inference_ms"].latest()[1] == pytest.approx(31.2)
+
+    def test_redraws_capped(self, app):
+        """Test that a flood of samples repaints at most max_fps times a second"""
+        panel = TelemetryPanel(max_fps=5)
+        started = time.monotonic()
+        while time.monotonic() - started < 0.5:
+            panel.add_sample({"altitude": 80})
+            QCoreApplication.processEvents()
+
+        assert 1 <= panel.redraws <= 4
+
+    def test_paints_a_long_session(self, app, clock):
+        """Test that hours of samples paint from a bounded, decimated window"""
+        panel = TelemetryPanel(clock=clock, capacity=4096, window_s=60)
+        panel.resize(400, 220)
+        for i in range(30 * 3600):
+            clock.now = i / 30
+            panel.add_sample({"altitude": 100 + i % 7, "yaw": i % 360 - 180, "command_ms": 40.0})
+
+        data = panel.plot_data(400)
+        panel.grab()
+
+        assert len(panel.buffers["altitude"]) == 4096
+        assert len(data["altitude"][0]) <= 400
+        assert data["battery"][0].size == 0
+        assert len(panel.paint_times) == 1
+
+
+class TestWorkerTelemetry:
+    """Test the plotted fields in the worker's telemetry"""
+
+    def test_yaw_and_latencies_emitted(self, make_worker):
+        """Test that telemetry carries yaw and inference and command times"""
+        worker, drone = make_worker(inference_time=0.03)
+        samples = []
+        worker.signals.telemetry_updated.connect(samples.append, Qt.DirectConnection)
+        worker.run()
+
+        worker.start_drone_mission()
+        worker.control_loop_timer.stop()
+        for _ in range(5):
+            worker.tick()
+            drone.advance(0.1)
+        worker.stop_worker()
+
+        assert samples and all("yaw" in sample for sample in samples)
+        assert any(sample.get("inference_ms", 0) > 0 for sample in samples)
+        assert any(sample.get("command_ms", 0) > 0 for sample in samples)
+
+
+class TestBenchmark:
+    """Test the long-session plot benchmark"""
+
+    def test_ring_stays_flat(self, app):
+        """Test that the ring panel's memory stays flat while the naive one grows"""
+        import bench_telemetry_plot
+
+        result = bench_telemetry_plot.measure(hours=0.05, rate=30, every_min=1.5, window_s=30)
+        rows = result["rows"]
+
+        assert len(rows) == 2
+        assert rows[0]["ring_kb"] == rows[1]["ring_kb"]
+        assert rows[1]["naive_kb"] > rows[0]["naive_kb"]
+        assert rows[1]["ring_paint_ms"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
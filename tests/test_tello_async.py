@@ -0,0 +1,137 @@
+"""
+Tests for the asyncio Tello client against the local UDP emulator
+"""
+
+import pytest
+import sys
+import os
+
+# Add src to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tello_async import TelloClient, TelloError, decode_state
+from tello_emulator import TelloEmulator
+
+
+@pytest.fixture
+def client():
+    """A TelloClient connected to a running emulator"""
+    client = TelloClient(host="127.0.0.1", command_port=0, state_port=0,
+                         timeout=0.5, retries=2, bind_host="127.0.0.1")
+    emulator = TelloEmulator(state_port=client.client.state_port, state_hz=50)
+    client.client.address = emulator.address
+    emulator.start()
+    client.emulator = emulator
+    yield client
+    client.end()
+    emulator.stop()
+
+
+class TestDecodeState:
+    """Test decoding of state datagrams"""
+
+    def test_decode_state_packet(self):
+        """Test that numbers and the mpry triple are parsed"""
+        state = decode_state(b"mid:5;x:10;mpry:0,1,2;yaw:-30;h:50;bat:87;baro:12.50;\r\n")
+
+        assert state["mid"] == 5
+        assert state["mpry"] == [0, 1, 2]
+        assert state["yaw"] == -30
+        assert state["h"] == 50
+        assert state["bat"] == 87
+        assert state["baro"] == 12.5
+
+
+class TestTelloClient:
+    """Test TelloClient against TelloEmulator"""
+
+    def test_connect_and_state_snapshot(self, client):
+        """Test that connecting starts the state stream"""
+        client.connect()
+
+        assert client.state.packets > 0
+        assert client.get_battery() == 100
+        assert client.get_height() == 0
+        assert client.get_mission_pad_id() == -2
+
+    def test_commands_update_state(self, client):
+        """Test that motion commands are acknowledged and reflected in state"""
+        client.connect()
+        client.takeoff()
+        client.move_up(40)
+        client.rotate_clockwise(90)
+
+        assert client.emulator.commands()[-3:] == ["takeoff", "up 40", "cw 90"]
+        client.state.wait_for_packet()
+        assert client.emulator.height == 120
+
+    def test_rejected_command_raises(self, client):
+        """Test that an error reply raises TelloError"""
+        client.connect()
+
+        with pytest.raises(TelloError):
+            client.move_forward(20)
+
+    def test_retry_after_dropped_response(self, client):
+        """Test that a dropped response is retried"""
+        client.connect()
+        client.emulator.drop_responses = 1
+        client.set_speed(10)
+
+        assert client.client.retry_count == 1
+        assert client.emulator.commands().count("speed 10") == 2
+
+    def test_timeout_after_retries(self, client):
+        """Test that a command fails once every retry times out"""
+        client.connect()
+        client.emulator.drop_responses = 3
+
+        with pytest.raises(TelloError):
+            client.set_speed(10)
+        assert client.client.timeout_count == 3
+
+    def test_pipelined_submit(self, client):
+        """Test that submitted commands are sent in order without blocking"""
+        client.connect()
+        futures = [client.submit(f"speed {speed}") for speed in (10, 20, 30)]
+
+        assert [future.result(timeout=2) for future in futures] == ["ok", "ok", "ok"]
+        assert client.emulator.commands()[-3:] == ["speed 10", "speed 20", "speed 30"]
+
+    def test_end_closes_event_loop(self):
+        """Test that connect/end cycles close their loops instead of leaking descriptors"""
+        before = len(os.listdir("/proc/self/fd")) if os.path.isdir("/proc/self/fd") else None
+        for _ in range(5):
+            client = TelloClient(host="127.0.0.1", command_port=0, state_port=0, timeout=0.2,
+                                 retries=0, bind_host="127.0.0.1")
+            client.end()
+            assert client._loop.is_closed()
+
+        if before is not None:
+            assert len(os.listdir("/proc/self/fd")) <= before
+
+
+class TestDroneWorkerFactory:
+    """Test that DroneWorker accepts another drone backend"""
+
+    def test_worker_uses_drone_factory(self):
+        """Test that the drone factory is stored on the worker"""
+        from drone_worker import DroneWorker
+
+        worker = DroneWorker(drone_factory=TelloClient)
+
+        assert worker.drone_factory is TelloClient
+
+    def test_async_client_selectable_by_name(self, monkeypatch):
+        """Test that the async client is wired up for main.py --drone-client"""
+        import tello_async
+        from drone_worker import DRONE_CLIENTS
+
+        monkeypatch.setattr(tello_async, "TelloClient", lambda: "async client")
+
+        assert set(DRONE_CLIENTS) == {"djitellopy", "async"}
+        assert DRONE_CLIENTS["async"]() == "async client"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])